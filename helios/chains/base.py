@@ -17,6 +17,7 @@ from helios.utils.mp import (
 class ChainProxy(BaseProxy):
     coro_import_block = async_method('import_block')
     coro_import_chain = async_method('import_chain')
+    coro_import_chains = async_method('import_chains')
 
 
     coro_get_all_chronological_blocks_for_window = async_method('get_all_chronological_blocks_for_window')
@@ -44,6 +45,7 @@ class ChainProxy(BaseProxy):
 
     import_block = sync_method('import_block')
     import_chain = sync_method('import_chain')
+    import_chains = sync_method('import_chains')
 
 
     get_vm = sync_method('get_vm')
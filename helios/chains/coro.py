@@ -6,6 +6,7 @@ from hvm.rlp.blocks import BaseBlock
 from hvm.rlp.consensus import NodeStakingScore
 from typing import (
     List,
+    Optional,
     Tuple,
     Set,
 )
@@ -34,6 +35,9 @@ class AsyncChain(BaseChain):
     async def coro_import_chain(self, block_list: List[BaseBlock], perform_validation: bool=True, save_block_head_hash_timestamp: bool = True, allow_replacement: bool = True) -> None:
         raise NotImplementedError()
 
+    async def coro_import_chains(self, chains: List[List[BaseBlock]], perform_validation: bool=True, save_block_head_hash_timestamp: bool = True, allow_replacement: bool = True) -> List[Optional[Exception]]:
+        raise NotImplementedError()
+
 
     async def coro_get_all_chronological_blocks_for_window(self, window_timestamp: Timestamp) -> List[BaseBlock]:
         raise NotImplementedError()
@@ -125,6 +129,7 @@ class AsyncChainMixin(AsyncChain):
 
     coro_get_block_header_by_hash = async_method('get_block_header_by_hash')
     coro_import_chain = async_method('import_chain')
+    coro_import_chains = async_method('import_chains')
     coro_import_current_queue_block_with_reward = async_method('import_current_queue_block_with_reward')
     coro_get_block_by_hash = async_method('get_block_by_hash')
     coro_get_blocks_on_chain = async_method('get_blocks_on_chain')
@@ -244,6 +244,15 @@ network_parser.add_argument(
     type=int,
 )
 
+network_parser.add_argument(
+    '--peer_decode_workers',
+    help=(
+        "Number of processes used to decode large messages from peers. 0 decodes them in the "
+        "networking process."
+    ),
+    type=int,
+)
+
 
 #
 # Sync Mode
@@ -306,6 +315,15 @@ chain_parser.add_argument(
     help="This will stop the node from trying to automatically add new blocks to smart contract chains.",
 )
 
+chain_parser.add_argument(
+    '--signature_cache_size',
+    type=int,
+    help=(
+        "The number of checked signatures to remember in each process, so that transactions, block headers "
+        "and node staking scores aren't checked again every time they are seen."
+    ),
+)
+
 chain_parser.add_argument(
     '--instance',
     type=int,
@@ -17,6 +17,7 @@ from hvm.chains.mainnet import (
     MAINNET_NETWORK_ID,
 )
 from hvm.chains.testnet import TESTNET_NETWORK_ID
+from hvm.utils.signatures import DEFAULT_SIGNATURE_CACHE_SIZE
 
 from hp2p.kademlia import Node as KademliaNode
 
@@ -26,6 +27,7 @@ from helios.constants import (
     SYNC_LIGHT,
 )
 from hp2p.constants import (
+    DEFAULT_DECODE_EXECUTOR_MAX_WORKERS,
     MAINNET_BOOTNODES,
     DEFAULT_MAX_PEERS_BOOTNODE)
 from helios.utils.chains import (
@@ -102,6 +104,8 @@ class ChainConfig:
                  disable_smart_contract_chain_manager: bool= False,
                  keystore_path: str= None,
                  keystore_password: str=None,
+                 signature_cache_size: int=DEFAULT_SIGNATURE_CACHE_SIZE,
+                 peer_decode_workers: int=DEFAULT_DECODE_EXECUTOR_MAX_WORKERS,
                  ) -> None:
 
         if keystore_password is not None:
@@ -118,10 +122,14 @@ class ChainConfig:
         self.port = port
         self.rpc_port = rpc_port
         self.use_discv5 = use_discv5
+        self.signature_cache_size = signature_cache_size
+        self.peer_decode_workers = peer_decode_workers
 
         # TODO: disable this on release
         self.report_memory_usage = False
         self.memory_usage_report_interval = 10
+        # Number of seconds between logging the signature cache hits and misses of each chain process
+        self.signature_cache_report_interval = 60
 
         if self.network_startup_node:
             #network startup nodes must be bootnodes.
@@ -3,8 +3,13 @@
 from multiprocessing.managers import (  # type: ignore
     BaseProxy,
 )
+from typing import (
+    Iterable,
+    Tuple,
+)
 
 from hvm.db.backends.base import BaseDB
+from hvm.db.diff import DBDiff
 
 from helios.utils.mp import async_method
 
@@ -19,6 +24,11 @@ class DBProxy(BaseProxy):
         'exists',
         'get',
         'set',
+        'get_many',
+        'exists_many',
+        'set_many',
+        'delete_many',
+        'apply_diff',
         'coro_set',
         'coro_exists',
     )
@@ -49,6 +59,24 @@ class DBProxy(BaseProxy):
     def __contains__(self, key: bytes) -> bool:
         return self._callmethod('__contains__', (key,))
 
+    #
+    # Multi-key API. Each of these is a single round trip to the database process.
+    #
+    def get_many(self, keys: Iterable[bytes]) -> Tuple[bytes, ...]:
+        return self._callmethod('get_many', (tuple(keys),))
+
+    def exists_many(self, keys: Iterable[bytes]) -> Tuple[bool, ...]:
+        return self._callmethod('exists_many', (tuple(keys),))
+
+    def set_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        return self._callmethod('set_many', (tuple(items),))
+
+    def delete_many(self, keys: Iterable[bytes]) -> None:
+        return self._callmethod('delete_many', (tuple(keys),))
+
+    def apply_diff(self, diff: DBDiff, apply_deletes: bool = True) -> None:
+        return self._callmethod('apply_diff', (diff, apply_deletes))
+
 
 class AsyncBaseDB(BaseDB):
 
@@ -33,6 +33,7 @@ from hvm.db.journal import (
 )
 
 from hp2p.service import BaseService
+from hp2p.utils import set_decode_executor_max_workers
 
 from helios.exceptions import (
     AmbigiousFileSystem,
@@ -85,7 +86,8 @@ from helios.utils.mp import (
 )
 from helios.utils.profiling import (
     setup_cprofiler,
-    sync_periodically_report_memory_stats)
+    sync_periodically_report_memory_stats,
+    sync_periodically_report_signature_cache_stats)
 from helios.utils.shutdown import (
     exit_signal_with_service,
 )
@@ -94,6 +96,11 @@ from helios.utils.version import (
     is_prerelease,
 )
 from hvm.tools.logging import TRACE_LEVEL_NUM
+from hvm.utils.signatures import (
+    set_signature_cache_size,
+    shutdown_recovery_executor,
+    start_recovery_executor,
+)
 from helios.utils.db_proxy import create_db_manager
 
 PRECONFIGURED_NETWORKS = {MAINNET_NETWORK_ID, TESTNET_NETWORK_ID}
@@ -520,12 +527,25 @@ def run_database_process(chain_config: ChainConfig, db_class: Type[BaseDB]) -> N
 @with_queued_logging
 def run_chain_process(chain_config: ChainConfig, instance = 0) -> None:
     with chain_config.process_id_file('chain_{}'.format(instance)):
+        set_signature_cache_size(chain_config.signature_cache_size)
+
         # connect with database process
         db_manager = create_db_manager(chain_config.database_ipc_path)
         db_manager.connect()
 
         base_db = db_manager.get_db()
 
+        # The signature recovery workers are started before the server threads, and kept for the life of the process
+        start_recovery_executor()
+
+        from threading import Thread
+        signature_cache_logger = logging.getLogger('hvm.SignatureCache')
+        Thread(
+            target=sync_periodically_report_signature_cache_stats,
+            args=(chain_config.signature_cache_report_interval, signature_cache_logger),
+            daemon=True,
+        ).start()
+
         # start chain process
         manager = get_chain_manager(chain_config, base_db, instance)
         server = manager.get_server()  # type: ignore
@@ -539,6 +559,8 @@ def run_chain_process(chain_config: ChainConfig, instance = 0) -> None:
         except SystemExit:
             server.stop_event.set()
             raise
+        finally:
+            shutdown_recovery_executor()
 
 
 
@@ -546,6 +568,8 @@ def run_chain_process(chain_config: ChainConfig, instance = 0) -> None:
 @with_queued_logging
 def launch_node(args: Namespace, chain_config: ChainConfig, endpoint: Endpoint) -> None:
     with chain_config.process_id_file('networking'):
+        set_signature_cache_size(chain_config.signature_cache_size)
+        set_decode_executor_max_workers(chain_config.peer_decode_workers)
 
         endpoint.connect()
 
@@ -19,10 +19,13 @@ from helios.utils.shutdown import (
 )
 from helios.utils.verification import save_rpc_admin_password, verify_rpc_admin_password
 
+from hvm.utils.signatures import set_signature_cache_size
+
 from .websocket_proxy_server_directly_connected import Proxy as rpc_websocket_server
 from .http_proxy_server_directly_connected import Proxy as rpc_http_server
 
 from helios.rpc.main import RPCContext
+from helios.rpc.constants import DEFAULT_RPC_READ_WORKERS, DEFAULT_RPC_RESPONSE_CACHE_SIZE
 import sys
 
 from argparse import (
@@ -81,6 +84,20 @@ class JsonRpcServerPlugin(BaseIsolatedPlugin):
             help="This enables the admin rpc module.",
         )
 
+        arg_parser.add_argument(
+            '--rpc_read_workers',
+            type=int,
+            default=DEFAULT_RPC_READ_WORKERS,
+            help="The number of threads used for blocking chain and database reads by RPC methods.",
+        )
+
+        arg_parser.add_argument(
+            '--rpc_response_cache_size',
+            type=int,
+            default=DEFAULT_RPC_RESPONSE_CACHE_SIZE,
+            help="The number of block and receipt responses that the RPC remembers. 0 disables the cache.",
+        )
+
         attach_parser = subparser.add_parser(
             'set-admin-rpc-password',
             help='Allows you to set the password used for the admin RPC module',
@@ -110,6 +127,9 @@ class JsonRpcServerPlugin(BaseIsolatedPlugin):
         self.logger.info('JSON-RPC Server started')
         self.context.event_bus.connect()
 
+        # Transaction and header senders are recovered in this process too, when formatting responses
+        set_signature_cache_size(self.context.chain_config.signature_cache_size)
+
         db_manager = create_db_manager(self.context.chain_config.database_ipc_path)
         db_manager.connect()
 
@@ -121,7 +141,9 @@ class JsonRpcServerPlugin(BaseIsolatedPlugin):
         rpc_context = RPCContext(enable_private_modules=self.context.args.enable_private_rpc,
                                  enable_admin_module=self.context.args.enable_admin_rpc,
                                  keystore_dir=self.context.chain_config.keystore_dir,
-                                 admin_rpc_password_config_path=self.context.chain_config.rpc_login_config_path)
+                                 admin_rpc_password_config_path=self.context.chain_config.rpc_login_config_path,
+                                 read_workers=self.context.args.rpc_read_workers,
+                                 response_cache_size=self.context.args.rpc_response_cache_size)
 
         rpc = RPCServer(chain, rpc_context, self.context.event_bus, chain_class)
         ipc_server = IPCServer(rpc, self.context.chain_config.jsonrpc_ipc_path)
@@ -131,6 +153,7 @@ class JsonRpcServerPlugin(BaseIsolatedPlugin):
 
         asyncio.ensure_future(exit_with_service_and_endpoint(ipc_server, self.context.event_bus))
         asyncio.ensure_future(ipc_server.run())
+        asyncio.ensure_future(rpc.handle_event_bus_events())
 
 
 
@@ -147,7 +170,7 @@ class JsonRpcServerPlugin(BaseIsolatedPlugin):
             self.logger.info('RPC Websocket proxy started')
 
             proxy_url = "ws://0.0.0.0:" + str(self.context.chain_config.rpc_port)
-            rpc_websocket_service = rpc_websocket_server(proxy_url, rpc.execute, use_async)
+            rpc_websocket_service = rpc_websocket_server(proxy_url, rpc.execute, use_async, rpc.unsubscribe_all)
 
             asyncio.ensure_future(rpc_websocket_service.run())
 
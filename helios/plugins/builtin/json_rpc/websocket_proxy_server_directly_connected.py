@@ -25,7 +25,7 @@ from helios.rpc.proxy import BaseProxy
 # async requests.
 class Proxy(BaseProxy):
 
-    def __init__(self, websocket_url, rpc_execute, use_async = True):
+    def __init__(self, websocket_url, rpc_execute, use_async = True, rpc_unsubscribe_all = None):
         self.websocket_url = websocket_url
 
         self.use_async = use_async
@@ -39,16 +39,17 @@ class Proxy(BaseProxy):
         self.server = None
 
         self.rpc_execute = rpc_execute
+        self.rpc_unsubscribe_all = rpc_unsubscribe_all
 
         self.sync_lock = asyncio.Lock()
 
-    async def process(self, raw_request):
+    async def process(self, raw_request, subscriber = None):
         request = json.loads(raw_request)
         if self.use_async:
-            return await self.rpc_execute(request)
+            return await self.rpc_execute(request, subscriber=subscriber)
         else:
             async with self.sync_lock:
-                return await self.rpc_execute(request)
+                return await self.rpc_execute(request, subscriber=subscriber)
 
 
     async def interface(self, websocket, path):
@@ -61,10 +62,14 @@ class Proxy(BaseProxy):
                 continue
 
             print("request: {}".format(request))
-            response = await self.process(request)
+            # subscriptions push their notifications with websocket.send
+            response = await self.process(request, subscriber=websocket.send)
             print("response: {}".format(response))
             await websocket.send(response)
 
+        if self.rpc_unsubscribe_all is not None:
+            self.rpc_unsubscribe_all(websocket.send)
+
     def run(self):
 
         if WEBSOCKET_USE_SSL:
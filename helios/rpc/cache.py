@@ -0,0 +1,81 @@
+import json
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+)
+
+from lru import LRU
+
+from helios.rpc.constants import (
+    HEAD_DEPENDENT_CACHED_RPC_METHODS,
+    IMMUTABLE_CACHED_RPC_METHODS,
+)
+
+
+class RPCResponseCache:
+    """
+    Remembers the results of the RPC methods in IMMUTABLE_CACHED_RPC_METHODS and HEAD_DEPENDENT_CACHED_RPC_METHODS,
+    keyed by (method, params). The head dependent results are kept separately, so that they can all be dropped
+    when new blocks are imported without losing the immutable ones. Only successful results should be saved.
+    A size of 0 disables the cache.
+    """
+    def __init__(self, size: int) -> None:
+        self.enabled = size > 0
+        self._immutable = LRU(max(size, 1))
+        self._head_dependent = LRU(max(size, 1))
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def is_cached_method(rpc_method: str) -> bool:
+        return rpc_method in IMMUTABLE_CACHED_RPC_METHODS or rpc_method in HEAD_DEPENDENT_CACHED_RPC_METHODS
+
+    @staticmethod
+    def _make_key(rpc_method: str, params: List[Any]) -> Tuple[str, str]:
+        return (rpc_method, json.dumps(params, sort_keys=True))
+
+    def _get_cache(self, rpc_method: str) -> LRU:
+        if rpc_method in IMMUTABLE_CACHED_RPC_METHODS:
+            return self._immutable
+        else:
+            return self._head_dependent
+
+    def get(self, rpc_method: str, params: List[Any]) -> Tuple[bool, Any]:
+        """
+        Returns (True, result) if the result is saved, and (False, None) if it isn't.
+        """
+        try:
+            result = self._get_cache(rpc_method)[self._make_key(rpc_method, params)]
+        except KeyError:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, result
+
+    def set(self, rpc_method: str, params: List[Any], result: Any) -> None:
+        self._get_cache(rpc_method)[self._make_key(rpc_method, params)] = result
+
+    def invalidate_head_dependent(self) -> None:
+        self._head_dependent.clear()
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        self._immutable.clear()
+        self._head_dependent.clear()
+        self.invalidations += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0,
+            'invalidations': self.invalidations,
+            'immutable_size': len(self._immutable),
+            'head_dependent_size': len(self._head_dependent),
+            'max_size': self._immutable.get_size() if self.enabled else 0,
+        }
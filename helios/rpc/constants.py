@@ -2,4 +2,32 @@
 MAX_ALLOWED_AGE_OF_NEW_RPC_BLOCK = 60
 # Once the import queue reaches this length, the node will reject rpc blocks and transactions and respond by saying
 # that we are still syncing
-MAX_ALLOWED_LENGTH_BLOCK_IMPORT_QUEUE = 3
\ No newline at end of file
+MAX_ALLOWED_LENGTH_BLOCK_IMPORT_QUEUE = 3
+# The maximum number of requests in a single JSON-RPC batch. The requests in a batch are executed concurrently.
+MAX_RPC_BATCH_SIZE = 100
+# The number of threads that RPC methods use for blocking chain and database reads.
+DEFAULT_RPC_READ_WORKERS = 4
+# The upper bounds, in seconds, of the buckets in the per-method RPC latency histograms.
+RPC_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+# The number of responses to remember in each part of the RPC response cache.
+DEFAULT_RPC_RESPONSE_CACHE_SIZE = 4096
+# Methods that look things up by hash. Their responses never change, so they stay in the response cache until evicted.
+IMMUTABLE_CACHED_RPC_METHODS = {
+    'hls_getBlockByHash',
+}
+# Methods whose responses depend on the chain heads. They are removed from the response cache when blocks are imported
+# or removed. Receipts are here because the block a transaction is in changes when that block is replaced.
+HEAD_DEPENDENT_CACHED_RPC_METHODS = {
+    'hls_getTransactionReceipt',
+    'hls_getBlockByNumber',
+    'hls_getNewestBlocks',
+}
+# The kinds of events that websocket clients can subscribe to with hls_subscribe.
+SUBSCRIPTION_NEW_BLOCK_HEADERS = 'newBlockHeaders'
+SUBSCRIPTION_RECEIVABLE_TRANSACTIONS = 'receivableTransactions'
+SUBSCRIPTION_SYNC_STAGE = 'syncStage'
+# The maximum number of subscriptions that one websocket connection can have.
+MAX_SUBSCRIPTIONS_PER_CONNECTION = 100
+# The number of notifications that can wait to be sent to one websocket connection. A connection that falls further
+# behind loses all of its subscriptions.
+MAX_PENDING_NOTIFICATIONS_PER_CONNECTION = 1000
@@ -1,4 +1,5 @@
 import asyncio
+import codecs
 import json
 import logging
 import pathlib
@@ -24,6 +25,7 @@ from helios.rpc.main import (
 )
 
 MAXIMUM_REQUEST_BYTES = 1000000
+READ_CHUNK_BYTES = 65536
 
 
 @curry
@@ -53,27 +55,13 @@ async def connection_loop(execute_rpc: Callable[[Any], Any],
                           writer: asyncio.StreamWriter,
                           logger: logging.Logger,
                           cancel_token: CancelToken) -> None:
-    # TODO: we should look into using an io.StrinIO here for more efficient
-    # writing to the end of the string.
+    # Requests are read in chunks, and each complete JSON value at the start of the buffer is a request. This
+    # works the same for single requests and batches, including an empty batch, and for several requests that
+    # arrive in one chunk.
+    decoder = json.JSONDecoder()
+    utf8_decoder = codecs.getincrementaldecoder('utf-8')()
     raw_request = ''
     while True:
-        request_bytes = b''
-        try:
-            request_bytes = await cancel_token.cancellable_wait(reader.readuntil(b'}'))
-        except asyncio.LimitOverrunError as e:
-            logger.info("Client request was too long. Erasing buffer and restarting...")
-            request_bytes = await cancel_token.cancellable_wait(reader.read(e.consumed))
-            await cancel_token.cancellable_wait(write_error(
-                writer,
-                "reached limit: %d bytes, starting with '%s'" % (
-                    e.consumed,
-                    request_bytes[:20],
-                ),
-            ))
-            continue
-
-        raw_request += request_bytes.decode()
-
         bad_prefix, raw_request = strip_non_json_prefix(raw_request)
         if bad_prefix:
             logger.info("Client started request with non json data: %r", bad_prefix)
@@ -82,16 +70,31 @@ async def connection_loop(execute_rpc: Callable[[Any], Any],
             )
 
         try:
-            request = json.loads(raw_request)
+            request, end = decoder.raw_decode(raw_request)
         except json.JSONDecodeError:
-            # invalid json request, keep reading data until a valid json is formed
-            logger.debug("Invalid JSON, waiting for rest of message: %r", raw_request)
+            if len(raw_request) > MAXIMUM_REQUEST_BYTES:
+                logger.info("Client request was too long. Erasing buffer and restarting...")
+                await cancel_token.cancellable_wait(write_error(
+                    writer,
+                    "reached limit: %d bytes, starting with '%s'" % (
+                        len(raw_request),
+                        raw_request[:20],
+                    ),
+                ))
+                raw_request = ''
+
+            # the request isn't complete yet, keep reading data until a valid json is formed
+            request_bytes = await cancel_token.cancellable_wait(reader.read(READ_CHUNK_BYTES))
+            if not request_bytes:
+                logger.debug("Client closed connection")
+                return
+            raw_request += utf8_decoder.decode(request_bytes)
             continue
 
-        # reset the buffer for the next message
-        raw_request = ''
+        # keep anything after this request for the next one
+        raw_request = raw_request[end:]
 
-        if not request:
+        if not request and not isinstance(request, list):
             logger.debug("Client sent empty request")
             await cancel_token.cancellable_wait(
                 write_error(writer, 'Invalid Request: empty'),
@@ -112,9 +115,12 @@ async def connection_loop(execute_rpc: Callable[[Any], Any],
 
 
 def strip_non_json_prefix(raw_request: str) -> Tuple[str, str]:
-    if raw_request and raw_request[0] != '{':
-        prefix, bracket, rest = raw_request.partition('{')
-        return prefix.strip(), bracket + rest
+    if raw_request and raw_request[0] not in '{[':
+        start = min(
+            (index for index in (raw_request.find('{'), raw_request.find('[')) if index != -1),
+            default=len(raw_request),
+        )
+        return raw_request[:start].strip(), raw_request[start:]
     else:
         return '', raw_request
 
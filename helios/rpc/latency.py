@@ -0,0 +1,42 @@
+from typing import (
+    Any,
+    Dict,
+    Sequence,
+)
+
+from helios.rpc.constants import RPC_LATENCY_BUCKETS
+
+
+class LatencyHistogram:
+    """
+    Counts how long calls took, in buckets with the given upper bounds in seconds. Calls slower than the last
+    bound are counted in a final overflow bucket.
+    """
+    def __init__(self, buckets: Sequence[float] = RPC_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        for index, upper_bound in enumerate(self.buckets):
+            if seconds <= upper_bound:
+                break
+        else:
+            index = len(self.buckets)
+
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        bucket_names = ['<={}'.format(upper_bound) for upper_bound in self.buckets]
+        bucket_names.append('>{}'.format(self.buckets[-1]))
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0,
+            'max': self.max,
+            'buckets': dict(zip(bucket_names, self.counts)),
+        }
@@ -1,26 +1,57 @@
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
     Any,
     Dict,
+    List,
     Tuple,
     Union,
     Type,
 )
 
+from eth_typing import Address
 from eth_utils import (
     ValidationError,
+    decode_hex,
+    encode_hex,
 )
 
 from helios.chains.coro import (
     AsyncChain,
 )
 from helios.exceptions import BaseRPCError, RPCStoppedError
+from helios.rpc.cache import RPCResponseCache
+from helios.rpc.constants import (
+    DEFAULT_RPC_READ_WORKERS,
+    DEFAULT_RPC_RESPONSE_CACHE_SIZE,
+    MAX_RPC_BATCH_SIZE,
+    SUBSCRIPTION_NEW_BLOCK_HEADERS,
+    SUBSCRIPTION_RECEIVABLE_TRANSACTIONS,
+    SUBSCRIPTION_SYNC_STAGE,
+)
+from helios.rpc.format import header_to_dict
+from helios.rpc.latency import LatencyHistogram
+from helios.rpc.subscriptions import (
+    Subscriber,
+    Subscription,
+    SubscriptionManager,
+)
+from helios.sync.common.constants import FULLY_SYNCED_STAGE_ID
 
 from lahja import (
     Endpoint
 )
 
+from hp2p.events import (
+    BlocksImportedEvent,
+    BlocksRemovedEvent,
+    SyncStageChangedEvent,
+)
+
+from hvm.rlp.headers import BlockHeader
+
 from helios.rpc.modules import (
     Eth,
     Hls,
@@ -72,11 +103,19 @@ class RPCContext:
                  enable_private_modules: bool = False,
                  enable_admin_module: bool = False,
                  keystore_dir: Path = None,
-                 admin_rpc_password_config_path: Path = None):
+                 admin_rpc_password_config_path: Path = None,
+                 read_workers: int = DEFAULT_RPC_READ_WORKERS,
+                 response_cache_size: int = DEFAULT_RPC_RESPONSE_CACHE_SIZE):
         self.admin_rpc_password_config_path = admin_rpc_password_config_path
         self.enable_admin_module = enable_admin_module
         self.enable_private_modules = enable_private_modules
         self.keystore_dir = keystore_dir
+        # Blocking chain and database reads are run here, so that a slow request doesn't stall the event loop
+        # for every other client.
+        self.read_executor = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix='rpc-read')
+        self.method_latencies: Dict[str, LatencyHistogram] = {}
+        self.response_cache = RPCResponseCache(response_cache_size)
+        self.subscriptions = SubscriptionManager()
 
 
 class RPCServer:
@@ -104,6 +143,7 @@ class RPCServer:
 
     def __init__(self, chain: AsyncChain, rpc_context: RPCContext, event_bus: Endpoint=None, chain_class: Type[AsyncChain]= None) -> None:
         self.modules: Dict[str, RPCModule] = {}
+        self.event_bus = event_bus
         self.chain = chain
         self.chain_class = chain_class
         self.rpc_context = rpc_context
@@ -141,7 +181,8 @@ class RPCServer:
 
     async def _get_result(self,
                           request: Dict[str, Any],
-                          debug: bool=False) -> Tuple[Any, Union[Exception, str]]:
+                          debug: bool=False,
+                          subscriber: Subscriber=None) -> Tuple[Any, Union[Exception, str]]:
         '''
         :returns: (result, error) - result is None if error is provided. Error must be
             convertable to string with ``str(error)``.
@@ -152,12 +193,35 @@ class RPCServer:
             if request.get('jsonrpc', None) != '2.0':
                 raise NotImplementedError("Only the 2.0 jsonrpc protocol is supported")
 
-            method = self._lookup_method(request['method'])
             params = request.get('params', [])
-            result = await method(*params)
+            if request['method'] == 'hls_subscribe':
+                return await self._subscribe(subscriber, *params), None
+            elif request['method'] == 'hls_unsubscribe':
+                return self._unsubscribe(subscriber, *params), None
+
+            method = self._lookup_method(request['method'])
+
+            response_cache = self.rpc_context.response_cache
+            use_response_cache = response_cache.enabled and response_cache.is_cached_method(request['method'])
+            if use_response_cache:
+                is_cached, result = response_cache.get(request['method'], params)
+                if is_cached:
+                    return result, None
+                # blocks imported while the method runs may make its result stale
+                invalidations = response_cache.invalidations
+
+            start = time.perf_counter()
+            try:
+                result = await method(*params)
+            finally:
+                self._observe_latency(request['method'], time.perf_counter() - start)
+
+            if use_response_cache and response_cache.invalidations == invalidations:
+                response_cache.set(request['method'], params, result)
 
             if request['method'] == 'evm_resetToGenesisFixture':
                 self.chain, result = result, True
+                self.rpc_context.response_cache.clear()
 
         except NotImplementedError as exc:
             error = "Method not implemented: %r %s" % (request['method'], exc)
@@ -173,17 +237,183 @@ class RPCServer:
         else:
             return result, None
 
-    async def execute(self, request: Dict[str, Any], from_ipc = False) -> str:
+    #
+    # Subscriptions
+    #
+    async def _subscribe(self, subscriber: Subscriber, kind: str, chain_address: str = None) -> str:
+        if subscriber is None:
+            raise BaseRPCError("Subscriptions are only available over websockets")
+
+        if chain_address is None:
+            address = None
+        else:
+            address = Address(decode_hex(chain_address))
+            if len(address) != 20:
+                raise BaseRPCError("Invalid chain address {}".format(chain_address))
+
+        known_transaction_hashes = set()
+        if kind == SUBSCRIPTION_RECEIVABLE_TRANSACTIONS and address is not None:
+            # Only notify the client about receivable transactions that arrive after it subscribed. They are looked
+            # up before the subscription is registered, so that blocks imported meanwhile can't notify it about the
+            # ones it already has.
+            receivable_transaction_keys = await self._run_in_read_executor(
+                self._get_receivable_transaction_keys,
+                [address],
+            )
+            known_transaction_hashes = {
+                transaction_key.transaction_hash for transaction_key in receivable_transaction_keys[address]
+            }
+
+        subscription = self.rpc_context.subscriptions.subscribe(subscriber, kind, address)
+        subscription.known_transaction_hashes = known_transaction_hashes
+
+        return subscription.subscription_id
+
+    def _unsubscribe(self, subscriber: Subscriber, subscription_id: str) -> bool:
+        if subscriber is None:
+            raise BaseRPCError("Subscriptions are only available over websockets")
+        return self.rpc_context.subscriptions.unsubscribe(subscriber, subscription_id)
+
+    def unsubscribe_all(self, subscriber: Subscriber) -> None:
+        """
+        Removes all of the subscriptions of a websocket connection. It is called when the connection closes.
+        """
+        self.rpc_context.subscriptions.unsubscribe_all(subscriber)
+
+    async def _run_in_read_executor(self, func: Any, *args: Any) -> Any:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.rpc_context.read_executor, func, *args)
+
+    def _get_receivable_transaction_keys(self, addresses: List[Address]) -> Dict[Address, List[Any]]:
+        chain = self.chain_class(self.chain.db, wallet_address=self.chain.wallet_address)
+        account_db = chain.get_vm().state.account_db
+        return {address: account_db.get_receivable_transactions(address) for address in addresses}
+
+    async def _notify_imported_blocks(self, headers: List[BlockHeader]) -> None:
+        subscriptions = self.rpc_context.subscriptions
+
+        header_subscriptions = subscriptions.get_subscriptions(SUBSCRIPTION_NEW_BLOCK_HEADERS)
+        if len(header_subscriptions) > 0:
+            header_dicts = [header_to_dict(header) for header in headers]
+            for subscription in header_subscriptions:
+                for header_dict in header_dicts:
+                    subscriptions.notify(subscription, header_dict)
+
+        receivable_subscriptions = subscriptions.get_subscriptions(SUBSCRIPTION_RECEIVABLE_TRANSACTIONS)
+        if len(receivable_subscriptions) > 0:
+            receivable_transaction_keys = await self._run_in_read_executor(
+                self._get_receivable_transaction_keys,
+                list({subscription.address for subscription in receivable_subscriptions}),
+            )
+            for subscription in receivable_subscriptions:
+                notification = self._make_receivable_transactions_notification(
+                    subscription,
+                    receivable_transaction_keys[subscription.address],
+                )
+                if notification is not None:
+                    subscriptions.notify(subscription, notification)
+
+    @staticmethod
+    def _make_receivable_transactions_notification(subscription: Subscription,
+                                                   transaction_keys: List[Any]) -> Dict[str, Any]:
+        """
+        Returns the receivable transactions that the subscriber doesn't know about yet, or None if there aren't any.
+        """
+        new_transaction_keys = [
+            transaction_key for transaction_key in transaction_keys
+            if transaction_key.transaction_hash not in subscription.known_transaction_hashes
+        ]
+        subscription.known_transaction_hashes = {transaction_key.transaction_hash for transaction_key in transaction_keys}
+        if len(new_transaction_keys) == 0:
+            return None
+
+        return {
+            'chainAddress': encode_hex(subscription.address),
+            'receivableTransactions': [
+                {
+                    'transactionHash': encode_hex(transaction_key.transaction_hash),
+                    'senderBlockHash': encode_hex(transaction_key.sender_block_hash),
+                }
+                for transaction_key in new_transaction_keys
+            ],
+        }
+
+    async def _notify_sync_stage(self, sync_stage: int) -> None:
+        subscriptions = self.rpc_context.subscriptions
+        notification = {
+            'syncStage': sync_stage,
+            'syncing': sync_stage < FULLY_SYNCED_STAGE_ID,
+        }
+        for subscription in subscriptions.get_subscriptions(SUBSCRIPTION_SYNC_STAGE):
+            subscriptions.notify(subscription, notification)
+
+    async def handle_event_bus_events(self) -> None:
+        """
+        Drops the head dependent responses from the response cache whenever the chain syncer imports blocks,
+        and pushes the new blocks and sync stage changes to subscribers. The whole cache is dropped when blocks
+        are removed, because even the responses looked up by hash can be for the removed blocks. Notifications are
+        only queued here, so a slow websocket client doesn't hold up the cache or the other clients. This runs forever.
+        """
+        async def blocks_imported_loop() -> None:
+            async for event in self.event_bus.stream(BlocksImportedEvent):
+                self.rpc_context.response_cache.invalidate_head_dependent()
+                await self._notify_imported_blocks(event.headers)
+
+        async def blocks_removed_loop() -> None:
+            async for event in self.event_bus.stream(BlocksRemovedEvent):
+                self.rpc_context.response_cache.clear()
+
+        async def sync_stage_changed_loop() -> None:
+            async for event in self.event_bus.stream(SyncStageChangedEvent):
+                await self._notify_sync_stage(event.sync_stage)
+
+        await asyncio.gather(blocks_imported_loop(), blocks_removed_loop(), sync_stage_changed_loop())
+
+    def _observe_latency(self, rpc_method: str, seconds: float) -> None:
+        try:
+            histogram = self.rpc_context.method_latencies[rpc_method]
+        except KeyError:
+            histogram = self.rpc_context.method_latencies[rpc_method] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    async def execute(self,
+                      request: Union[Dict[str, Any], List[Any]],
+                      from_ipc = False,
+                      subscriber: Subscriber = None) -> str:
         '''
-        The key entry point for all incoming requests
+        The key entry point for all incoming requests. request can also be a JSON-RPC 2.0 batch, which is a list
+        of requests. They are executed concurrently and the responses are returned in the same order.
+        Connections that can receive notifications, like websockets, pass the coroutine function that sends them
+        as subscriber, which enables hls_subscribe.
         '''
+        if isinstance(request, list):
+            return await self._execute_batch(request, from_ipc, subscriber)
+
         if not from_ipc:
             if self.rpc_context.halt_rpc.is_set():
                 return generate_response(request, None, 'RPC has been disabled on this node. If you expect this node to be online, then this may just be temporary for mantenance.')
 
-        result, error = await self._get_result(request)
+        result, error = await self._get_result(request, subscriber=subscriber)
         return generate_response(request, result, error)
 
+    async def _execute_batch(self, requests: List[Any], from_ipc: bool, subscriber: Subscriber) -> str:
+        if len(requests) == 0:
+            return generate_response({}, None, "Invalid Request: empty batch")
+        if len(requests) > MAX_RPC_BATCH_SIZE:
+            return generate_response(
+                {},
+                None,
+                "Invalid Request: batches can have at most {} requests".format(MAX_RPC_BATCH_SIZE),
+            )
+
+        async def execute_batch_item(request: Any) -> str:
+            if not isinstance(request, dict):
+                return generate_response({}, None, "Invalid Request: not a request object")
+            return await self.execute(request, from_ipc, subscriber)
+
+        responses = await asyncio.gather(*(execute_batch_item(request) for request in requests))
+        return '[' + ','.join(responses) + ']'
+
     @property
     def chain(self) -> AsyncChain:
         return self.__chain
@@ -1,4 +1,4 @@
-from .main import RPCModule  # noqa: F401
+from .main import RPCModule, blocking_read  # noqa: F401
 
 from .eth import Eth  # noqa: F401
 from .hls import Hls
@@ -20,3 +20,18 @@ class Admin(RPCModule):
 
         self._rpc_context.halt_rpc.clear()
 
+    async def getRPCLatencies(self, password: str):
+        if not verify_rpc_admin_password(password, self._rpc_context.admin_rpc_password_config_path):
+            raise ValidationError("Incorrect password.")
+
+        return {
+            rpc_method: histogram.to_dict()
+            for rpc_method, histogram in sorted(self._rpc_context.method_latencies.items())
+        }
+
+    async def getRPCCacheStats(self, password: str):
+        if not verify_rpc_admin_password(password, self._rpc_context.admin_rpc_password_config_path):
+            raise ValidationError("Incorrect password.")
+
+        return self._rpc_context.response_cache.get_stats()
+
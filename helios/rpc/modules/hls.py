@@ -45,6 +45,7 @@ from eth_utils import is_hex_address, to_checksum_address
 # Tell mypy to ignore this import as a workaround for https://github.com/python/mypy/issues/4049
 from helios.rpc.modules import (  # type: ignore
     RPCModule,
+    blocking_read,
 )
 
 from hvm.constants import (
@@ -106,15 +107,18 @@ class Hls(RPCModule):
         raise DeprecationWarning("This method has been moved to personal_listAccounts")
 
     @format_params(decode_hex)
-    async def blockNumber(self, chain_address):
-        num = self._chain.get_canonical_head(chain_address).block_number
+    @blocking_read
+    def blockNumber(self, chain_address):
+        chain = self.get_new_chain()
+        num = chain.get_canonical_head(chain_address).block_number
         return hex(num)
 
 
 
 
     @format_params(decode_hex, to_int_if_hex)
-    async def getBalance(self, address, at_block):
+    @blocking_read
+    def getBalance(self, address, at_block):
         chain = self.get_new_chain(address)
 
         if at_block == 'latest':
@@ -138,7 +142,8 @@ class Hls(RPCModule):
 
 
     @format_params(decode_hex)
-    async def getBlockTransactionCountByHash(self, block_hash):
+    @blocking_read
+    def getBlockTransactionCountByHash(self, block_hash):
         chain = self.get_new_chain()
         try:
             tx_count = chain.chaindb.get_number_of_total_tx_in_block(block_hash)
@@ -147,7 +152,8 @@ class Hls(RPCModule):
         return hex(tx_count)
 
     @format_params(to_int_if_hex, decode_hex)
-    async def getBlockTransactionCountByNumber(self, at_block, chain_address):
+    @blocking_read
+    def getBlockTransactionCountByNumber(self, at_block, chain_address):
         chain = self.get_new_chain()
         try:
             block_hash = chain.chaindb.get_canonical_block_hash(chain_address=chain_address, block_number=at_block)
@@ -158,17 +164,19 @@ class Hls(RPCModule):
         return hex(tx_count)
 
     @format_params(decode_hex, to_int_if_hex)
-    async def getCode(self, chain_address, at_block):
-        account_db = account_db_at_block(self._chain, chain_address, at_block)
+    @blocking_read
+    def getCode(self, chain_address, at_block):
+        account_db = account_db_at_block(self.get_new_chain(), chain_address, at_block)
         code = account_db.get_code(chain_address)
         return encode_hex(code)
 
     @format_params(decode_hex, to_int_if_hex, to_int_if_hex)
-    async def getStorageAt(self, chain_address, position, at_block):
+    @blocking_read
+    def getStorageAt(self, chain_address, position, at_block):
         if not is_integer(position) or position < 0:
             raise TypeError("Position of storage must be a whole number, but was: %r" % position)
 
-        account_db = account_db_at_block(self._chain, chain_address, at_block)
+        account_db = account_db_at_block(self.get_new_chain(), chain_address, at_block)
         stored_val = account_db.get_storage(chain_address, position)
         return encode_hex(int_to_big_endian(stored_val))
 
@@ -195,41 +203,47 @@ class Hls(RPCModule):
     #
 
     @format_params(decode_hex, to_int_if_hex)
-    async def getTransactionByBlockHashAndIndex(self, block_hash, index):
+    @blocking_read
+    def getTransactionByBlockHashAndIndex(self, block_hash, index):
+        chain = self.get_new_chain()
         try:
-            tx = self._chain.get_transaction_by_block_hash_and_index(block_hash, index)
+            tx = chain.get_transaction_by_block_hash_and_index(block_hash, index)
         except HeaderNotFound:
             raise BaseRPCError('No block found with the given block hash')
         if isinstance(tx, BaseReceiveTransaction):
             # receive tx
-            return receive_transaction_to_dict(tx, self._chain)
+            return receive_transaction_to_dict(tx, chain)
         else:
             # send tx
-            return transaction_to_dict(tx, self._chain)
+            return transaction_to_dict(tx, chain)
 
     @format_params(to_int_if_hex, to_int_if_hex, decode_hex)
-    async def getTransactionByBlockNumberAndIndex(self, at_block, index, chain_address):
+    @blocking_read
+    def getTransactionByBlockNumberAndIndex(self, at_block, index, chain_address):
+        chain = self.get_new_chain()
         try:
-            block_hash = self._chain.chaindb.get_canonical_block_hash(chain_address=chain_address,
-                                                                      block_number=at_block)
+            block_hash = chain.chaindb.get_canonical_block_hash(chain_address=chain_address,
+                                                                block_number=at_block)
         except HeaderNotFound:
             raise BaseRPCError('No block found with the given chain address and block number')
-        tx = self._chain.get_transaction_by_block_hash_and_index(block_hash, index)
+        tx = chain.get_transaction_by_block_hash_and_index(block_hash, index)
         if isinstance(tx, BaseReceiveTransaction):
             # receive tx
-            return receive_transaction_to_dict(tx, self._chain)
+            return receive_transaction_to_dict(tx, chain)
         else:
             # send tx
-            return transaction_to_dict(tx, self._chain)
+            return transaction_to_dict(tx, chain)
 
     @format_params(decode_hex, to_int_if_hex)
-    async def getTransactionCount(self, chain_address, at_block):
-        account_db = account_db_at_block(self._chain, chain_address, at_block)
+    @blocking_read
+    def getTransactionCount(self, chain_address, at_block):
+        account_db = account_db_at_block(self.get_new_chain(), chain_address, at_block)
         nonce = account_db.get_nonce(chain_address)
         return hex(nonce)
 
     @format_params(decode_hex)
-    async def getTransactionByHash(self, tx_hash):
+    @blocking_read
+    def getTransactionByHash(self, tx_hash):
         chain = self.get_new_chain()
         try:
             tx = chain.get_canonical_transaction(tx_hash)
@@ -241,7 +255,8 @@ class Hls(RPCModule):
             return transaction_to_dict(tx, chain)
 
     @format_params(decode_hex)
-    async def getTransactionReceipt(self, tx_hash):
+    @blocking_read
+    def getTransactionReceipt(self, tx_hash):
         chain = self.get_new_chain()
         receipt = chain.chaindb.get_transaction_receipt(tx_hash)
 
@@ -250,7 +265,8 @@ class Hls(RPCModule):
         return receipt_dict
 
     @format_params(decode_hex)
-    async def getReceivableTransactions(self, chain_address):
+    @blocking_read
+    def getReceivableTransactions(self, chain_address):
         # create new chain for all requests
         chain = self.get_new_chain(chain_address)
 
@@ -277,9 +293,16 @@ class Hls(RPCModule):
 
         if isinstance(after_timestamp, int) and after_timestamp > earliest_chronological_timestamp:
             # cycle through all chronological windows
-            _, addresses_with_receivable_transactions = await chain.coro_get_receivable_transaction_hashes_from_chronological(after_timestamp, chain_addresses)
+            _, addresses_with_receivable_transactions = await self._run_in_read_executor(
+                chain.get_receivable_transaction_hashes_from_chronological,
+                after_timestamp,
+                chain_addresses,
+            )
         else:
-            addresses_with_receivable_transactions = await chain.coro_filter_accounts_with_receivable_transactions(chain_addresses)
+            addresses_with_receivable_transactions = await self._run_in_read_executor(
+                chain.filter_accounts_with_receivable_transactions,
+                chain_addresses,
+            )
 
         addresses_with_receivable_transactions = [to_checksum_address(x) for x in addresses_with_receivable_transactions]
 
@@ -287,7 +310,8 @@ class Hls(RPCModule):
 
 
     @format_params(decode_hex)
-    async def getReceiveTransactionOfSendTransaction(self, tx_hash):
+    @blocking_read
+    def getReceiveTransactionOfSendTransaction(self, tx_hash):
         '''
         Gets the receive transaction corresponding to a given send transaction, if it exists
         '''
@@ -315,9 +339,10 @@ class Hls(RPCModule):
     async def getGasPrice(self):
         return await self.gasPrice()
 
-    async def getHistoricalGasPrice(self):
+    @blocking_read
+    def getHistoricalGasPrice(self):
 
-        historical_min_gas_price = self._chain.min_gas_db.load_historical_minimum_gas_price()
+        historical_min_gas_price = self.get_new_chain().min_gas_db.load_historical_minimum_gas_price()
 
         encoded = []
         for timestamp_gas_price in historical_min_gas_price:
@@ -325,9 +350,10 @@ class Hls(RPCModule):
 
         return encoded
 
-    async def getApproximateHistoricalNetworkTPCCapability(self):
+    @blocking_read
+    def getApproximateHistoricalNetworkTPCCapability(self):
 
-        historical_tpc_cap = self._chain.min_gas_db.load_historical_network_tpc_capability()
+        historical_tpc_cap = self.get_new_chain().min_gas_db.load_historical_network_tpc_capability()
 
         encoded = []
         for timestamp_tpc_cap in historical_tpc_cap:
@@ -335,9 +361,10 @@ class Hls(RPCModule):
 
         return encoded
 
-    async def getApproximateHistoricalTPC(self):
+    @blocking_read
+    def getApproximateHistoricalTPC(self):
 
-        historical_tpc = self._chain.chaindb.load_historical_tx_per_centisecond_from_chain()
+        historical_tpc = self.get_new_chain().chaindb.load_historical_tx_per_centisecond_from_chain()
         #historical_tpc = self._chain.min_gas_db.load_historical_tx_per_decisecond_from_imported()
 
         encoded = []
@@ -350,7 +377,8 @@ class Hls(RPCModule):
     # Blocks
     #
     @format_params(decode_hex, to_int_if_hex)
-    async def getBlockNumber(self, chain_address, before_timestamp = None):
+    @blocking_read
+    def getBlockNumber(self, chain_address, before_timestamp = None):
         chain = self.get_new_chain(chain_address)
         if before_timestamp is None or before_timestamp == 'latest':
             canonical_header = chain.chaindb.get_canonical_head(chain_address)
@@ -362,7 +390,8 @@ class Hls(RPCModule):
 
 
     @format_params(decode_hex)
-    async def getBlockCreationParams(self, chain_address):
+    @blocking_read
+    def getBlockCreationParams(self, chain_address):
         #create new chain for all requests
         chain = self.get_new_chain(chain_address)
 
@@ -391,14 +420,16 @@ class Hls(RPCModule):
 
 
     @format_params(decode_hex, identity)
-    async def getBlockByHash(self, block_hash: Hash32, include_transactions: bool = False):
+    @blocking_read
+    def getBlockByHash(self, block_hash: Hash32, include_transactions: bool = False):
         chain = self.get_new_chain()
         block = chain.get_block_by_hash(block_hash)
         return block_to_dict(block, include_transactions, chain)
 
 
     @format_params(to_int_if_hex, decode_hex, identity)
-    async def getBlockByNumber(self, at_block, chain_address, include_transactions: bool = False):
+    @blocking_read
+    def getBlockByNumber(self, at_block, chain_address, include_transactions: bool = False):
         chain = self.get_new_chain(chain_address)
         block = chain.get_block_by_number(at_block, chain_address=chain_address)
         return block_to_dict(block, include_transactions, chain)
@@ -483,7 +514,8 @@ class Hls(RPCModule):
     # Block explorer
     #
     @format_params(to_int_if_hex, to_int_if_hex, decode_hex_if_str, decode_hex_if_str, identity)
-    async def getNewestBlocks(self, num_to_return = 10, start_idx = 0, after_hash = b'', chain_address = b'', include_transactions: bool = False):
+    @blocking_read
+    def getNewestBlocks(self, num_to_return = 10, start_idx = 0, after_hash = b'', chain_address = b'', include_transactions: bool = False):
         '''
         Returns list of block dicts
         :param start_idx:
@@ -559,14 +591,16 @@ class Hls(RPCModule):
     #
     # Admin tools and dev debugging
     #
-    async def getChronologicalBlockWindowTimestampHashes(self, timestamp: Timestamp):
+    @blocking_read
+    def getChronologicalBlockWindowTimestampHashes(self, timestamp: Timestamp):
         chain = self.get_new_chain()
         chronological_block_window = chain.chain_head_db.load_chronological_block_window(timestamp)
 
         return [[timestamp_root_hash[0], encode_hex(timestamp_root_hash[1])] for timestamp_root_hash in chronological_block_window]
 
 
-    async def getHistoricalRootHashes(self):
+    @blocking_read
+    def getHistoricalRootHashes(self):
         chain = self.get_new_chain()
         historical_root_hashes = chain.chain_head_db.get_historical_root_hashes()
 
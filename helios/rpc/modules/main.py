@@ -6,7 +6,9 @@ from lahja import (
     Endpoint
 )
 
-from typing import Type, TYPE_CHECKING
+import asyncio
+import functools
+from typing import Any, Callable, Type, TYPE_CHECKING
 from eth_typing import Address
 from eth_keys.datatypes import PrivateKey
 
@@ -14,6 +16,18 @@ if TYPE_CHECKING:
     from .personal import Personal
     from helios.rpc.main import RPCContext
 
+def blocking_read(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Turns a synchronous RPC method that reads from the chain or database into a coroutine that runs it in the
+    RPC read executor, instead of blocking the event loop. The method must not use the shared self._chain,
+    because other threads may be using it at the same time. It should make its own with get_new_chain.
+    """
+    @functools.wraps(func)
+    async def read_in_executor(self: 'RPCModule', *args: Any) -> Any:
+        return await self._run_in_read_executor(func, self, *args)
+    return read_in_executor
+
+
 class RPCModule:
     _chain: AsyncChain = None
     _chain_class: Type[AsyncChain] = None
@@ -29,6 +43,10 @@ class RPCModule:
     def set_chain(self, chain: AsyncChain) -> None:
         self._chain = chain
 
+    async def _run_in_read_executor(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._rpc_context.read_executor, functools.partial(func, *args))
+
     def get_new_chain(self, chain_address: Address = None, private_key: PrivateKey = None) -> AsyncChain:
         if chain_address is None:
             return self._chain_class(self._chain.db, wallet_address=self._chain.wallet_address, private_key = private_key)
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import logging
+import os
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Set,
+)
+
+from eth_typing import (
+    Address,
+    Hash32,
+)
+from eth_utils import encode_hex
+
+from helios.exceptions import BaseRPCError
+from helios.rpc.constants import (
+    MAX_PENDING_NOTIFICATIONS_PER_CONNECTION,
+    MAX_SUBSCRIPTIONS_PER_CONNECTION,
+    SUBSCRIPTION_NEW_BLOCK_HEADERS,
+    SUBSCRIPTION_RECEIVABLE_TRANSACTIONS,
+    SUBSCRIPTION_SYNC_STAGE,
+)
+
+# Sends a json string to the client that made the subscription.
+Subscriber = Callable[[str], Awaitable[Any]]
+
+
+def generate_notification(subscription_id: str, result: Any) -> str:
+    return json.dumps({
+        'jsonrpc': '2.0',
+        'method': 'hls_subscription',
+        'params': {
+            'subscription': subscription_id,
+            'result': result,
+        },
+    })
+
+
+class Subscription:
+    def __init__(self, subscription_id: str, kind: str, subscriber: Subscriber, address: Address = None) -> None:
+        self.subscription_id = subscription_id
+        self.kind = kind
+        self.subscriber = subscriber
+        self.address = address
+        # For receivable transaction subscriptions, the hashes of the receivable transactions that the client
+        # already knows about.
+        self.known_transaction_hashes: Set[Hash32] = set()
+
+
+class SubscriptionManager:
+    """
+    Keeps track of the subscriptions made with hls_subscribe, and pushes notifications to their subscribers.
+
+    Each subscriber has its own queue of notifications and its own task that sends them, so a slow connection
+    doesn't hold up the others. A subscriber that fails, because its connection was closed, or that falls more
+    than MAX_PENDING_NOTIFICATIONS_PER_CONNECTION notifications behind, loses all of its subscriptions.
+    """
+    logger = logging.getLogger('helios.rpc.subscriptions')
+
+    def __init__(self) -> None:
+        self._subscriptions: Dict[str, Subscription] = {}
+        self._queues: Dict[Subscriber, 'asyncio.Queue[str]'] = {}
+        self._senders: Dict[Subscriber, 'asyncio.Future[None]'] = {}
+
+    def subscribe(self, subscriber: Subscriber, kind: str, address: Address = None) -> Subscription:
+        if kind not in (SUBSCRIPTION_NEW_BLOCK_HEADERS, SUBSCRIPTION_RECEIVABLE_TRANSACTIONS, SUBSCRIPTION_SYNC_STAGE):
+            raise BaseRPCError("Unknown subscription type {}".format(kind))
+        if kind == SUBSCRIPTION_RECEIVABLE_TRANSACTIONS and address is None:
+            raise BaseRPCError("Subscribing to receivable transactions requires a chain address")
+
+        num_subscriptions = sum(
+            1 for subscription in self._subscriptions.values() if subscription.subscriber == subscriber
+        )
+        if num_subscriptions >= MAX_SUBSCRIPTIONS_PER_CONNECTION:
+            raise BaseRPCError("Connections can have at most {} subscriptions".format(MAX_SUBSCRIPTIONS_PER_CONNECTION))
+
+        subscription_id = encode_hex(os.urandom(16))
+        subscription = Subscription(subscription_id, kind, subscriber, address)
+        self._subscriptions[subscription_id] = subscription
+        return subscription
+
+    def unsubscribe(self, subscriber: Subscriber, subscription_id: str) -> bool:
+        """
+        Returns False if the subscription doesn't exist or belongs to a different subscriber.
+        """
+        subscription = self._subscriptions.get(subscription_id)
+        if subscription is None or subscription.subscriber != subscriber:
+            return False
+        del self._subscriptions[subscription_id]
+        return True
+
+    def unsubscribe_all(self, subscriber: Subscriber) -> None:
+        self._remove_subscriber(subscriber)
+        sender = self._senders.pop(subscriber, None)
+        if sender is not None:
+            sender.cancel()
+
+    def _remove_subscriber(self, subscriber: Subscriber) -> None:
+        for subscription_id, subscription in list(self._subscriptions.items()):
+            if subscription.subscriber == subscriber:
+                del self._subscriptions[subscription_id]
+
+        queue = self._queues.pop(subscriber, None)
+        if queue is not None:
+            # Nothing else will be sent, so anything waiting for the queue to empty can stop
+            while not queue.empty():
+                queue.get_nowait()
+                queue.task_done()
+
+    def get_subscriptions(self, kind: str) -> List[Subscription]:
+        return [subscription for subscription in self._subscriptions.values() if subscription.kind == kind]
+
+    def notify(self, subscription: Subscription, result: Any) -> None:
+        """
+        Queues a notification for the subscription. It is sent by the task of its subscriber.
+        """
+        subscriber = subscription.subscriber
+        queue = self._queues.get(subscriber)
+        if queue is None:
+            queue = self._queues[subscriber] = asyncio.Queue(MAX_PENDING_NOTIFICATIONS_PER_CONNECTION)
+            self._senders[subscriber] = asyncio.ensure_future(self._send_notifications(subscriber, queue))
+
+        try:
+            queue.put_nowait(generate_notification(subscription.subscription_id, result))
+        except asyncio.QueueFull:
+            self.logger.debug(
+                "Removing the subscriptions of a subscriber that is %d notifications behind",
+                MAX_PENDING_NOTIFICATIONS_PER_CONNECTION,
+            )
+            self.unsubscribe_all(subscriber)
+
+    async def _send_notifications(self, subscriber: Subscriber, queue: 'asyncio.Queue[str]') -> None:
+        while True:
+            notification = await queue.get()
+            try:
+                await subscriber(notification)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.logger.debug("Removing the subscriptions of a subscriber after failing to notify it")
+                self._senders.pop(subscriber, None)
+                self._remove_subscriber(subscriber)
+                return
+            finally:
+                queue.task_done()
+
+    async def wait_until_sent(self) -> None:
+        """
+        Waits until all of the queued notifications have been sent.
+        """
+        await asyncio.gather(*(queue.join() for queue in list(self._queues.values())))
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
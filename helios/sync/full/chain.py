@@ -19,7 +19,7 @@ from helios.sync.common.constants import CHRONOLOGICAL_BLOCK_HASH_FRAGMENT_TYPE_
     CHAIN_HEAD_BLOCK_HASH_FRAGMENT_TYPE_ID, CONSENSUS_MATCH_SYNC_STAGE_ID, ADDITIVE_SYNC_STAGE_ID, \
     FULLY_SYNCED_STAGE_ID, FAST_SYNC_STAGE_ID, SYNCER_CACHE_TO_PREVENT_MULTIPLE_IMPORTS_OF_SAME_BLOCKS_EXPIRE_TIME, \
     SYNCER_RECENTLY_IMPORTED_BLOCK_MEMORY_EXPIRE_CHECK_LOOP_PERIOD
-from hp2p.events import NewBlockEvent, BlockImportQueueLengthRequest, BlockImportQueueLengthResponse
+from hp2p.events import NewBlockEvent, BlockImportQueueLengthRequest, BlockImportQueueLengthResponse, BlocksImportedEvent, BlocksRemovedEvent
 
 from hvm.utils.blocks import get_block_average_transaction_gas_price, does_block_meet_min_gas_price
 
@@ -123,7 +123,7 @@ from helios.nodes.base import Node
 
 from hvm.types import Timestamp
 
-from hvm.db.trie import _make_trie_root_and_nodes_isometric_on_order
+from hvm.db.trie import _make_trie_root_isometric_on_order
 
 from helios.utils.sync import get_missing_hash_locations_bytes
 
@@ -457,29 +457,50 @@ class RegularChainSyncer(BaseService, PeerSubscriber):
                 raise e
             except Exception as e:
                 self.logger.error("Error occured while trying to delete a block by hash. Error: {}".format(e))
+            else:
+                if self.event_bus is not None:
+                    self.event_bus.broadcast(BlocksRemovedEvent(block_hash))
 
     async def handle_priority_import_chains(self, chains: List[List[P2PBlock]],
                                             save_block_head_hash_timestamp: bool = False,
                                             allow_replacement: bool = True) -> None:
         async with self.importing_blocks_lock:
             # chain = self.node.get_new_chain()
-            for block_chain in chains:
-                try:
-                    await self.chains[0].coro_import_chain(block_list=block_chain,
-                                                  save_block_head_hash_timestamp=save_block_head_hash_timestamp,
-                                                  allow_replacement=allow_replacement)
-                except ReplacingBlocksNotAllowed:
+            # Import them all in one call to the chain process. If save_block_head_hash_timestamp is set, the
+            # historical root hashes are also only updated once, after the last chain.
+            try:
+                errors = await self.chains[0].coro_import_chains(chains=chains,
+                                                                 save_block_head_hash_timestamp=save_block_head_hash_timestamp,
+                                                                 allow_replacement=allow_replacement)
+            except Exception as e:
+                self.logger.error('tried to import chains and got error {}'.format(e))
+                if self.raise_errors:
+                    raise e
+                return
+
+            self.broadcast_imported_blocks([block
+                                            for block_list, error in zip(chains, errors) if error is None
+                                            for block in block_list])
+
+            unexpected_errors = []
+            for error in errors:
+                if error is None:
+                    continue
+                elif isinstance(error, ReplacingBlocksNotAllowed):
                     self.logger.debug('ReplacingBlocksNotAllowed error when importing chain.')
-                except ParentNotFound as e:
-                    self.logger.debug('ParentNotFound error when importing chain. {}'.format(e))
-                except ValidationError as e:
-                    self.logger.debug('ValidationError error when importing chain. Error: {}'.format(e))
-                except ValueError as e:
-                    self.logger.debug('ValueError error when importing chain. Error: {}'.format(e))
-                except Exception as e:
-                    self.logger.error('tried to import a chain and got error {}'.format(e))
-                    if self.raise_errors:
-                        raise e
+                elif isinstance(error, ParentNotFound):
+                    self.logger.debug('ParentNotFound error when importing chain. {}'.format(error))
+                elif isinstance(error, ValidationError):
+                    self.logger.debug('ValidationError error when importing chain. Error: {}'.format(error))
+                elif isinstance(error, ValueError):
+                    self.logger.debug('ValueError error when importing chain. Error: {}'.format(error))
+                else:
+                    self.logger.error('tried to import a chain and got error {}'.format(error))
+                    unexpected_errors.append(error)
+
+            # Raise only after every error has been logged
+            if unexpected_errors and self.raise_errors:
+                raise unexpected_errors[0]
 
     #
     # Loops
@@ -747,7 +768,7 @@ class RegularChainSyncer(BaseService, PeerSubscriber):
                         their_fragment_list_we_need_to_add = their_fragment_bundle_we_need_to_add.fragments
                         diff_verification_block_hashes.extend(their_fragment_list_we_need_to_add)
 
-                    diff_verification_root_hash, _ = _make_trie_root_and_nodes_isometric_on_order(tuple(diff_verification_block_hashes))
+                    diff_verification_root_hash = _make_trie_root_isometric_on_order(tuple(diff_verification_block_hashes))
 
                     if diff_verification_root_hash == their_fragment_bundle.root_hash_of_the_full_hashes:
                         self.logger.debug("Diff was correct. We need to request {} blocks and send {} blocks.".format(
@@ -1398,6 +1419,7 @@ class RegularChainSyncer(BaseService, PeerSubscriber):
             return False
 
         self.logger.debug('successfully imported block')
+        self.broadcast_imported_blocks([imported_block])
 
         # Only save transactions to throttling system after block has successfully imported. This ensures that if we are bombarded
         # with a bunch of invalid blocks, the min gas system won't go crazy.
@@ -1449,7 +1471,7 @@ class RegularChainSyncer(BaseService, PeerSubscriber):
                 else:
                     block_hashes = [x[1] for x in timestamp_block_hashes]
                     fragment_list = prepare_hash_fragments(block_hashes, fragment_length)
-                    trie_root, _ = _make_trie_root_and_nodes_isometric_on_order(tuple(block_hashes))
+                    trie_root = _make_trie_root_isometric_on_order(tuple(block_hashes))
                     peer.sub_proto.send_hash_fragments(fragments=fragment_list,
                                                        timestamp=timestamp,
                                                        fragment_length=fragment_length,
@@ -1502,7 +1524,7 @@ class RegularChainSyncer(BaseService, PeerSubscriber):
                                                        hash_type_id=hash_type_id)
                 else:
                     fragment_list = prepare_hash_fragments(block_hashes, fragment_length)
-                    trie_root, _ = _make_trie_root_and_nodes_isometric_on_order(tuple(block_hashes))
+                    trie_root = _make_trie_root_isometric_on_order(tuple(block_hashes))
                     peer.sub_proto.send_hash_fragments(fragments=fragment_list,
                                                        timestamp=timestamp,
                                                        fragment_length=fragment_length,
@@ -1560,6 +1582,7 @@ class RegularChainSyncer(BaseService, PeerSubscriber):
                     # this if for blocks that have already been imported elsewhere but need to be sent to network.
                     self.logger.debug("Sending new block to network")
                     self.propogate_block_to_network(block)
+                    self.broadcast_imported_blocks([block])
                 else:
                     self.logger.debug("Adding new block to queue")
                     new_block_queue_item = NewBlockQueueItem(block, from_rpc=req.from_rpc)
@@ -1573,6 +1596,10 @@ class RegularChainSyncer(BaseService, PeerSubscriber):
         await self.wait_first(new_block_event_loop(),current_new_block_queue_length_loop())
 
 
+    def broadcast_imported_blocks(self, blocks: List[P2PBlock]) -> None:
+        if self.event_bus is not None and len(blocks) > 0:
+            self.event_bus.broadcast(BlocksImportedEvent([block.header for block in blocks]))
+
     def propogate_block_to_network(self, block: P2PBlock):
         for peer in self.peer_pool.peers:
             self.logger.debug('Sending block {} on chain {} to peer {}'.format(block, encode_hex(block.header.chain_address), peer))
@@ -222,6 +222,12 @@ def construct_chain_config_params(
     if args.keystore_password is not None:
         yield 'keystore_password', args.keystore_password
 
+    if args.signature_cache_size is not None:
+        yield 'signature_cache_size', args.signature_cache_size
+
+    if args.peer_decode_workers is not None:
+        yield 'peer_decode_workers', args.peer_decode_workers
+
 
 def _default_max_peers(sync_mode: str) -> int:
     if sync_mode == SYNC_LIGHT:
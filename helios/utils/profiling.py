@@ -13,6 +13,8 @@ from typing import (
     Iterator,
 )
 
+from hvm.utils.signatures import get_signature_cache_stats
+
 
 def get_top_memory_usage(snapshot, key_type='lineno', limit=3, logger = None):
     snapshot = snapshot.filter_traces((
@@ -65,6 +67,13 @@ def sync_periodically_report_memory_stats(report_interval, memory_logger) -> Non
         get_top_memory_usage(snapshot, limit=30, logger=memory_logger)
         time.sleep(report_interval)
 
+def sync_periodically_report_signature_cache_stats(report_interval, logger) -> None:
+    # The counters are per process, so this has to run in the process that checks the signatures
+    import time
+    while True:
+        time.sleep(report_interval)
+        logger.debug("Signature cache: {}".format(get_signature_cache_stats()))
+
 @contextlib.contextmanager
 def profiler(filename: str) -> Iterator[None]:
     pr = cProfile.Profile()
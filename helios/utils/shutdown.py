@@ -14,6 +14,7 @@ from lahja import (
 from hp2p.service import (
     BaseService,
 )
+from hp2p.utils import shutdown_decode_executor
 
 
 async def exit_with_service_and_endpoint(service_to_exit: BaseService, endpoint: Endpoint) -> None:
@@ -33,6 +34,7 @@ async def exit_signal_with_service(service_to_exit: BaseService) -> AsyncGenerat
         await service_to_exit.cancel()
         yield
         service_to_exit._executor.shutdown(wait=True)
+        shutdown_decode_executor()
 
 
 @asynccontextmanager
@@ -12,7 +12,7 @@ from helios.sync.common.constants import ADDITIVE_SYNC_STAGE_ID
 from helios.utils.queues import empty_queue
 from hp2p.events import NewBlockEvent, StakeFromBootnodeRequest, StakeFromBootnodeResponse, CurrentSyncStageRequest, \
     CurrentSyncStageResponse, CurrentSyncingParametersRequest, CurrentSyncingParametersResponse, \
-    AverageNetworkMinGasPriceRequest, AverageNetworkMinGasPriceResponse
+    AverageNetworkMinGasPriceRequest, AverageNetworkMinGasPriceResponse, SyncStageChangedEvent
 from hvm.rlp.consensus import NodeStakingScore
 
 from lahja import Endpoint
@@ -339,18 +339,18 @@ class Consensus(BaseService, PeerSubscriber):
 
         if self._last_check_if_syncing_time < (int(time.time()) - SYNC_WITH_CONSENSUS_LOOP_TIME_PERIOD):
             if not self.coro_is_ready.is_set():
-                self._current_sync_stage = 0
+                self._set_current_sync_stage(0)
             else:
                 try:
                     sync_params = await self.get_blockchain_sync_parameters()
                 except NoEligiblePeers:
-                    self._current_sync_stage = 0
+                    self._set_current_sync_stage(0)
                 else:
                     if sync_params is None:
-                        self._current_sync_stage = 4
+                        self._set_current_sync_stage(4)
                     else:
                         sync_stage = sync_params.sync_stage
-                        self._current_sync_stage = sync_stage
+                        self._set_current_sync_stage(sync_stage)
 
             self._last_check_if_syncing_time = int(time.time())
 
@@ -359,9 +359,14 @@ class Consensus(BaseService, PeerSubscriber):
 
     @current_sync_stage.setter
     def current_sync_stage(self, sync_stage):
-        self._current_sync_stage = sync_stage
+        self._set_current_sync_stage(sync_stage)
         self._last_check_if_syncing_time = int(time.time())
 
+    def _set_current_sync_stage(self, sync_stage: int) -> None:
+        if sync_stage != self._current_sync_stage and self.event_bus is not None:
+            self.event_bus.broadcast(SyncStageChangedEvent(sync_stage))
+        self._current_sync_stage = sync_stage
+
     #    @property
 #    def min_gas_system_ready(self):
 #        '''
@@ -79,6 +79,24 @@ MAX_CONCURRENT_CONNECTION_ATTEMPTS = 10
 # The amount of seconds a connection can be idle.
 HANDSHAKE_TIMEOUT = 10
 
+# Peer messages at least this large are decoded in the decode executor instead of on the event loop, so that a
+# peer sending large chain segments doesn't hold up the other peers.
+DECODE_IN_EXECUTOR_MIN_SIZE = 64 * 1024
+
+# The default number of processes in the decode executor. 0 decodes every message on the event loop.
+DEFAULT_DECODE_EXECUTOR_MAX_WORKERS = 2
+
+# Peers whose Hello has at least this p2p version can send and receive compressed frames. Older peers ignore the
+# version, so they keep getting uncompressed frames.
+FRAME_COMPRESSION_P2P_VERSION = 5
+
+# Only frames at least this large are compressed, with this zlib level.
+FRAME_COMPRESSION_MIN_SIZE = 1024
+FRAME_COMPRESSION_LEVEL = 1
+
+# A frame's size has to fit in 3 bytes, so no message can be larger than this once decompressed either.
+MAX_FRAME_SIZE = 2 ** 24 - 1
+
 ############
 # NEW HELIOS
 ############
@@ -2,6 +2,7 @@ from typing import (
     Type,
     Dict,
     Any,
+    List,
     TYPE_CHECKING
 )
 
@@ -14,10 +15,11 @@ from lahja import (
     BaseRequestResponseEvent,
 )
 
-from eth_typing import Address
+from eth_typing import Address, Hash32
 from helios.protocol.common.datastructures import SyncParameters
 
 from helios.rlp_templates.hls import P2PBlock
+from hvm.rlp.headers import BlockHeader
 if TYPE_CHECKING:
     from helios.protocol.common.datastructures import ConnectedNodesInfo
 
@@ -121,3 +123,27 @@ class NewBlockEvent(BaseRequestResponseEvent[NoResponse]):
     def expected_response_type() -> Type[NoResponse]:
         return NoResponse
 
+
+class BlocksImportedEvent(BaseEvent):
+    """
+    Broadcast by the chain syncer after it imports blocks, with their headers.
+    """
+    def __init__(self, headers: List[BlockHeader]) -> None:
+        self.headers = headers
+
+
+class BlocksRemovedEvent(BaseEvent):
+    """
+    Broadcast by the chain syncer after it removes a block, and all of its children, from the database.
+    """
+    def __init__(self, block_hash: Hash32) -> None:
+        self.block_hash = block_hash
+
+
+class SyncStageChangedEvent(BaseEvent):
+    """
+    Broadcast by consensus when it finds that the sync stage has changed.
+    """
+    def __init__(self, sync_stage: int) -> None:
+        self.sync_stage = sync_stage
+
@@ -10,6 +10,7 @@ from cytoolz import assoc
 import rlp_cython as rlp
 from rlp_cython import sedes
 
+from hp2p.constants import FRAME_COMPRESSION_P2P_VERSION
 from hp2p.exceptions import MalformedMessage
 
 from hp2p.protocol import (
@@ -83,7 +84,8 @@ class Pong(Command):
 
 class P2PProtocol(Protocol):
     name = 'hp2p'
-    version = 4
+    # Version 5 tells the remote that we can receive compressed frames
+    version = FRAME_COMPRESSION_P2P_VERSION
     _commands = [Hello, Ping, Pong, Disconnect]
     cmd_length = 16
 
@@ -74,6 +74,7 @@ from hp2p.exceptions import (
 
 from hp2p.service import BaseService
 from hp2p.utils import (
+    get_decode_executor,
     get_devp2p_cmd_id,
     roundup_16,
     sxor,
@@ -90,7 +91,9 @@ from hp2p.p2p_proto import (
 
 from .constants import (
     CONN_IDLE_TIMEOUT,
+    DECODE_IN_EXECUTOR_MIN_SIZE,
     DEFAULT_MAX_PEERS,
+    FRAME_COMPRESSION_P2P_VERSION,
     DEFAULT_PEER_BOOT_TIMEOUT,
     HEADER_LEN,
     MAC_LEN,
@@ -203,6 +206,10 @@ class BasePeer(BaseService):
     read_msg_count: int = 0
     throttle_to_msg_per_second = 4
     throttle_window = 100
+    # Messages at least this large are decoded in another process. None decodes every message here.
+    decode_in_executor_min_size = DECODE_IN_EXECUTOR_MIN_SIZE
+    # Set during the P2P handshake if the remote can also send and receive compressed frames.
+    frame_compression = False
 
     def __init__(self,
                  remote: Node,
@@ -442,13 +449,11 @@ class BasePeer(BaseService):
         read_size = roundup_16(frame_size)
         frame_data = await self.read(read_size + MAC_LEN)
         msg = self.decrypt_body(frame_data, frame_size)
+        if self.frame_compression and protocol.is_compressed_frame(header):
+            msg = protocol.decompress_msg(msg)
         cmd = self.get_protocol_command_for(msg)
-        # NOTE: This used to be a bottleneck but it doesn't seem to be so anymore. If we notice
-        # too much time is being spent on this again, we need to consider running this in a
-        # ProcessPoolExecutor(). Need to make sure we don't use all CPUs in the machine for that,
-        # though, otherwise asyncio's event loop can't run and we can't keep up with other peers.
         try:
-            decoded_msg = cast(Dict[str, Any], cmd.decode(msg))
+            decoded_msg = cast(Dict[str, Any], await self.decode_msg(cmd, msg))
         except MalformedMessage as err:
             self.logger.debug(
                 "Malformed message from peer %s: CMD:%s Error: %r",
@@ -460,6 +465,19 @@ class BasePeer(BaseService):
             self.received_msgs[cmd] += 1
             return cmd, decoded_msg
 
+    async def decode_msg(self, cmd: protocol.Command, msg: bytes) -> protocol.PayloadType:
+        """
+        Decodes small messages here, and large ones in the decode executor so that the event loop can keep
+        serving the other peers meanwhile. Messages from this peer are still handled in order, because the
+        next one isn't read until this one is decoded.
+        """
+        if self.decode_in_executor_min_size is not None and len(msg) >= self.decode_in_executor_min_size:
+            executor = get_decode_executor()
+            if executor is not None:
+                loop = self.get_event_loop()
+                return await self.wait(loop.run_in_executor(executor, cmd.decode, msg))
+        return cmd.decode(msg)
+
     def handle_p2p_msg(self, cmd: protocol.Command, msg: protocol.PayloadType) -> None:
         """Handle the base protocol (P2P) messages."""
         if isinstance(cmd, Disconnect):
@@ -505,6 +523,10 @@ class BasePeer(BaseService):
             await self.disconnect(DisconnectReason.bad_protocol)
             raise HandshakeFailure(f"Expected a Hello msg, got {cmd}, disconnecting")
         remote_capabilities = msg['capabilities']
+        self.frame_compression = (
+            self.base_protocol.version >= FRAME_COMPRESSION_P2P_VERSION and
+            msg['version'] >= FRAME_COMPRESSION_P2P_VERSION
+        )
         try:
             self.sub_proto = self.select_sub_protocol(remote_capabilities)
         except NoMatchingPeerCapabilities:
@@ -589,6 +611,8 @@ class BasePeer(BaseService):
             self.logger.error(
                 "Attempted to send msg with cmd id %d to disconnected peer %s", cmd_id, self)
             return
+        if self.frame_compression:
+            header, body = protocol.compress_frame(header, body)
         self.writer.write(self.encrypt(header, body))
 
     def _disconnect(self, reason: DisconnectReason) -> None:
@@ -1,6 +1,7 @@
 from abc import ABC
 import logging
 import struct
+import zlib
 from typing import (
     Any,
     Dict,
@@ -18,6 +19,11 @@ from rlp_cython import sedes
 
 from hvm.constants import NULL_BYTE
 
+from hp2p.constants import (
+    FRAME_COMPRESSION_LEVEL,
+    FRAME_COMPRESSION_MIN_SIZE,
+    MAX_FRAME_SIZE,
+)
 from hp2p.exceptions import (
     MalformedMessage,
 )
@@ -110,21 +116,7 @@ class Command:
     def encode(self, data: PayloadType) -> Tuple[bytes, bytes]:
         payload = self.encode_payload(data)
         enc_cmd_id = rlp.encode(self.cmd_id, sedes=rlp.sedes.big_endian_int)
-        frame_size = len(enc_cmd_id) + len(payload)
-        if frame_size.bit_length() > 24:
-            raise ValueError("Frame size has to fit in a 3-byte integer")
-
-        # Drop the first byte as, per the spec, frame_size must be a 3-byte int.
-        header = struct.pack('>I', frame_size)[1:]
-        # All clients seem to ignore frame header data, so we do the same, although I'm not sure
-        # why geth uses the following value:
-        # https://github.com/ethereum/go-ethereum/blob/master/p2p/rlpx.go#L556
-        zero_header = b'\xc2\x80\x80'
-        header += zero_header
-        header = _pad_to_16_byte_boundary(header)
-
-        body = _pad_to_16_byte_boundary(enc_cmd_id + payload)
-        return header, body
+        return make_frame(enc_cmd_id + payload)
 
 
 class BaseRequest(ABC, Generic[TRequestPayload]):
@@ -174,6 +166,58 @@ class Protocol:
         return "(%s, %d)" % (self.name, self.version)
 
 
+# All clients seem to ignore frame header data, so we do the same, although I'm not sure
+# why geth uses the following value:
+# https://github.com/ethereum/go-ethereum/blob/master/p2p/rlpx.go#L556
+FRAME_HEADER_DATA = b'\xc2\x80\x80'
+# Once frame compression has been agreed in the Hello, frames whose payload is compressed have a context-id of 1
+COMPRESSED_FRAME_HEADER_DATA = b'\xc2\x80\x01'
+
+
+def make_frame(msg: bytes, header_data: bytes = FRAME_HEADER_DATA) -> Tuple[bytes, bytes]:
+    """
+    Returns the padded frame header and body for a message, which is the rlp encoded cmd_id followed by the payload.
+    """
+    frame_size = len(msg)
+    if frame_size > MAX_FRAME_SIZE:
+        raise ValueError("Frame size has to fit in a 3-byte integer")
+
+    # Drop the first byte as, per the spec, frame_size must be a 3-byte int.
+    header = struct.pack('>I', frame_size)[1:] + header_data
+    return _pad_to_16_byte_boundary(header), _pad_to_16_byte_boundary(msg)
+
+
+def compress_frame(header: bytes, body: bytes) -> Tuple[bytes, bytes]:
+    """
+    Returns the frame with its payload compressed, or the same frame if it is too small to be worth compressing.
+    The cmd_id is left uncompressed, so the command can still be found from the first byte.
+    """
+    (frame_size,) = struct.unpack(b'>I', b'\x00' + header[:3])
+    if frame_size < FRAME_COMPRESSION_MIN_SIZE:
+        return header, body
+
+    msg = body[:frame_size]
+    compressed_msg = msg[:1] + zlib.compress(msg[1:], FRAME_COMPRESSION_LEVEL)
+    if len(compressed_msg) >= frame_size:
+        return header, body
+    return make_frame(compressed_msg, COMPRESSED_FRAME_HEADER_DATA)
+
+
+def is_compressed_frame(header: bytes) -> bool:
+    return header[3:3 + len(COMPRESSED_FRAME_HEADER_DATA)] == COMPRESSED_FRAME_HEADER_DATA
+
+
+def decompress_msg(msg: bytes) -> bytes:
+    decompressor = zlib.decompressobj()
+    try:
+        payload = decompressor.decompress(msg[1:], MAX_FRAME_SIZE)
+    except zlib.error as err:
+        raise MalformedMessage(f"Malformed compressed frame: {err!r}") from err
+    if decompressor.unconsumed_tail or not decompressor.eof:
+        raise MalformedMessage("Compressed frame is truncated or too large once decompressed")
+    return msg[:1] + payload
+
+
 def _pad_to_16_byte_boundary(data: bytes) -> bytes:
     """Pad the given data with NULL_BYTE up to the next 16-byte boundary."""
     remainder = len(data) % 16
@@ -3,7 +3,7 @@ from concurrent.futures import Executor, ProcessPoolExecutor
 import logging
 import os
 import signal
-from typing import Tuple
+from typing import Optional, Tuple
 
 import rlp_cython as rlp
 
@@ -16,6 +16,8 @@ from hvm.exceptions import (
     ValidationError,
 )
 
+from hp2p.constants import DEFAULT_DECODE_EXECUTOR_MAX_WORKERS
+
 def sxor(s1: bytes, s2: bytes) -> bytes:
     if len(s1) != len(s2):
         raise ValueError("Cannot sxor strings of different length")
@@ -107,6 +109,49 @@ def get_asyncio_executor(cpu_count: int=None) -> Executor:
     return _executor
 
 
+_decode_executor: Executor = None
+_decode_executor_max_workers = DEFAULT_DECODE_EXECUTOR_MAX_WORKERS
+
+
+def set_decode_executor_max_workers(max_workers: int) -> None:
+    """
+    Sets the number of processes used to decode large peer messages. Must be called before the executor is
+    first used.
+    """
+    global _decode_executor_max_workers
+
+    if _decode_executor is not None:
+        raise ValueError("The decode executor has already been started")
+    _decode_executor_max_workers = max_workers
+
+
+def get_decode_executor() -> Optional[Executor]:
+    """
+    Returns the global `ProcessPoolExecutor` used to decode large peer messages, or None if they should be
+    decoded on the event loop.
+
+    This is kept separate from `get_asyncio_executor` and small, so that a peer flooding us with large
+    messages can't occupy every CPU, or the workers used for other tasks.
+    """
+    global _decode_executor
+
+    if _decode_executor is None and _decode_executor_max_workers > 0:
+        # Ignore SIGINT in the worker processes, like get_asyncio_executor
+        original_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+        _decode_executor = ProcessPoolExecutor(_decode_executor_max_workers)
+        _decode_executor._start_queue_management_thread()  # type: ignore
+        signal.signal(signal.SIGINT, original_handler)
+    return _decode_executor
+
+
+def shutdown_decode_executor() -> None:
+    global _decode_executor
+
+    if _decode_executor is not None:
+        _decode_executor.shutdown(wait=True)
+        _decode_executor = None
+
+
 def extract_wallet_verification_sender(salt, v, r, s) -> bytes:
     vrs = (v, r, s)
     signature = keys.Signature(vrs=vrs)
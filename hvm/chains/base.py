@@ -1,8 +1,10 @@
 from __future__ import absolute_import
 import operator
 from collections import deque
+from contextlib import contextmanager
 
 import functools
+import threading
 
 from abc import (
     ABCMeta,
@@ -31,7 +33,7 @@ from typing import (  # noqa: F401
 
 import logging
 
-from itertools import groupby
+from itertools import chain as iter_chain, groupby
 
 from hvm.rlp.receipts import Receipt
 from hvm.types import Timestamp
@@ -67,13 +69,14 @@ from hvm.constants import (
     GENESIS_PARENT_HASH,
     BLOCK_TIMESTAMP_FUTURE_ALLOWANCE, BLOCK_TRANSACTION_LIMIT)
 
-from hvm.db.trie import make_trie_root_and_nodes
+from hvm.db.trie import make_trie_root
 
 from hvm import constants
 from hvm.estimators import (
     get_gas_estimator,
 )
 from hvm.exceptions import (
+    PyEVMError,
     HeaderNotFound,
     TransactionNotFound,
     ValidationError,
@@ -102,6 +105,7 @@ from eth_keys.exceptions import (
 )
 
 from hvm.utils.blocks import reorganize_chronological_block_list_for_correct_chronological_order_at_index
+from hvm.utils.signatures import recover_block_senders
 from hvm.validation import (
     validate_block_number,
     validate_uint256,
@@ -178,6 +182,8 @@ AccountState = Dict[Address, Dict[str, Union[int, bytes, Dict[int, int]]]]
 
 from hvm.db.min_gas import MinGasDB, BaseMinGasDB
 
+from lru import LRU
+
 class BaseChain(Configurable, metaclass=ABCMeta):
     """
     The base class for all Chain objects
@@ -462,6 +468,10 @@ class BaseChain(Configurable, metaclass=ABCMeta):
     def import_chain(self, block_list: List[BaseBlock], perform_validation: bool=True, save_block_head_hash_timestamp: bool = True, allow_replacement: bool = True) -> None:
         raise NotImplementedError("Chain classes must implement this method")
 
+    @abstractmethod
+    def import_chains(self, chains: List[List[BaseBlock]], perform_validation: bool=True, save_block_head_hash_timestamp: bool = True, allow_replacement: bool = True) -> List[Optional[Exception]]:
+        raise NotImplementedError("Chain classes must implement this method")
+
     # @abstractmethod
     # def import_chronological_block_window(self, block_list: List[BaseBlock], window_start_timestamp: Timestamp,
     #                                       save_block_head_hash_timestamp: bool = True,
@@ -559,6 +569,18 @@ class BaseChain(Configurable, metaclass=ABCMeta):
     def get_current_peer_node_health(self,peer_wallet_address: Address) -> PeerNodeHealth:
         raise NotImplementedError("Chain classes must implement this method")
 
+
+def _caching_vms(method: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Runs a Chain method inside Chain.cache_vms
+    """
+    @functools.wraps(method)
+    def wrapper(self: 'Chain', *args: Any, **kwargs: Any) -> Any:
+        with self.cache_vms():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class Chain(BaseChain):
     """
     A Chain is a combination of one or more VM classes.  Each VM is associated
@@ -569,7 +591,7 @@ class Chain(BaseChain):
     raise_errors = False
 
     logger = logging.getLogger("hvm.chain.chain.Chain")
-    header = None  # type: BlockHeader
+    _header = None  # type: BlockHeader
     network_id = None  # type: int
     gas_estimator = None  # type: Callable
     _journaldb = None
@@ -582,6 +604,15 @@ class Chain(BaseChain):
 
     _queue_block: BaseQueueBlock = None
 
+    # The number of VMs kept by get_vm inside cache_vms
+    vm_cache_size = 16
+    _vm_cache = None  # type: LRU
+    _vm_cache_thread_id = None  # type: int
+
+    # When True, imported blocks queue their head hash for the historical root hashes instead of saving it right
+    # away, so that the windows are only rewritten once for many blocks. See import_chain.
+    _queue_block_hashes_to_timestamps = False
+
 
     def __init__(self, base_db: BaseDB, wallet_address: Address, private_key: BaseKey=None) -> None:
         if not self.vm_configuration:
@@ -614,8 +645,56 @@ class Chain(BaseChain):
             self.gas_estimator = get_gas_estimator()  # type: ignore
 
     def reinitialize(self):
+        old_chain_head_db = self.chain_head_db
+        # Keep queueing if the database stays the same, like when import_chains moves on to the next chain. Otherwise
+        # save anything queued before the chain head db is replaced.
+        keep_queue = self._queue_block_hashes_to_timestamps and old_chain_head_db.db is self.db
+        if not keep_queue:
+            old_chain_head_db.flush_queued_block_hashes_to_timestamps()
+
         self.__init__(self.db, self.wallet_address, self.private_key)
 
+        if keep_queue:
+            old_chain_head_db.move_queued_block_hashes_to_timestamps(self.chain_head_db)
+
+    @property
+    def header(self) -> BlockHeader:
+        return self._header
+
+    @header.setter
+    def header(self, val: BlockHeader) -> None:
+        # The cached VMs were built on top of the old header
+        self.clear_vm_cache()
+        self._header = val
+
+    def clear_vm_cache(self) -> None:
+        """
+        Forget all of the VMs returned by get_vm. This must be called whenever something changes that the
+        VMs, or their state, depend on.
+        """
+        if self._vm_cache is not None:
+            self._vm_cache.clear()
+
+    @contextmanager
+    def cache_vms(self) -> Iterator[None]:
+        """
+        Inside this context, get_vm hands out the same VM again to the thread that entered it, so that a block import
+        only builds one VM. Outside of it, every get_vm call builds a new VM, because the chain is shared between
+        threads and a VM's state changes as it is used.
+        """
+        if self._vm_cache is not None:
+            # Already caching. The outer context will drop the cache.
+            yield
+            return
+
+        self._vm_cache = LRU(self.vm_cache_size)
+        self._vm_cache_thread_id = threading.get_ident()
+        try:
+            yield
+        finally:
+            self._vm_cache = None
+            self._vm_cache_thread_id = None
+
     def set_new_wallet_address(self, wallet_address: Address, private_key: BaseKey=None):
         self.logger.debug('setting new wallet address')
         self.wallet_address = wallet_address
@@ -679,6 +758,8 @@ class Chain(BaseChain):
 
     def record_journal(self) -> UUID:
         if self._journaldb is not None:
+            # Queued block hashes from before the record must not be thrown away by a discard
+            self.chain_head_db.flush_queued_block_hashes_to_timestamps()
             return (self._journaldb.record())
         else:
             raise JournalDbNotActivated()
@@ -687,6 +768,9 @@ class Chain(BaseChain):
         if self._journaldb is not None:
             db_changeset = changeset
             self._journaldb.discard(db_changeset)
+            self.chain_head_db.discard_queued_block_hashes_to_timestamps()
+            # The cached VMs might have read some of the discarded changes
+            self.clear_vm_cache()
         else:
             raise JournalDbNotActivated()
 
@@ -699,6 +783,7 @@ class Chain(BaseChain):
 
     def persist_journal(self) -> None:
         if self._journaldb is not None:
+            self.chain_head_db.flush_queued_block_hashes_to_timestamps()
             self._journaldb.persist()
         else:
             raise JournalDbNotActivated()
@@ -842,24 +927,46 @@ class Chain(BaseChain):
     def get_vm(self, header: BlockHeader=None, timestamp: Timestamp = None) -> 'BaseVM':
         """
         Returns the VM instance for the given block timestamp. Or if timestamp is given, gets the vm for that timestamp
+
+        Inside cache_vms, VMs are cached, so the same instance is returned until the chain head changes or
+        clear_vm_cache is called. Anything that changes the state of the returned VM there, like importing a block
+        with it, must call clear_vm_cache afterwards.
         """
         if header is not None and timestamp is not None:
             raise ValueError("Cannot specify header and timestamp for get_vm(). Only one is allowed.")
 
         if header is None or header == self.header:
-            header = self.header
-            if timestamp is not None:
-                header = header.copy(timestamp = timestamp)
-
-            vm_class = self.get_vm_class_for_block_timestamp(header.timestamp)
-            return vm_class(header=header,
-                           chaindb=self.chaindb,
-                           network_id=self.network_id)
+            if timestamp is None:
+                timestamp = self.header.timestamp
+            vm_class = self.get_vm_class_for_block_timestamp(timestamp)
+            # The cache is cleared whenever self.header changes, so the timestamp identifies the header here.
+            cache_key = (vm_class, timestamp)
         else:
             vm_class = self.get_vm_class_for_block_timestamp(header.timestamp)
-            return vm_class(header=header,
-                            chaindb=self.chaindb,
-                            network_id=self.network_id)
+            cache_key = (vm_class, header.hash)
+
+        vm_cache = self._vm_cache
+        if vm_cache is not None and self._vm_cache_thread_id != threading.get_ident():
+            vm_cache = None
+
+        if vm_cache is not None:
+            try:
+                return vm_cache[cache_key]
+            except KeyError:
+                pass
+
+        if header is None or header == self.header:
+            if timestamp == self.header.timestamp:
+                header = self.header
+            else:
+                header = self.header.copy(timestamp = timestamp)
+
+        vm = vm_class(header=header,
+                      chaindb=self.chaindb,
+                      network_id=self.network_id)
+        if vm_cache is not None:
+            vm_cache[cache_key] = vm
+        return vm
 
 
     #
@@ -1493,6 +1600,8 @@ class Chain(BaseChain):
         self.chaindb.delete_block_from_canonical_chain(descendant_block_hash)
         #self.chaindb.save_unprocessed_block_lookup(descendant_block_hash)
         vm.state.account_db.persist()
+        # The cached VMs might hold the state of the reverted block
+        self.clear_vm_cache()
 
     def revert_block_chronological_consistency_lookups(self, block_hash: Hash32) -> None:
         # check to see if there are any reward type 2 proofs. Then loop through each one to revert inconsistency lookups
@@ -1551,6 +1660,7 @@ class Chain(BaseChain):
 
                 # Must persist now because revert_block creates new vm's for each block and could overrwite changes if we wait.
                 vm.state.account_db.persist()
+                self.clear_vm_cache()
 
                 #now we know what the new heads are, so we can deal with the rest of the descendants
                 for descendant_block_hash in all_descendant_block_hashes:
@@ -1680,13 +1790,16 @@ class Chain(BaseChain):
                 block_list = corrected_block_list
 
 
+            recover_block_senders(block_list)
+
             wallet_address = block_list[0].header.chain_address
-            for block in block_list:
-                self.import_block(block,
-                                  perform_validation = perform_validation,
-                                  save_block_head_hash_timestamp = save_block_head_hash_timestamp,
-                                  wallet_address = wallet_address,
-                                  allow_replacement = allow_replacement)
+            with self.queue_block_hashes_to_timestamps():
+                for block in block_list:
+                    self.import_block(block,
+                                      perform_validation = perform_validation,
+                                      save_block_head_hash_timestamp = save_block_head_hash_timestamp,
+                                      wallet_address = wallet_address,
+                                      allow_replacement = allow_replacement)
 
             # If we started with a longer chain, and all the imported blocks match ours, our chain will remain longer even after importing the new one.
             # To fix this, we need to delete any blocks of ours that is longer in length then this chain that we are importing
@@ -1711,12 +1824,61 @@ class Chain(BaseChain):
                 pass
 
 
+    def import_chains(self, chains: List[List[BaseBlock]], perform_validation: bool=True, save_block_head_hash_timestamp: bool = True, allow_replacement: bool = True) -> List[Optional[Exception]]:
+        """
+        Imports each chain with import_chain, but only saves the head hashes to the historical root hashes once,
+        after all of the chains. A chain that can't be imported, because import_chain raised a PyEVMError or
+        ValueError, doesn't stop the others. Returns that error for each chain, or None if it imported. Any other
+        error is raised.
+        """
+        # Check the signatures of all of the chains at once, rather than a chain at a time
+        recover_block_senders(iter_chain.from_iterable(chains))
+
+        errors = []  # type: List[Optional[Exception]]
+        with self.queue_block_hashes_to_timestamps():
+            for block_list in chains:
+                try:
+                    self.import_chain(block_list,
+                                      perform_validation = perform_validation,
+                                      save_block_head_hash_timestamp = save_block_head_hash_timestamp,
+                                      allow_replacement = allow_replacement)
+                except (PyEVMError, ValueError) as e:
+                    errors.append(e)
+                else:
+                    errors.append(None)
+        return errors
+
+    @contextmanager
+    def queue_block_hashes_to_timestamps(self) -> Iterator[None]:
+        """
+        Blocks imported inside this context only save their head hash to the historical root hashes when it exits.
+
+        The queued head hashes are saved even if an error leaves the context. Each one was queued by a block that has
+        already been saved as the head of its chain, so dropping them would leave the historical root hashes behind
+        the chain heads, like when one chain of import_chains fails after the others have imported. A block import
+        that is rolled back with discard_journal drops the head hashes that it queued itself.
+        """
+        if self._queue_block_hashes_to_timestamps:
+            # Already queueing. The outer context will save them.
+            yield
+            return
+
+        self._queue_block_hashes_to_timestamps = True
+        try:
+            yield
+        finally:
+            # On errors too. See above.
+            self._queue_block_hashes_to_timestamps = False
+            self.chain_head_db.flush_queued_block_hashes_to_timestamps()
+            self.chain_head_db.persist(True)
+
     from hvm.utils.profile import profile
     @profile(sortby='cumulative')
     def import_block_with_profiler(self, *args, **kwargs):
         self.import_block(*args, **kwargs)
 
 
+    @_caching_vms
     def import_block(self, block: BaseBlock,
                      perform_validation: bool=True,
                      save_block_head_hash_timestamp = True,
@@ -1736,6 +1898,9 @@ class Chain(BaseChain):
         if wallet_address != self.wallet_address:
             self.logger.debug("Changing to chain with wallet address {}".format(encode_hex(wallet_address)))
             self.set_new_wallet_address(wallet_address=wallet_address)
+        else:
+            # Start from a clean VM. All of the get_vm calls below then share that one VM.
+            self.clear_vm_cache()
 
         journal_enabled = False
 
@@ -1964,10 +2129,14 @@ class Chain(BaseChain):
             try:
                 vm = self.get_vm(timestamp = block.header.timestamp)
                 self.logger.debug("importing block with vm {}".format(vm.__repr__()))
-                if queue_block:
-                    imported_block = vm.import_block(block, private_key = self.private_key)
-                else:
-                    imported_block = vm.import_block(block)
+                try:
+                    if queue_block:
+                        imported_block = vm.import_block(block, private_key = self.private_key)
+                    else:
+                        imported_block = vm.import_block(block)
+                finally:
+                    # Importing changes the state of the vm, so it must not be handed out again.
+                    self.clear_vm_cache()
 
 
                 # Validate the imported block.
@@ -1998,7 +2167,10 @@ class Chain(BaseChain):
 
                 if save_block_head_hash_timestamp:
                     self.chain_head_db.add_block_hash_to_chronological_window(imported_block.header.hash, imported_block.header.timestamp)
-                    self.chain_head_db.add_block_hash_to_timestamp(imported_block.header.chain_address, imported_block.hash, imported_block.header.timestamp)
+                    if self._queue_block_hashes_to_timestamps:
+                        self.chain_head_db.queue_block_hash_to_timestamp(imported_block.header.chain_address, imported_block.hash, imported_block.header.timestamp)
+                    else:
+                        self.chain_head_db.add_block_hash_to_timestamp(imported_block.header.chain_address, imported_block.hash, imported_block.header.timestamp)
 
 
                 self.chain_head_db.set_chain_head_hash(imported_block.header.chain_address, imported_block.header.hash)
@@ -2281,12 +2453,12 @@ class Chain(BaseChain):
         for transaction in block.receive_transactions:
             transaction.validate()
 
-        send_tx_root_hash, _ = make_trie_root_and_nodes(block.transactions)
+        send_tx_root_hash = make_trie_root(block.transactions)
 
         if block.header.transaction_root != send_tx_root_hash:
             raise ValidationError("Block has invalid transaction root")
 
-        receive_tx_root_hash, _ = make_trie_root_and_nodes(block.receive_transactions)
+        receive_tx_root_hash = make_trie_root(block.receive_transactions)
         if block.header.receive_transaction_root != receive_tx_root_hash:
             raise ValidationError("Block has invalid receive transaction root")
 
@@ -2,11 +2,12 @@ from abc import (
     ABCMeta,
     abstractmethod
 )
+from collections import defaultdict
 from uuid import UUID
 import traceback
 import logging
 from lru import LRU
-from typing import Set, Tuple, List, Optional  # noqa: F401
+from typing import Dict, Set, Tuple, List, Optional  # noqa: F401
 
 from eth_typing import Hash32
 
@@ -25,6 +26,7 @@ from hvm.constants import (
     EMPTY_SHA3,
     SLASH_WALLET_ADDRESS,
 )
+from hvm.db.backends.base import BaseDB
 from hvm.db.batch import (
     BatchDB,
 )
@@ -32,10 +34,14 @@ from hvm.db.cache import (
     CacheDB,
 )
 from hvm.db.journal import (
+    DELETED_ENTRY,
+    Journal,
     JournalDB,
 )
 from hvm.rlp.accounts import (
     Account,
+    ReceivableTransactionEntry,
+    ReceivableTransactionsSummary,
     TransactionKey,
 )
 from hvm.validation import (
@@ -63,9 +69,8 @@ from hvm.rlp.sedes import(
 
 
 
-# Use lru-dict instead of functools.lru_cache because the latter doesn't let us invalidate a single
-# entry, so we'd have to invalidate the whole cache in _set_account() and that turns out to be too
-# expensive.
+# Decoded accounts, keyed by their RLP encoding. Accounts are immutable so they can be shared by
+# every AccountDB. Use lru-dict instead of functools.lru_cache because it is faster to look up.
 account_cache = LRU(2048)
 
 
@@ -213,6 +218,8 @@ class AccountDB(BaseAccountDB):
 
     logger = logging.getLogger('hvm.db.account.AccountDB')
 
+    storage_trie_node_cache_size = 4096
+
     def __init__(self, db):
         r"""
         Internal implementation details (subject to rapid change):
@@ -225,11 +232,24 @@ class AccountDB(BaseAccountDB):
         _journaldb is a journaling of the keys and values used to store
         code and account storage.
 
-        TODO: add cache
-        _trie_cache is a cache tied to the state root of the trie. It
-        is important that this cache is checked *after* looking for
-        the key in _journaltrie, because the cache is only invalidated
-        after a state root change.
+        _account_journal holds the decoded accounts that have been written,
+        keyed by address, with the same changesets as _journaldb. It is
+        checked before _journaldb, and the accounts are only encoded and
+        written to _journaldb when persisting.
+
+        _storage_journal buffers storage writes in the same way, keyed by
+        (address, storage version, slot). They are written to the storage
+        tries, and the new storage roots to the accounts, when persisting.
+        The storage version of an address is kept under the address itself,
+        and is increased whenever the account's storage root is replaced, so
+        that writes buffered for the old storage are no longer seen.
+
+        _storage_roots caches the storage roots that include the buffered
+        writes, keyed by (address, storage version), so that reading an
+        account hash doesn't rebuild them every time. They are computed in a
+        BatchDB that is thrown away, so reads don't write any trie nodes.
+
+        _storage_trie_db caches the storage trie nodes, keyed by node hash.
 
         AccountDB synchronizes the snapshot/revert/persist the
         journal.
@@ -237,6 +257,9 @@ class AccountDB(BaseAccountDB):
         self.db = db
         self._batchdb = BatchDB(db)
         self._journaldb = JournalDB(self._batchdb)
+        self._storage_trie_db = CacheDB(self._journaldb, cache_size=self.storage_trie_node_cache_size)
+        self._reset_account_journal()
+        self._reset_storage_journal()
 
 
     #
@@ -246,8 +269,12 @@ class AccountDB(BaseAccountDB):
         validate_canonical_address(address, title="Storage Address")
         validate_uint256(slot, title="Storage Slot")
 
+        value = self._storage_journal[(address, self._get_storage_version(address), slot)]
+        if value is not None:
+            return value
+
         account = self._get_account(address)
-        storage = HashTrie(HexaryTrie(self._journaldb, account.storage_root))
+        storage = HashTrie(HexaryTrie(self._storage_trie_db, account.storage_root))
 
         slot_as_key = pad32(int_to_big_endian(slot))
 
@@ -262,24 +289,92 @@ class AccountDB(BaseAccountDB):
         validate_uint256(slot, title="Storage Slot")
         validate_canonical_address(address, title="Storage Address")
 
+        # The storage trie and the account's storage root are only updated when persisting
+        storage_version = self._get_storage_version(address)
+        self._storage_journal[(address, storage_version, slot)] = value
+        self._storage_roots.pop((address, storage_version), None)
+        self.touch_account(address)
+
+    def delete_storage(self, address):
+        validate_canonical_address(address, title="Storage Address")
+
         account = self._get_account(address)
-        storage = HashTrie(HexaryTrie(self._journaldb, account.storage_root))
+        self._increment_storage_version(address)
+        self._set_account(address, account.copy(storage_root=BLANK_ROOT_HASH))
 
-        slot_as_key = pad32(int_to_big_endian(slot))
+    def _get_storage_version(self, address: Address) -> int:
+        version = self._storage_journal[address]
+        if version is None:
+            return 0
+        return version
 
-        if value:
-            encoded_value = rlp.encode(value)
-            storage[slot_as_key] = encoded_value
-        else:
-            del storage[slot_as_key]
+    def _increment_storage_version(self, address: Address) -> None:
+        self._storage_journal[address] = self._get_storage_version(address) + 1
 
-        self._set_account(address, account.copy(storage_root=storage.root_hash))
+    def _get_pending_storage_writes(self, storage_journal_data: Dict) -> Dict[Address, List[Tuple[int, int]]]:
+        """
+        Group the storage writes in the data of the storage journal by address. Writes made before
+        the storage root of the account was last replaced are left out.
+        """
+        storage_writes = defaultdict(list)  # type: Dict[Address, List[Tuple[int, int]]]
+        for key, value in storage_journal_data.items():
+            if isinstance(key, tuple):
+                address, version, slot = key
+                if version == storage_journal_data.get(address, 0):
+                    storage_writes[address].append((slot, value))
+        return storage_writes
+
+    def _apply_storage_writes(self, account: Account, storage_writes: List[Tuple[int, int]], trie_db: BaseDB) -> Account:
+        """
+        Write the slots to the account's storage trie in trie_db, and return the account with the new storage root.
+        """
+        storage = HashTrie(HexaryTrie(trie_db, account.storage_root))
 
-    def delete_storage(self, address):
-        validate_canonical_address(address, title="Storage Address")
+        for slot, value in storage_writes:
+            slot_as_key = pad32(int_to_big_endian(slot))
+            if value:
+                storage[slot_as_key] = rlp.encode(value)
+            else:
+                del storage[slot_as_key]
+
+        return account.copy(storage_root=storage.root_hash)
 
+    def _get_account_with_storage_root(self, address: Address) -> Account:
+        """
+        Return the account, with a storage root that includes the storage writes that haven't been
+        persisted yet.
+        """
         account = self._get_account(address)
-        self._set_account(address, account.copy(storage_root=BLANK_ROOT_HASH))
+        storage_roots_key = (address, self._get_storage_version(address))
+        try:
+            return account.copy(storage_root=self._storage_roots[storage_roots_key])
+        except KeyError:
+            pass
+
+        storage_journal_data = self._storage_journal.merged_changesets()
+        storage_writes = self._get_pending_storage_writes(storage_journal_data).get(address)
+        if storage_writes:
+            # The trie nodes are written to a batch that is never committed. They are written for real when persisting.
+            account = self._apply_storage_writes(account, storage_writes, BatchDB(self._storage_trie_db))
+
+        self._storage_roots[storage_roots_key] = account.storage_root
+        return account
+
+    def _flush_storage_journal(self) -> None:
+        """
+        Write the buffered storage writes to the storage tries, once per account.
+        """
+        storage_journal_data = self._storage_journal.merged_changesets()
+        for address, storage_writes in self._get_pending_storage_writes(storage_journal_data).items():
+            account = self._get_account(address)
+            self._set_account(address, self._apply_storage_writes(account, storage_writes, self._storage_trie_db))
+
+        self._reset_storage_journal()
+
+    def _reset_storage_journal(self) -> None:
+        self._storage_journal = Journal()
+        self._storage_journal.record_changeset()
+        self._storage_roots = {}  # type: Dict[Tuple[Address, int], Hash32]
 
     #
     # Balance
@@ -341,22 +436,41 @@ class AccountDB(BaseAccountDB):
     #
     # Receivable Transactions
     #
+    # These are kept in an index next to the account instead of in the account itself, so that
+    # reading and writing an account doesn't get slower as they pile up. The index is a linked list
+    # of ReceivableTransactionEntry, in the order the transactions were added, with a
+    # ReceivableTransactionsSummary holding the count and the two ends.
+    #
+    # Accounts saved before the index existed still have receivable transactions in the account.
+    # They are read from there until the account is next written, which moves them into the index.
+    #
     def get_receivable_transactions(self, address: Address) -> List[TransactionKey]:
         validate_canonical_address(address, title="Storage Address")
         account = self._get_account(address)
-        return account.receivable_transactions
+        receivable_transactions = list(account.receivable_transactions)
+
+        transaction_hash = self._get_receivable_transactions_summary(address).first_transaction_hash
+        while transaction_hash:
+            entry = self._get_receivable_transaction_entry(address, transaction_hash)
+            receivable_transactions.append(TransactionKey(transaction_hash, entry.sender_block_hash))
+            transaction_hash = entry.next_transaction_hash
+
+        return tuple(receivable_transactions)
     
     def has_receivable_transactions(self, address: Address) -> bool:
-        tx = self.get_receivable_transactions(address)
-        if len(tx) == 0:
-            return False
-        else:
+        validate_canonical_address(address, title="Storage Address")
+        if self._get_receivable_transactions_summary(address).count:
             return True
+        return len(self._get_account(address).receivable_transactions) != 0
         
     def get_receivable_transaction(self, address: Address, transaction_hash: Hash32) -> Optional[TransactionKey]:
+        validate_canonical_address(address, title="Storage Address")
         validate_is_bytes(transaction_hash, title="Transaction Hash")
-        all_tx = self.get_receivable_transactions(address)
-        for tx_key in all_tx:
+        entry = self._get_receivable_transaction_entry(address, transaction_hash)
+        if entry is not None:
+            return TransactionKey(transaction_hash, entry.sender_block_hash)
+
+        for tx_key in self._get_account(address).receivable_transactions:
             if tx_key.transaction_hash == transaction_hash:
                 return tx_key
         return None
@@ -376,22 +490,16 @@ class AccountDB(BaseAccountDB):
         if address == SLASH_WALLET_ADDRESS:
             return
 
-
-        account = self._get_account(address)
-        receivable_transactions = account.receivable_transactions
+        # Writing the account creates it if it doesn't exist, and moves any receivable transactions
+        # it still holds into the index.
+        self.touch_account(address)
 
         # first lets make sure we don't already have the transaction
-        for tx_key in receivable_transactions:
-            if tx_key.transaction_hash == transaction_hash:
-                raise ValueError("Tried to save a receivable transaction that was already saved. TX HASH = {}".format(encode_hex(transaction_hash)))
+        if self._get_receivable_transaction_entry(address, transaction_hash) is not None:
+            raise ValueError("Tried to save a receivable transaction that was already saved. TX HASH = {}".format(encode_hex(transaction_hash)))
 
-        
-        new_receivable_transactions = receivable_transactions + (TransactionKey(transaction_hash, sender_block_hash), )
-        
-        
-        #self.logger.debug(new_receivable_transactions)
         self.logger.debug("Adding receivable transaction {} to account {}".format(encode_hex(transaction_hash), encode_hex(address)))
-        self._set_account(address, account.copy(receivable_transactions=new_receivable_transactions))
+        self._append_receivable_transaction(address, transaction_hash, sender_block_hash)
 
         #finally, if this is a smart contract, lets add it to the list of smart contracts with pending transactions
         if is_contract_deploy or self.get_code_hash(address) != EMPTY_SHA3:
@@ -404,27 +512,110 @@ class AccountDB(BaseAccountDB):
         validate_is_bytes(transaction_hash, title="Transaction Hash")
         
         self.logger.debug("deleting receivable tx {} from account {}".format(encode_hex(transaction_hash), encode_hex(address)))
-        account = self._get_account(address)
-        receivable_transactions = list(self.get_receivable_transactions(address))
-        i = 0
-        found = False
-        for tx_key in receivable_transactions:
-            if tx_key.transaction_hash == transaction_hash:
-                found = True
-                break
-            i +=1
-            
-        if found == True:
-            del receivable_transactions[i]
-        else:
+        self.touch_account(address)
+
+        if self._get_receivable_transaction_entry(address, transaction_hash) is None:
             raise ReceivableTransactionNotFound("transaction hash {0} not found in receivable_transactions database for wallet {1}".format(transaction_hash, address))
-        
-        self._set_account(address, account.copy(receivable_transactions=tuple(receivable_transactions)))
+
+        remaining_count = self._remove_receivable_transaction(address, transaction_hash)
 
         if self.get_code_hash(address) != EMPTY_SHA3:
-            if len(receivable_transactions) == 0:
+            if remaining_count == 0:
                 self.logger.debug("Removing address from list of smart contracts with pending transactions")
                 self._remove_address_from_smart_contracts_with_pending_transactions(address)
+
+    def _get_receivable_transactions_summary(self, address: Address) -> ReceivableTransactionsSummary:
+        key = SchemaV1.make_receivable_transactions_summary_lookup_key(address)
+        rlp_summary = self._journaldb.get(key, b'')
+        if rlp_summary:
+            return rlp.decode(rlp_summary, sedes=ReceivableTransactionsSummary)
+        else:
+            return ReceivableTransactionsSummary()
+
+    def _set_receivable_transactions_summary(self, address: Address, summary: ReceivableTransactionsSummary) -> None:
+        key = SchemaV1.make_receivable_transactions_summary_lookup_key(address)
+        if summary.count:
+            self._journaldb[key] = rlp.encode(summary, sedes=ReceivableTransactionsSummary)
+        elif key in self._journaldb:
+            del self._journaldb[key]
+
+    def _get_receivable_transaction_entry(self, address: Address, transaction_hash: Hash32) -> Optional[ReceivableTransactionEntry]:
+        key = SchemaV1.make_receivable_transaction_lookup_key(address, transaction_hash)
+        rlp_entry = self._journaldb.get(key, b'')
+        if rlp_entry:
+            return rlp.decode(rlp_entry, sedes=ReceivableTransactionEntry)
+        else:
+            return None
+
+    def _set_receivable_transaction_entry(self, address: Address, transaction_hash: Hash32, entry: ReceivableTransactionEntry) -> None:
+        key = SchemaV1.make_receivable_transaction_lookup_key(address, transaction_hash)
+        self._journaldb[key] = rlp.encode(entry, sedes=ReceivableTransactionEntry)
+
+    def _append_receivable_transaction(self, address: Address, transaction_hash: Hash32, sender_block_hash: Hash32) -> None:
+        summary = self._get_receivable_transactions_summary(address)
+        previous_transaction_hash = summary.last_transaction_hash
+
+        if previous_transaction_hash:
+            previous_entry = self._get_receivable_transaction_entry(address, previous_transaction_hash)
+            self._set_receivable_transaction_entry(
+                address,
+                previous_transaction_hash,
+                previous_entry.copy(next_transaction_hash=transaction_hash),
+            )
+            summary = summary.copy(count=summary.count + 1, last_transaction_hash=transaction_hash)
+        else:
+            summary = ReceivableTransactionsSummary(1, transaction_hash, transaction_hash)
+
+        self._set_receivable_transaction_entry(
+            address,
+            transaction_hash,
+            ReceivableTransactionEntry(sender_block_hash, previous_transaction_hash, b''),
+        )
+        self._set_receivable_transactions_summary(address, summary)
+
+    def _remove_receivable_transaction(self, address: Address, transaction_hash: Hash32) -> int:
+        """
+        Unlinks the transaction from the index, and returns the number of receivable transactions that are left.
+        """
+        entry = self._get_receivable_transaction_entry(address, transaction_hash)
+        previous_transaction_hash = entry.previous_transaction_hash
+        next_transaction_hash = entry.next_transaction_hash
+
+        if previous_transaction_hash:
+            previous_entry = self._get_receivable_transaction_entry(address, previous_transaction_hash)
+            self._set_receivable_transaction_entry(
+                address,
+                previous_transaction_hash,
+                previous_entry.copy(next_transaction_hash=next_transaction_hash),
+            )
+        if next_transaction_hash:
+            next_entry = self._get_receivable_transaction_entry(address, next_transaction_hash)
+            self._set_receivable_transaction_entry(
+                address,
+                next_transaction_hash,
+                next_entry.copy(previous_transaction_hash=previous_transaction_hash),
+            )
+        del self._journaldb[SchemaV1.make_receivable_transaction_lookup_key(address, transaction_hash)]
+
+        summary = self._get_receivable_transactions_summary(address)
+        if summary.first_transaction_hash == transaction_hash:
+            summary = summary.copy(first_transaction_hash=next_transaction_hash)
+        if summary.last_transaction_hash == transaction_hash:
+            summary = summary.copy(last_transaction_hash=previous_transaction_hash)
+        summary = summary.copy(count=summary.count - 1)
+        self._set_receivable_transactions_summary(address, summary)
+
+        return summary.count
+
+    def _clear_receivable_transactions(self, address: Address) -> None:
+        transaction_hash = self._get_receivable_transactions_summary(address).first_transaction_hash
+        while transaction_hash:
+            key = SchemaV1.make_receivable_transaction_lookup_key(address, transaction_hash)
+            entry = rlp.decode(self._journaldb[key], sedes=ReceivableTransactionEntry)
+            del self._journaldb[key]
+            transaction_hash = entry.next_transaction_hash
+
+        self._set_receivable_transactions_summary(address, ReceivableTransactionsSummary())
     
     
     #
@@ -509,15 +700,22 @@ class AccountDB(BaseAccountDB):
     def delete_account(self, address):
         validate_canonical_address(address, title="Storage Address")
         account_lookup_key = SchemaV1.make_account_lookup_key(address)
-        #try:
-        del self._journaldb[account_lookup_key]
-        #except KeyError:
-        #    self.logger.debug("tried to delete an account that doesnt exist")
+        if self._account_journal[address] is None and account_lookup_key not in self._journaldb:
+            raise KeyError(account_lookup_key)
+
+        self._clear_receivable_transactions(address)
+        self._increment_storage_version(address)
+        self._account_journal[address] = DELETED_ENTRY
 
     def account_exists(self, address):
         validate_canonical_address(address, title="Storage Address")
+        account = self._account_journal[address]
+        if account is DELETED_ENTRY:
+            return False
+        elif account is not None:
+            return True
+
         account_lookup_key = SchemaV1.make_account_lookup_key(address)
-        
         return self._journaldb.get(account_lookup_key, b'') != b''
 
     def touch_account(self, address):
@@ -530,7 +728,7 @@ class AccountDB(BaseAccountDB):
         return not self.account_has_code_or_nonce(address) and self.get_balance(address) == 0 and self.has_receivable_transactions(address) is False
     
     def get_account_hash(self, address: Address) -> Hash32:
-        account = self._get_account(address)
+        account = self._get_account_with_storage_root(address)
         account_hashable = account.copy(
             receivable_transactions = (),
             block_conflicts = (),
@@ -542,10 +740,20 @@ class AccountDB(BaseAccountDB):
     # Internal
     #
     def _get_account(self, address):
+        account = self._account_journal[address]
+        if account is DELETED_ENTRY:
+            return Account()
+        elif account is not None:
+            return account
+
         account_lookup_key = SchemaV1.make_account_lookup_key(address)
         rlp_account = self._journaldb.get(account_lookup_key, b'')
         if rlp_account:
-            account = rlp.decode(rlp_account, sedes=Account)
+            try:
+                account = account_cache[rlp_account]
+            except KeyError:
+                account = rlp.decode(rlp_account, sedes=Account)
+                account_cache[rlp_account] = account
             #account = hm_decode(rlp_account, sedes_classes=[Account])
         else:
             account = Account()
@@ -553,10 +761,34 @@ class AccountDB(BaseAccountDB):
 
 
     def _set_account(self, address, account):
-        encoded_account = rlp.encode(account, sedes=Account)
-        #encoded_account = hm_encode(account)
-        account_lookup_key = SchemaV1.make_account_lookup_key(address)
-        self._journaldb[account_lookup_key] = encoded_account
+        if account.receivable_transactions:
+            # Saved before receivable transactions had their own index. Move them there.
+            for tx_key in account.receivable_transactions:
+                if self._get_receivable_transaction_entry(address, tx_key.transaction_hash) is None:
+                    self._append_receivable_transaction(address, tx_key.transaction_hash, tx_key.sender_block_hash)
+            account = account.copy(receivable_transactions=())
+
+        self._account_journal[address] = account
+
+    def _reset_account_journal(self) -> None:
+        self._account_journal = Journal()
+        self._account_journal.record_changeset()
+
+    def _flush_account_journal(self) -> None:
+        """
+        Encode the accounts that have been written and write them to _journaldb.
+        """
+        accounts = self._account_journal.merged_changesets()
+        for address, account in accounts.items():
+            account_lookup_key = SchemaV1.make_account_lookup_key(address)
+            if account is DELETED_ENTRY:
+                if account_lookup_key in self._journaldb:
+                    del self._journaldb[account_lookup_key]
+            else:
+                #encoded_account = hm_encode(account)
+                self._journaldb[account_lookup_key] = rlp.encode(account, sedes=Account)
+
+        self._reset_account_journal()
         
 
     #
@@ -564,25 +796,38 @@ class AccountDB(BaseAccountDB):
     #
     def record(self) -> UUID:
         self.logger.debug("Recording account db changeset")
-        return (self._journaldb.record())
+        changeset = self._journaldb.record()
+        self._account_journal.record_changeset(changeset)
+        self._storage_journal.record_changeset(changeset)
+        return changeset
 
     def discard(self, changeset: UUID) -> None:
         self.logger.debug("Discarding account db changes")
         db_changeset = changeset
         self._journaldb.discard(db_changeset)
+        self._account_journal.pop_changeset(db_changeset)
+        self._storage_journal.pop_changeset(db_changeset)
+        self._storage_roots.clear()
 
     def commit(self, changeset: UUID) -> None:
         db_changeset = changeset
         self._journaldb.commit(db_changeset)
+        self._account_journal.commit_changeset(db_changeset)
+        self._storage_journal.commit_changeset(db_changeset)
 
     def persist(self, save_account_hash = False, wallet_address = None) -> None:
         self.logger.debug('Persisting account db. save_account_hash {} | wallet_address {}'.format(save_account_hash, wallet_address))
+        self._flush_storage_journal()
+        self._flush_account_journal()
         self._journaldb.persist()
-        self._batchdb.commit(apply_deletes=True)
-        
+
         if save_account_hash:
             validate_canonical_address(wallet_address, title="Address")
-            self.save_current_account_with_hash_lookup(wallet_address)
+            # Add the lookup to the batch so that it is saved in the same call as the account changes
+            lookup_key, rlp_account = self._make_account_by_hash_lookup(wallet_address)
+            self._batchdb[lookup_key] = rlp_account
+
+        self._batchdb.commit(apply_deletes=True)
       
     #
     # Saving account state at particular account hash
@@ -590,12 +835,19 @@ class AccountDB(BaseAccountDB):
     
     def save_current_account_with_hash_lookup(self, wallet_address):
         validate_canonical_address(wallet_address, title="Address")
+        lookup_key, rlp_account = self._make_account_by_hash_lookup(wallet_address)
+        self.db[lookup_key] = rlp_account
+
+    def _make_account_by_hash_lookup(self, wallet_address: Address) -> Tuple[bytes, bytes]:
         account_hash = self.get_account_hash(wallet_address)
-        account = self._get_account(wallet_address)
+        # The saved account includes its receivable transactions so that reverting to it restores them
+        account = self._get_account_with_storage_root(wallet_address).copy(
+            receivable_transactions=self.get_receivable_transactions(wallet_address),
+        )
         rlp_account = rlp.encode(account, sedes=Account)
-        
+
         lookup_key = SchemaV1.make_account_by_hash_lookup_key(account_hash)
-        self.db[lookup_key] = rlp_account
+        return lookup_key, rlp_account
         
     
     def revert_to_account_from_hash(self, account_hash, wallet_address):
@@ -605,6 +857,9 @@ class AccountDB(BaseAccountDB):
         try:
             rlp_encoded = self.db[lookup_key]
             account = rlp.decode(rlp_encoded, sedes=Account)
+            # _set_account puts the account's receivable transactions back into the index
+            self._clear_receivable_transactions(wallet_address)
+            self._increment_storage_version(wallet_address)
             self._set_account(wallet_address, account)
         except KeyError:
             raise StateRootNotFound()
@@ -5,6 +5,14 @@ from abc import (
 from collections.abc import (
     MutableMapping,
 )
+from typing import (  # noqa: F401
+    Iterable,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+if TYPE_CHECKING:
+    from hvm.db.diff import DBDiff  # noqa: F401
 
 
 class BaseDB(MutableMapping, metaclass=ABCMeta):
@@ -47,6 +55,36 @@ class BaseDB(MutableMapping, metaclass=ABCMeta):
         except KeyError:
             return None
 
+    #
+    # Multi-key API
+    #
+    # These make it possible to read or write many keys in a single call, which is a single
+    # round trip when the db lives in another process. Subclasses may override them to
+    # use a native batch.
+    #
+    def get_many(self, keys: Iterable[bytes]) -> Tuple[bytes, ...]:
+        """
+        Returns the values of the given keys, in order. Missing keys have a value of None.
+        """
+        return tuple(self.get(key) for key in keys)
+
+    def exists_many(self, keys: Iterable[bytes]) -> Tuple[bool, ...]:
+        return tuple(self.exists(key) for key in keys)
+
+    def set_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        for key, value in items:
+            self[key] = value
+
+    def delete_many(self, keys: Iterable[bytes]) -> None:
+        for key in keys:
+            self.delete(key)
+
+    def apply_diff(self, diff: 'DBDiff', apply_deletes: bool = True) -> None:
+        """
+        Write all of the changes in the diff to this db.
+        """
+        diff.apply_to(self, apply_deletes)
+
     def __iter__(self):
         raise NotImplementedError("By default, DB classes cannot by iterated.")
 
@@ -82,3 +120,10 @@ class BaseAtomicDB(BaseDB):
     @abstractmethod
     def atomic_batch(self):
         raise NotImplementedError
+
+    def apply_diff(self, diff: 'DBDiff', apply_deletes: bool = True) -> None:
+        """
+        Write all of the changes in the diff to this db. Either all of them are saved, or none are.
+        """
+        with self.atomic_batch() as db:
+            diff.apply_to(db, apply_deletes)
@@ -3,12 +3,15 @@ import logging
 from pathlib import Path
 from typing import (
     Generator,
+    Iterable,
+    Tuple,
     TYPE_CHECKING,
 )
 
 from eth_utils import ValidationError
 
 from hvm.db.diff import (
+    DBDiff,
     DBDiffTracker,
     DiffMissingError,
 )
@@ -52,6 +55,26 @@ class LevelDB(BaseAtomicDB):
     def __delitem__(self, key: bytes) -> None:
         self.db.delete(key)
 
+    def set_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        with self.db.write_batch(transaction=True) as write_batch:
+            for key, value in items:
+                write_batch.put(key, value)
+
+    def delete_many(self, keys: Iterable[bytes]) -> None:
+        with self.db.write_batch(transaction=True) as write_batch:
+            for key in keys:
+                write_batch.delete(key)
+
+    def apply_diff(self, diff: DBDiff, apply_deletes: bool = True) -> None:
+        # Unlike atomic_batch, we never need to read the pending changes, so the native
+        # write batch can be used directly.
+        with self.db.write_batch(transaction=True) as write_batch:
+            for key, value in diff.pending_items():
+                write_batch.put(key, value)
+            if apply_deletes:
+                for key in diff.deleted_keys():
+                    write_batch.delete(key)
+
     @contextmanager
     def atomic_batch(self) -> Generator['LevelDBWriteBatch', None, None]:
         with self.db.write_batch(transaction=True) as atomic_batch:
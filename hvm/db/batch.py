@@ -42,7 +42,9 @@ class BatchDB(BaseDB):
         self._track_diff = DBDiffTracker()
 
     def commit(self, apply_deletes: bool = True) -> None:
-        self.diff().apply_to(self.wrapped_db, apply_deletes)
+        # Send the whole diff in one call. If the wrapped db is a proxy to a db in another
+        # process, this is a single round trip instead of one per key.
+        self.wrapped_db.apply_diff(self.diff(), apply_deletes)
         self.clear()
 
     def _exists(self, key: bytes) -> bool:
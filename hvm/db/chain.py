@@ -1,4 +1,5 @@
 import bisect
+from contextlib import contextmanager
 import functools
 import itertools
 import logging
@@ -12,7 +13,9 @@ from abc import (
 from typing import (
     cast,
     Dict,
+    FrozenSet,
     Iterable,
+    Iterator,
     List,
     Set,
     Tuple,
@@ -102,10 +105,15 @@ from rlp_cython.sedes import(
 )
 
 
+from hvm.db.batch import (
+    BatchDB,
+)
 from hvm.db.journal import (
     JournalDB,
 )
 
+from lru import LRU
+
 from sortedcontainers import (
     SortedList,
     SortedDict,
@@ -126,6 +134,12 @@ if TYPE_CHECKING:
     )
 
 
+# The balance of a chain over a window of time, keyed by (chain address, canonical head hash). A head
+# hash identifies the whole chain below it, so the entries never go stale and can be shared by every
+# ChainDB in the process. The values are (window start timestamp, window end timestamp, balance).
+balance_at_time_cache = LRU(4096)
+
+
 class TransactionKey(rlp.Serializable):
     fields = [
         ('block_hash', hash32),
@@ -456,7 +470,7 @@ class BaseChainDB(metaclass=ABCMeta):
         raise NotImplementedError("ChainDB classes must implement this method")
 
     @abstractmethod
-    def get_all_descendant_block_hashes(self, block_hash: Hash32) -> List[Hash32]:
+    def get_all_descendant_block_hashes(self, block_hash: Hash32) -> Optional[Set[Hash32]]:
         raise NotImplementedError("ChainDB classes must implement this method")
 
     @abstractmethod
@@ -534,9 +548,27 @@ class ChainDB(BaseChainDB):
     logger = logging.getLogger('hvm.db.chain_db.ChainDB')
     _journaldb = None
 
+    # block hash -> the chains of all of its descendants. Only set inside memoize_block_children_chains.
+    _block_children_chains_memo = None  # type: Dict[Hash32, FrozenSet[Address]]
+
     def __init__(self, db: BaseDB) -> None:
         self.db = db
 
+    @contextmanager
+    def _write_batch(self) -> Iterator[None]:
+        '''
+        Collects all writes made inside the context and saves them to the underlying db in a
+        single call once the context exits without error. Reads inside the context see the
+        pending writes.
+        '''
+        original_db = self.db
+        batch_db = BatchDB(original_db)
+        self.db = batch_db
+        try:
+            yield
+        finally:
+            self.db = original_db
+        batch_db.commit(apply_deletes=True)
 
 
     #
@@ -596,16 +628,42 @@ class ChainDB(BaseChainDB):
         """
 
         head = self.get_canonical_head(chain_address)
-        if head.timestamp <= before_timestamp:
-            return head.block_number
-        else:
-            for i in range(head.block_number-1, -1, -1):
-                header = self.get_canonical_block_header_by_number(i, chain_address)
-                if header.timestamp <= before_timestamp:
-                    return header.block_number
+        header, _ = self._find_canonical_header_at_or_before_timestamp(head, before_timestamp)
+        if header is not None:
+            return header.block_number
 
         raise HeaderNotFound("No blocks before the timestamp {} were found.".format(before_timestamp))
 
+    def _find_canonical_header_at_or_before_timestamp(self,
+                                                      canonical_head: BlockHeader,
+                                                      timestamp: Timestamp) -> Tuple[Optional[BlockHeader], Optional[BlockHeader]]:
+        """
+        Returns the newest canonical header with a timestamp at or before the given timestamp, and the canonical
+        header after it. Either is None if there isn't one.
+
+        Block timestamps increase along a chain, so this is a bisection over the block numbers below the head.
+        """
+        if canonical_head.timestamp <= timestamp:
+            return canonical_head, None
+
+        chain_address = canonical_head.chain_address
+        header = None
+        next_header = canonical_head
+
+        # the header at block number high is always after the timestamp
+        low, high = 0, canonical_head.block_number
+        while low < high:
+            middle = (low + high) // 2
+            middle_header = self.get_canonical_block_header_by_number(middle, chain_address)
+            if middle_header.timestamp <= timestamp:
+                header = middle_header
+                low = middle + 1
+            else:
+                next_header = middle_header
+                high = middle
+
+        return header, next_header
+
     def get_canonical_head(self, chain_address: Address) -> BlockHeader:
         """
         Returns the current block header at the head of the chain.
@@ -904,40 +962,42 @@ class ChainDB(BaseChainDB):
 
         Assumes all block transactions have been persisted already.
         '''
-        new_canonical_headers = self.persist_header(block.header)
+        with self._write_batch():
+            new_canonical_headers = self.persist_header(block.header)
 
-        if not (block.reward_bundle.reward_type_1.amount == 0 and block.reward_bundle.reward_type_2.amount == 0):
-            self.persist_reward_bundle(block.reward_bundle)
-            self.set_latest_reward_block_number(block.sender, block.number)
+            if not (block.reward_bundle.reward_type_1.amount == 0 and block.reward_bundle.reward_type_2.amount == 0):
+                self.persist_reward_bundle(block.reward_bundle)
+                self.set_latest_reward_block_number(block.sender, block.number)
 
-        for header in new_canonical_headers:
-            for index, transaction_hash in enumerate(self.get_block_transaction_hashes(header)):
-                self._add_transaction_to_canonical_chain(transaction_hash, header, index)
-            for index, transaction_hash in enumerate(self.get_block_receive_transaction_hashes(header)):
-                self._add_receive_transaction_to_canonical_chain(transaction_hash, header, index)
+            for header in new_canonical_headers:
+                for index, transaction_hash in enumerate(self.get_block_transaction_hashes(header)):
+                    self._add_transaction_to_canonical_chain(transaction_hash, header, index)
+                for index, transaction_hash in enumerate(self.get_block_receive_transaction_hashes(header)):
+                    self._add_receive_transaction_to_canonical_chain(transaction_hash, header, index)
 
-            #add all receive transactions as children to the sender block
-            self.add_block_receive_transactions_to_parent_child_lookup(header, block.receive_transaction_class)
+                #add all receive transactions as children to the sender block
+                self.add_block_receive_transactions_to_parent_child_lookup(header, block.receive_transaction_class)
 
-        self.add_block_rewards_to_parent_child_lookup(block.header, block.reward_bundle)
-        #we also have to save this block as the child of the parent block in the same chain
-        if block.header.parent_hash != GENESIS_PARENT_HASH:
-            self.add_block_child(block.header.parent_hash, block.header.hash)
+            self.add_block_rewards_to_parent_child_lookup(block.header, block.reward_bundle)
+            #we also have to save this block as the child of the parent block in the same chain
+            if block.header.parent_hash != GENESIS_PARENT_HASH:
+                self.add_block_child(block.header.parent_hash, block.header.hash)
 
     def persist_non_canonical_block(self, block: 'BaseBlock') -> None:
-        self._save_header_to_db(block.header)
+        with self._write_batch():
+            self._save_header_to_db(block.header)
 
-        if not (block.reward_bundle.reward_type_1.amount == 0 and block.reward_bundle.reward_type_2.amount == 0):
-            self.persist_reward_bundle(block.reward_bundle)
+            if not (block.reward_bundle.reward_type_1.amount == 0 and block.reward_bundle.reward_type_2.amount == 0):
+                self.persist_reward_bundle(block.reward_bundle)
 
-        #add all receive transactions as children to the sender block
-        self.add_block_receive_transactions_to_parent_child_lookup(block.header, block.receive_transaction_class)
+            #add all receive transactions as children to the sender block
+            self.add_block_receive_transactions_to_parent_child_lookup(block.header, block.receive_transaction_class)
 
-        self.add_block_rewards_to_parent_child_lookup(block.header, block.reward_bundle)
+            self.add_block_rewards_to_parent_child_lookup(block.header, block.reward_bundle)
 
-        #we also have to save this block as the child of the parent block in the same chain
-        if block.header.parent_hash != GENESIS_PARENT_HASH:
-            self.add_block_child(block.header.parent_hash, block.header.hash)
+            #we also have to save this block as the child of the parent block in the same chain
+            if block.header.parent_hash != GENESIS_PARENT_HASH:
+                self.add_block_child(block.header.parent_hash, block.header.hash)
 
     #
     # Chronologically consistent blockchain db API
@@ -1147,7 +1207,7 @@ class ChainDB(BaseChainDB):
         Returns the updated `receipts_root` for updated block header.
         """
         receipt_db = HexaryTrie(db=self.db, root_hash=block_header.receipt_root)
-        receipt_db[index_key] = rlp.encode(receipt)
+        receipt_db[index_key] = receipt.encoded
         return receipt_db.root_hash
 
     def add_transaction(self,
@@ -1161,7 +1221,7 @@ class ChainDB(BaseChainDB):
         """
 
         transaction_db = HexaryTrie(self.db, root_hash=block_header.transaction_root)
-        transaction_db[index_key] = rlp.encode(transaction)
+        transaction_db[index_key] = transaction.encoded
         return transaction_db.root_hash
 
     def add_receive_transaction(self,
@@ -1175,7 +1235,7 @@ class ChainDB(BaseChainDB):
         """
 
         transaction_db = HexaryTrie(self.db, root_hash=block_header.receive_transaction_root)
-        transaction_db[index_key] = rlp.encode(transaction)
+        transaction_db[index_key] = transaction.encoded
         return transaction_db.root_hash
 
     def get_block_transactions(
@@ -1591,42 +1651,62 @@ class ChainDB(BaseChainDB):
             return None
 
 
-    def get_all_descendant_block_hashes(self, block_hash: Hash32) -> List[Hash32]:
+    def get_all_descendant_block_hashes(self, block_hash: Hash32) -> Optional[Set[Hash32]]:
         validate_word(block_hash, title="Block_hash")
         descentant_blocks = self._get_all_descendant_block_hashes(block_hash)
-        return descentant_blocks
-
-    def _get_all_descendant_block_hashes(self, block_hash: Hash32, exclude_block_hashes: Set[Hash32] = set()) -> List[Hash32]:
-        # Needed to add exclude_block_hashes to stop circular infinite loops. Seems like it is possible for parents to be their own children
-        #self.logger.debug('test1')
-        #lookup children
-        children = self.get_block_children(block_hash)
-        #self.logger.debug('test2 {}'.format(children))
-        if children == None:
+        if len(descentant_blocks) == 0:
             return None
-        else:
-            child_blocks = set()
-            for child_block_hash in children:
-                if child_block_hash not in exclude_block_hashes:
-                    #self.logger.debug('test3 {}'.format(child_block_hash))
-                    child_blocks.add(child_block_hash)
-
-                    exclude_block_hashes_current = exclude_block_hashes | child_blocks
-                    sub_children_blocks = self._get_all_descendant_block_hashes(child_block_hash, exclude_block_hashes= exclude_block_hashes_current)
+        return descentant_blocks
 
-                    if sub_children_blocks is not None:
-                        child_blocks.update(sub_children_blocks)
-            return child_blocks
+    def _get_all_descendant_block_hashes(self, block_hash: Hash32) -> Set[Hash32]:
+        # Breadth first, one generation at a time. It seems like it is possible for parents to be their own children,
+        # so each block is only visited once.
+        descendant_blocks = set()
+        generation = [block_hash]
+        while len(generation) > 0:
+            next_generation = []
+            for children in self._get_many_block_children(generation):
+                for child_block_hash in children:
+                    if child_block_hash not in descendant_blocks:
+                        descendant_blocks.add(child_block_hash)
+                        next_generation.append(child_block_hash)
+            generation = next_generation
+        return descendant_blocks
+
+    def _get_many_block_children(self, parent_block_hashes: List[Hash32]) -> List[List[Hash32]]:
+        """
+        Returns the children of each of the blocks, in one read. A block without children has an empty list.
+        """
+        encoded_children = self.db.get_many(
+            SchemaV1.make_block_children_lookup_key(parent_block_hash) for parent_block_hash in parent_block_hashes
+        )
+        return [
+            [] if encoded is None else rlp.decode(encoded, sedes=rlp.sedes.FCountableList(hash32), use_list=True)
+            for encoded in encoded_children
+        ]
+
+    def _get_many_chain_wallet_addresses_for_block_hashes(self, block_hashes: List[Hash32]) -> List[Address]:
+        header_rlps = self.db.get_many(block_hashes)
+        chain_addresses = []
+        for block_hash, header_rlp in zip(block_hashes, header_rlps):
+            if header_rlp is None:
+                raise HeaderNotFound(
+                    "No header with hash {0} found".format(encode_hex(block_hash))
+                )
+            chain_addresses.append(_decode_block_header(header_rlp).chain_address)
+        return chain_addresses
 
     def save_block_children(self, parent_block_hash: Hash32,
                             block_children: List[Hash32]) -> None:
 
         validate_word(parent_block_hash, title="Block_hash")
+        self._clear_block_children_chains_memo()
         block_children_lookup_key = SchemaV1.make_block_children_lookup_key(parent_block_hash)
         self.db[block_children_lookup_key] = rlp.encode(block_children, sedes=rlp.sedes.FCountableList(hash32))
 
     def delete_all_block_children_lookups(self, parent_block_hash: Hash32) -> None:
         validate_word(parent_block_hash, title="Block_hash")
+        self._clear_block_children_chains_memo()
         block_children_lookup_key = SchemaV1.make_block_children_lookup_key(parent_block_hash)
         try:
             del(self.db[block_children_lookup_key])
@@ -1646,21 +1726,57 @@ class ChainDB(BaseChainDB):
 
 
     def _get_block_children_chains(self, block_hash: Hash32) -> Set[Address]:
-        #lookup children
-        children = self.get_block_children(block_hash)
+        memo = self._block_children_chains_memo
+        if memo is not None and block_hash in memo:
+            return set(memo[block_hash])
+
+        # Breadth first, one generation at a time, visiting each block once.
+        child_chains = set()
+        visited_blocks = set()
+        generation = [block_hash]
+        while len(generation) > 0:
+            new_blocks = []
+            next_generation = []
+            for children in self._get_many_block_children(generation):
+                for child_block_hash in children:
+                    if child_block_hash in visited_blocks:
+                        continue
+                    visited_blocks.add(child_block_hash)
+                    new_blocks.append(child_block_hash)
+
+                    if memo is not None and child_block_hash in memo:
+                        # We already know the chains below this one
+                        child_chains.update(memo[child_block_hash])
+                    else:
+                        next_generation.append(child_block_hash)
+
+            child_chains.update(self._get_many_chain_wallet_addresses_for_block_hashes(new_blocks))
+            generation = next_generation
+
+        if memo is not None:
+            memo[block_hash] = frozenset(child_chains)
+        return child_chains
 
-        if children == None:
-            return set()
-        else:
-            child_chains = set()
-            for child_block_hash in children:
-                chain_wallet_address = self.get_chain_wallet_address_for_block_hash(child_block_hash)
-                child_chains.add(chain_wallet_address)
+    @contextmanager
+    def memoize_block_children_chains(self) -> Iterator[None]:
+        """
+        Inside this context, the chains found below each block are remembered, so that blocks sharing descendants are
+        only walked once. Changing any block children clears what has been remembered.
+        """
+        if self._block_children_chains_memo is not None:
+            # An outer context is already memoizing
+            yield
+            return
 
-                sub_children_chain_wallet_addresses = self._get_block_children_chains(child_block_hash)
+        self._block_children_chains_memo = {}
+        try:
+            yield
+        finally:
+            self._block_children_chains_memo = None
 
-                child_chains.update(sub_children_chain_wallet_addresses)
-            return child_chains
+    def _clear_block_children_chains_memo(self) -> None:
+        if self._block_children_chains_memo is not None:
+            self._block_children_chains_memo = {}
 
     #This doesnt include stake from this block
     def get_block_stake_from_children(self, block_hash: Hash32, coin_mature_time_for_staking: Timestamp, exclude_chains: Set = None) -> int:
@@ -1693,15 +1809,16 @@ class ChainDB(BaseChainDB):
         '''
 
         children_chain_wallet_addresses = set()
-        for block_hash in block_hashes:
-            children_chain_wallet_addresses.update(self.get_block_children_chains(block_hash))
-            origin_wallet_address = self.get_chain_wallet_address_for_block_hash(block_hash)
-            try:
-                children_chain_wallet_addresses.add(origin_wallet_address)
-            except KeyError:
-                pass
-            except AttributeError:
-                pass
+        with self.memoize_block_children_chains():
+            for block_hash in block_hashes:
+                children_chain_wallet_addresses.update(self.get_block_children_chains(block_hash))
+                origin_wallet_address = self.get_chain_wallet_address_for_block_hash(block_hash)
+                try:
+                    children_chain_wallet_addresses.add(origin_wallet_address)
+                except KeyError:
+                    pass
+                except AttributeError:
+                    pass
 
         total_stake = 0
         for wallet_address in children_chain_wallet_addresses:
@@ -1730,23 +1847,39 @@ class ChainDB(BaseChainDB):
             timestamp = int(time.time())
 
         try:
-            canonical_head = self.get_canonical_head(chain_address=wallet_address)
+            canonical_head_hash = self.get_canonical_head_hash(wallet_address)
         except CanonicalHeadNotFound as e:
             if raise_canonical_head_not_found_error:
                 raise e
             else:
                 return 0
 
-        if canonical_head.timestamp <= timestamp:
-            return canonical_head.account_balance
+        cache_key = (wallet_address, canonical_head_hash)
+        try:
+            window_start, window_end, balance = balance_at_time_cache[cache_key]
+        except KeyError:
+            pass
+        else:
+            if window_start <= timestamp < window_end:
+                return balance
+
+        canonical_head = self.get_block_header_by_hash(canonical_head_hash)
+        header, next_header = self._find_canonical_header_at_or_before_timestamp(canonical_head, timestamp)
+
+        if header is None:
+            window_start = 0
+            balance = 0
+        else:
+            window_start = header.timestamp
+            balance = header.account_balance
+
+        if next_header is None:
+            window_end = math.inf
         else:
-            if canonical_head.block_number > 0:
-                for i in range(canonical_head.block_number - 1, -1, -1):
-                    header = self.get_canonical_block_header_by_number(i, wallet_address)
-                    if header.timestamp <= timestamp:
-                        return header.account_balance
+            window_end = next_header.timestamp
 
-        return 0
+        balance_at_time_cache[cache_key] = (window_start, window_end, balance)
+        return balance
 
 
 
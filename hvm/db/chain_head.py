@@ -1,3 +1,4 @@
+import os
 import time
 import asyncio
 from functools import partial
@@ -9,6 +10,8 @@ from uuid import UUID
 import logging
 from lru import LRU
 from typing import (
+    Dict,
+    Iterable,
     List,
     Union,
     Set,
@@ -121,11 +124,28 @@ from sortedcontainers import SortedDict
 # expensive.
 account_cache = LRU(2048)
 
+# [timestamp, block_hash] of a block in a chronological window
+chronological_window_entry_sedes = rlp.sedes.FList([f_big_endian_int, hash32])
+
+
 class CurrentSyncingInfo(rlp.Serializable):
     fields = [
         ('timestamp', big_endian_int),
         ('head_root_hash', hash32),
     ]
+
+
+class HistoricalRootHashesRange(rlp.Serializable):
+    """
+    The first and last window that has a historical root hash saved. Each window is saved under its own key.
+    The token is changed on every write so that a copy of the root hashes held in memory can tell if it is
+    out of date.
+    """
+    fields = [
+        ('token', binary),
+        ('earliest_timestamp', big_endian_int),
+        ('latest_timestamp', big_endian_int),
+    ]
     
 
 class ChainHeadDB():
@@ -133,6 +153,13 @@ class ChainHeadDB():
     logger = logging.getLogger('hvm.db.chain_head.ChainHeadDB')
     
     _journaldb = None
+
+    # The historical root hashes, sorted by timestamp, and the token of the range they were loaded for.
+    _historical_root_hash_index = None  # type: SortedDict
+    _historical_root_hash_index_token = None  # type: bytes
+
+    # (address, head_hash, block_timestamp) waiting to be saved in the historical root hashes
+    _queued_block_hashes_to_timestamps = None  # type: List[Tuple[Address, Hash32, Timestamp]]
     
     def __init__(self, db, root_hash=BLANK_HASH):
         """
@@ -362,19 +389,17 @@ class ChainHeadDB():
         if timestamp % TIME_BETWEEN_HEAD_HASH_SAVE != 0:
             raise InvalidHeadRootTimestamp()
             
-        historical_roots = self.get_historical_root_hashes()
-        if historical_roots is None:
+        historical_roots = self._get_historical_root_hash_index()
+        if len(historical_roots) == 0:
             return None
         
-        if timestamp < historical_roots[0][0]:
+        if timestamp < historical_roots.peekitem(0)[0]:
             return None
         
-        historical_roots_dict = dict(historical_roots)
-        
         try:
-            historical_root = historical_roots_dict[timestamp]
+            historical_root = historical_roots[timestamp]
         except KeyError:
-            historical_root = historical_roots[-1][1]
+            historical_root = historical_roots.peekitem(-1)[1]
         
         new_chain_head_db = ChainHeadDB(self.db, historical_root)
         head_hash = new_chain_head_db._trie_cache.get(address)
@@ -388,90 +413,138 @@ class ChainHeadDB():
    
 
     
-    #going to need to optimize this with c code.
-    #@profile(sortby='cumulative')
     def add_block_hash_to_timestamp(self, address, head_hash, block_timestamp):
 
         self.logger.debug("add_block_hash_to_timestamp")
 
-        validate_canonical_address(address, title="Wallet Address")
-        validate_is_bytes(head_hash, title='Head Hash')
-        validate_uint256(block_timestamp, title='timestamp')
-
-        timestamp = int(block_timestamp / TIME_BETWEEN_HEAD_HASH_SAVE) * TIME_BETWEEN_HEAD_HASH_SAVE + TIME_BETWEEN_HEAD_HASH_SAVE
-        
-        starting_timestamp, existing_root_hash = self.get_historical_root_hash(timestamp, return_timestamp = True)
-        historical_roots = self.get_historical_root_hashes()
-
-        if historical_roots is None:
-            if head_hash == BLANK_HASH:
-                self.delete_chain_head_hash(address)
-            else:
-                self.set_chain_head_hash(address, head_hash)
-            self.persist()
-            historical_roots = [[timestamp, self.root_hash]]
-        else:
+        self.add_block_hashes_to_timestamps([(address, head_hash, block_timestamp)])
 
-            if starting_timestamp is None:
-                #this means there is no saved root hash that is at this time or before it. 
-                #so we have no root hash to load
+    def add_block_hashes_to_timestamps(self, block_hashes: Iterable[Tuple[Address, Hash32, Timestamp]]) -> None:
+        """
+        Saves many (address, head_hash, block_timestamp) in the historical root hashes, with the same result as calling
+        add_block_hash_to_timestamp for each of them in order. Each window is loaded, changed and saved only once,
+        instead of once for every block hash. Any queued block hashes are saved first.
+        """
+        block_hashes = self._pop_queued_block_hashes_to_timestamps() + list(block_hashes)
+        if len(block_hashes) == 0:
+            return
+
+        # (window, order, address, head_hash), where order is the position in block_hashes
+        updates = []
+        for order, (address, head_hash, block_timestamp) in enumerate(block_hashes):
+            validate_canonical_address(address, title="Wallet Address")
+            validate_is_bytes(head_hash, title='Head Hash')
+            validate_uint256(block_timestamp, title='timestamp')
+
+            timestamp = int(block_timestamp / TIME_BETWEEN_HEAD_HASH_SAVE) * TIME_BETWEEN_HEAD_HASH_SAVE + TIME_BETWEEN_HEAD_HASH_SAVE
+            updates.append((timestamp, order, address, head_hash))
+
+        historical_roots = self._get_historical_root_hash_index()
+
+        # Windows that don't exist yet, and the root hash they start from. Each one starts from the root hash of the
+        # last window before it.
+        new_roots = SortedDict()
+        for timestamp, _, _, _ in updates:
+            if len(historical_roots) == 0 and len(new_roots) == 0:
+                self.persist()
+                new_roots[timestamp] = self.root_hash
+                continue
+
+            starting_timestamp = max(
+                self._get_latest_window_at_or_before(historical_roots, timestamp),
+                self._get_latest_window_at_or_before(new_roots, timestamp),
+            )
+            if starting_timestamp == -1:
+                #this means there is no saved root hash that is at this time or before it.
+                #so we have no root hash to load. It is still propogated to the newer ones.
                 self.logger.debug("Tried appending block hash to timestamp for time earlier than earliest timestamp. "
                                   "Adding to timestamp {}. ".format(timestamp))
-            else:
-
-                new_blockchain_head_db = ChainHeadDB(self.db, existing_root_hash)
+                continue
+
+            existing_root_hash = new_roots.get(starting_timestamp, historical_roots.get(starting_timestamp))
+            for loop_timestamp in range(starting_timestamp + TIME_BETWEEN_HEAD_HASH_SAVE, timestamp + TIME_BETWEEN_HEAD_HASH_SAVE, TIME_BETWEEN_HEAD_HASH_SAVE):
+                new_roots[loop_timestamp] = existing_root_hash
+
+        # Go through the windows from oldest to newest. Every window gets the newest head hash of each address from
+        # the block hashes in that window or older.
+        updates.sort(key=lambda update: update[0])
+        first_timestamp = updates[0][0]
+        windows = sorted(set(historical_roots.irange(minimum=first_timestamp)).union(new_roots))
+
+        head_hashes = {}  # type: Dict[Address, Tuple[int, Hash32]]
+        next_update = 0
+        changed_roots = {}  # type: Dict[Timestamp, Hash32]
+
+        # All of the windows share one batch, so the trie nodes are written together at the end
+        window_head_db = ChainHeadDB(self.db)
+        for window in windows:
+            while next_update < len(updates) and updates[next_update][0] <= window:
+                _, order, address, head_hash = updates[next_update]
+                if address not in head_hashes or head_hashes[address][0] < order:
+                    head_hashes[address] = (order, head_hash)
+                next_update += 1
+
+            window_head_db.root_hash = new_roots.get(window, historical_roots.get(window))
+            for address, (_, head_hash) in head_hashes.items():
                 if head_hash == BLANK_HASH:
-                    new_blockchain_head_db.delete_chain_head_hash(address)
-                else:
-                    new_blockchain_head_db.set_chain_head_hash(address, head_hash)
-                new_blockchain_head_db.persist()
-                new_root_hash = new_blockchain_head_db.root_hash
-
-                if starting_timestamp == timestamp:
-                    #we already had a root hash for this timestamp. just update the existing one.
-                    #self.logger.debug("adding block hash to timestamp without propogating. root hash already existed. updating for time {}".format(timestamp))
-                    historical_roots_dict = dict(historical_roots)
-                    historical_roots_dict[timestamp] = new_root_hash
-                    historical_roots = list(historical_roots_dict.items())
-                    #self.logger.debug("finished adding block to timestamp. last_hist_root = {}, current_root_hash = {}".format(historical_roots[-1][1], self.root_hash))
-                    #self.logger.debug(new_root_hash)
+                    window_head_db.delete_chain_head_hash(address)
                 else:
-                    #self.logger.debug("adding block hash to timestamp without propogating. root hash didnt exist")
-                    #sorted_historical_roots = SortedList(historical_roots)
-                    historical_roots_dict = dict(historical_roots)
-                    for loop_timestamp in range(starting_timestamp, timestamp, TIME_BETWEEN_HEAD_HASH_SAVE):
-                        historical_roots_dict[loop_timestamp] = existing_root_hash
-
-                    historical_roots_dict[timestamp] = new_root_hash
-                    historical_roots = list(historical_roots_dict.items())
-                
-        #now propogate the new head hash to any saved historical root hashes newer than this one.
-        #effeciently do this by starting from the end and working back. we can assume
-        if historical_roots[-1][0] > timestamp:
-            self.logger.debug("propogating historical root hash timestamps forward")
-            for i in range(len(historical_roots)-1, -1, -1):
-                if historical_roots[i][0] <= timestamp:
-                    break
-                
-                root_hash_to_load = historical_roots[i][1]
-                new_blockchain_head_db = ChainHeadDB(self.db, root_hash_to_load)
-                if head_hash == BLANK_HASH:
-                    new_blockchain_head_db.delete_chain_head_hash(address)
-                else:
-                    new_blockchain_head_db.set_chain_head_hash(address, head_hash)
-                new_blockchain_head_db.persist()
-                new_root_hash = new_blockchain_head_db.root_hash
-                
-                #have to do this in case it is a tuple and we cannot modify
-                cur_timestamp = historical_roots[i][0]
-                historical_roots[i] = [cur_timestamp,new_root_hash]
-         
+                    window_head_db.set_chain_head_hash(address, head_hash)
+            changed_roots[window] = window_head_db.root_hash
+
+        window_head_db.persist()
+        self._save_historical_root_hash_changes(changed_roots)
+
         #lets now make sure our root hash is the same as the last historical. It is possible that another thread or chain object
         #has imported a block since this one was initialized.
+        self.root_hash = self.get_latest_historical_root_hash()[1]
 
-        self.save_historical_root_hashes(historical_roots)
-        
-        self.root_hash = historical_roots[-1][1]
+    @staticmethod
+    def _get_latest_window_at_or_before(historical_roots: SortedDict, timestamp: Timestamp) -> int:
+        # returns -1 if there isn't one
+        right_index = historical_roots.bisect_right(timestamp)
+        if right_index:
+            return historical_roots.peekitem(right_index - 1)[0]
+        return -1
+
+    #
+    # Queued block hashes to timestamps
+    #
+    def queue_block_hash_to_timestamp(self, address: Address, head_hash: Hash32, block_timestamp: Timestamp) -> None:
+        """
+        Same as add_block_hash_to_timestamp, except the historical root hashes are only changed when the queue is
+        flushed. Anything in this object that reads or writes the historical root hashes flushes the queue first.
+        """
+        validate_canonical_address(address, title="Wallet Address")
+        validate_is_bytes(head_hash, title='Head Hash')
+        validate_uint256(block_timestamp, title='timestamp')
+
+        if self._queued_block_hashes_to_timestamps is None:
+            self._queued_block_hashes_to_timestamps = []
+        self._queued_block_hashes_to_timestamps.append((address, head_hash, block_timestamp))
+
+    def flush_queued_block_hashes_to_timestamps(self) -> None:
+        if self._queued_block_hashes_to_timestamps:
+            self.add_block_hashes_to_timestamps([])
+
+    def discard_queued_block_hashes_to_timestamps(self) -> None:
+        self._queued_block_hashes_to_timestamps = None
+
+    def move_queued_block_hashes_to_timestamps(self, chain_head_db: 'ChainHeadDB') -> None:
+        """
+        Moves the queued block hashes to the end of another ChainHeadDB's queue, so that it saves them when it is
+        flushed. The other ChainHeadDB must use the same database.
+        """
+        queued = self._pop_queued_block_hashes_to_timestamps()
+        for address, head_hash, block_timestamp in queued:
+            chain_head_db.queue_block_hash_to_timestamp(address, head_hash, block_timestamp)
+
+    def _pop_queued_block_hashes_to_timestamps(self) -> List[Tuple[Address, Hash32, Timestamp]]:
+        queued = self._queued_block_hashes_to_timestamps
+        self._queued_block_hashes_to_timestamps = None
+        if queued is None:
+            return []
+        return queued
         
     
     #
@@ -480,10 +553,12 @@ class ChainHeadDB():
 
         
     def persist(self, save_current_root_hash = False) -> None:
-        self._batchtrie.commit(apply_deletes=False)
-        
         if save_current_root_hash:
-            self.save_current_root_hash()
+            # Add it to the batch so that it is saved in the same call as the trie nodes
+            self.logger.debug("Saving current chain head root hash {}".format(encode_hex(self.root_hash)))
+            self._batchtrie[SchemaV1.make_current_head_root_lookup_key()] = self.root_hash
+
+        self._batchtrie.commit(apply_deletes=False)
            
     #
     # Saving to database API
@@ -549,16 +624,8 @@ class ChainHeadDB():
     def save_single_historical_root_hash(self, root_hash: Hash32, timestamp: Timestamp) -> None:
         validate_is_bytes(root_hash, title='Head Hash')
         validate_historical_timestamp(timestamp, title="timestamp")
-        
-        historical = self.get_historical_root_hashes()
-        if historical is not None:
-            historical_dict = dict(historical)
-            historical_dict[timestamp] = root_hash
-            historical = list(historical_dict.items())
-        else:
-            historical = [[timestamp, root_hash]]
-            
-        self.save_historical_root_hashes(historical)
+
+        self._save_historical_root_hash_changes({timestamp: root_hash})
             
     # This function is broken. But it is not used anymore so just leave it commented.
     # def propogate_previous_historical_root_hash_to_timestamp(self, timestamp):
@@ -596,23 +663,31 @@ class ChainHeadDB():
     #     return historical
             
     def get_latest_historical_root_hash(self):
-        historical = self.get_historical_root_hashes()
-        if historical is None:
+        historical_roots = self._get_historical_root_hash_index()
+        if len(historical_roots) == 0:
             return (None, None)
 
-        return (historical[-1])
+        return list(historical_roots.peekitem(-1))
 
-            
-    #saved as [[timestamp, hash],[timestamp, hash]...]      
+    #
+    # Historical root hashes are saved one window per key, with a HistoricalRootHashesRange saying which
+    # windows there are. They used to be saved as one list of [[timestamp, hash],[timestamp, hash]...], which
+    # is still read until the next time they are saved.
+    #
     def save_historical_root_hashes(self, root_hashes):
+        """
+        Replace all of the historical root hashes with the given list of [timestamp, hash]
+        """
+        new_roots = dict(root_hashes)
 
-        historical_head_root_lookup_key = SchemaV1.make_historical_head_root_lookup_key()
-        data = rlp.encode(root_hashes, sedes=rlp.sedes.FCountableList(rlp.sedes.FList([f_big_endian_int, hash32])))
+        changed_roots = {
+            timestamp: None
+            for timestamp in self._get_historical_root_hash_index()
+            if timestamp not in new_roots
+        }  # type: Dict[Timestamp, Optional[Hash32]]
+        changed_roots.update(new_roots)
 
-        self.db.set(
-            historical_head_root_lookup_key,
-            data,
-        )
+        self._save_historical_root_hash_changes(changed_roots)
         
     def get_historical_root_hash(self, timestamp: Timestamp, return_timestamp: bool = False) -> Tuple[Optional[Timestamp], Hash32]:
         '''
@@ -622,16 +697,14 @@ class ChainHeadDB():
         validate_uint256(timestamp, title='timestamp')
         if timestamp % TIME_BETWEEN_HEAD_HASH_SAVE != 0:
             timestamp = int(timestamp/TIME_BETWEEN_HEAD_HASH_SAVE) * TIME_BETWEEN_HEAD_HASH_SAVE
-        historical = self.get_historical_root_hashes()
+        historical_roots = self._get_historical_root_hash_index()
 
         root_hash_to_return = None
         timestamp_to_return = None
 
-        timestamps = [x[0] for x in historical]
-        right_index = bisect.bisect_right(timestamps, timestamp)
+        right_index = historical_roots.bisect_right(timestamp)
         if right_index:
-            index = right_index-1
-            timestamp_to_return, root_hash_to_return = historical[index]
+            timestamp_to_return, root_hash_to_return = historical_roots.peekitem(right_index-1)
 
         if return_timestamp:
             return timestamp_to_return, root_hash_to_return
@@ -639,46 +712,124 @@ class ChainHeadDB():
             return root_hash_to_return
 
     def delete_historical_root_hashes(self) -> None:
-        historical_head_root_lookup_key = SchemaV1.make_historical_head_root_lookup_key()
-        try:
-            del(self.db[historical_head_root_lookup_key])
-        except KeyError:
-            pass
+        self._save_historical_root_hash_changes({
+            timestamp: None
+            for timestamp in self._get_historical_root_hash_index()
+        })
 
     def get_historical_root_hashes(self, after_timestamp: Timestamp = None) -> Optional[List[List[Union[Timestamp, Hash32]]]]:
-        '''
-        This has been performance optimized December 22, 2018
-        :param after_timestamp:
-        :return:
-        '''
-
-        # Automatically sort when loading because we know the data will never be a mix of lists and tuples
+        historical_roots = self._get_historical_root_hash_index()
 
-        historical_head_root_lookup_key = SchemaV1.make_historical_head_root_lookup_key()
-        try:
-            data = rlp.decode(self.db[historical_head_root_lookup_key], sedes=rlp.sedes.FCountableList(rlp.sedes.FList([f_big_endian_int, hash32])), use_list=True)
-            data.sort()
+        if after_timestamp is None:
+            timestamps = historical_roots.keys()
+        else:
+            timestamps = historical_roots.keys()[historical_roots.bisect_left(after_timestamp):]
 
-        except KeyError:
+        if len(timestamps) == 0:
             return None
 
-        if after_timestamp is None:
-            to_return = data
-        else:
-            timestamps = [x[0] for x in data]
-            index = bisect.bisect_left(timestamps, after_timestamp)
-            to_return = data[index:]
+        # Cut them to the limit of length
+        return [[timestamp, historical_roots[timestamp]] for timestamp in timestamps[-NUMBER_OF_HEAD_HASH_TO_SAVE:]]
 
-        if len(to_return) == 0:
+    def _get_historical_root_hashes_range(self) -> Optional[HistoricalRootHashesRange]:
+        range_lookup_key = SchemaV1.make_historical_head_root_range_lookup_key()
+        try:
+            return rlp.decode(self.db[range_lookup_key], sedes=HistoricalRootHashesRange)
+        except KeyError:
             return None
 
-        # Cut them to the limit of length now after they are sorted.
-        if len(to_return) > NUMBER_OF_HEAD_HASH_TO_SAVE:
-            to_return = to_return[-NUMBER_OF_HEAD_HASH_TO_SAVE:]
+    def _load_legacy_historical_root_hashes(self) -> SortedDict:
+        historical_head_root_lookup_key = SchemaV1.make_historical_head_root_lookup_key()
+        try:
+            data = rlp.decode(self.db[historical_head_root_lookup_key], sedes=rlp.sedes.FCountableList(rlp.sedes.FList([f_big_endian_int, hash32])), use_list=True)
+        except KeyError:
+            return SortedDict()
 
-        return to_return
+        data.sort()
+        return SortedDict(data[-NUMBER_OF_HEAD_HASH_TO_SAVE:])
 
+    def _get_historical_root_hash_index(self) -> SortedDict:
+        """
+        Returns a SortedDict of timestamp -> historical root hash. It is only reloaded from the database when the
+        root hashes have been saved by something else. Don't modify it.
+        """
+        self.flush_queued_block_hashes_to_timestamps()
+
+        historical_range = self._get_historical_root_hashes_range()
+        if historical_range is None:
+            return self._load_legacy_historical_root_hashes()
+
+        if historical_range.token != self._historical_root_hash_index_token:
+            timestamps = range(
+                historical_range.earliest_timestamp,
+                historical_range.latest_timestamp + TIME_BETWEEN_HEAD_HASH_SAVE,
+                TIME_BETWEEN_HEAD_HASH_SAVE,
+            )
+            root_hashes = self.db.get_many(
+                SchemaV1.make_head_root_for_timestamp_lookup_key(timestamp) for timestamp in timestamps
+            )
+            self._historical_root_hash_index = SortedDict(
+                (timestamp, root_hash)
+                for timestamp, root_hash in zip(timestamps, root_hashes)
+                if root_hash is not None
+            )
+            self._historical_root_hash_index_token = historical_range.token
+
+        return self._historical_root_hash_index
+
+    def _save_historical_root_hash_changes(self, changed_roots: Dict[Timestamp, Optional[Hash32]]) -> None:
+        """
+        Saves the given windows, and deletes the windows that are None. Only the windows that change are written.
+        """
+        historical_roots = self._get_historical_root_hash_index()
+        writes = {}  # type: Dict[Timestamp, Optional[Hash32]]
+
+        if self._get_historical_root_hashes_range() is None:
+            # These are still in the old single list. Move all of them to their own keys.
+            writes.update(historical_roots)
+            self.db.delete(SchemaV1.make_historical_head_root_lookup_key())
+
+        for timestamp, root_hash in changed_roots.items():
+            if root_hash is None:
+                if timestamp in historical_roots:
+                    del historical_roots[timestamp]
+                    writes[timestamp] = None
+            elif historical_roots.get(timestamp) != root_hash:
+                historical_roots[timestamp] = root_hash
+                writes[timestamp] = root_hash
+
+        while len(historical_roots) > NUMBER_OF_HEAD_HASH_TO_SAVE:
+            oldest_timestamp, _ = historical_roots.popitem(0)
+            writes[oldest_timestamp] = None
+
+        if len(writes) == 0:
+            return
+
+        self.db.set_many(
+            (SchemaV1.make_head_root_for_timestamp_lookup_key(timestamp), root_hash)
+            for timestamp, root_hash in writes.items()
+            if root_hash is not None
+        )
+        self.db.delete_many(
+            SchemaV1.make_head_root_for_timestamp_lookup_key(timestamp)
+            for timestamp, root_hash in writes.items()
+            if root_hash is None
+        )
 
+        range_lookup_key = SchemaV1.make_historical_head_root_range_lookup_key()
+        if len(historical_roots) == 0:
+            self.db.delete(range_lookup_key)
+            self._historical_root_hash_index = None
+            self._historical_root_hash_index_token = None
+        else:
+            historical_range = HistoricalRootHashesRange(
+                token=os.urandom(16),
+                earliest_timestamp=historical_roots.peekitem(0)[0],
+                latest_timestamp=historical_roots.peekitem(-1)[0],
+            )
+            self.db[range_lookup_key] = rlp.encode(historical_range, sedes=HistoricalRootHashesRange)
+            self._historical_root_hash_index = historical_roots
+            self._historical_root_hash_index_token = historical_range.token
 
     def get_dense_historical_root_hashes(self, after_timestamp: Timestamp = None) -> Optional[List[List[Union[Timestamp, Hash32]]]]:
         '''
@@ -722,6 +873,12 @@ class ChainHeadDB():
     # Chronological chain
     #
 
+    #
+    # Each block hash in a chronological window is saved under its own key, numbered from 0 to the length of the window.
+    # A lookup from block hash to its number lets a block hash be deleted by moving the last one into its place.
+    # Windows used to be saved as one list of [[timestamp, hash],[timestamp, hash]...], which is still read, and is
+    # moved to the new keys the first time the window is changed.
+    #
     def add_block_hash_to_chronological_window(self, head_hash: Hash32, timestamp: Timestamp) -> None:
         #self.logger.debug("add_block_hash_to_chronological_window, hash = {}, timestamp = {}".format(encode_hex(head_hash), timestamp))
         validate_is_bytes(head_hash, title='Head Hash')
@@ -732,39 +889,27 @@ class ChainHeadDB():
             # unlike the root hashes, this window is for the blocks added after the time
             window_for_this_block = int(timestamp / TIME_BETWEEN_HEAD_HASH_SAVE) * TIME_BETWEEN_HEAD_HASH_SAVE
 
-            data = self.load_chronological_block_window(window_for_this_block)
+            window_length = self._get_chronological_block_window_length(window_for_this_block)
+            index = self._get_chronological_block_window_index(window_for_this_block, head_hash)
+            if index is None:
+                # A block hash is only saved once per window. If it is already there, its timestamp is updated.
+                index = window_length
+                self._set_chronological_block_window_length(window_for_this_block, window_length + 1)
 
-            if data is None:
-                data = [[timestamp, head_hash]]
-
-            else:
-                data.append([timestamp, head_hash])
-
-            self.save_chronological_block_window(data, window_for_this_block)
+            self._set_chronological_block_window_entry(window_for_this_block, index, timestamp, head_hash)
 
     def delete_block_hashes_from_chronological_window(self, block_hash_list: List[Hash32], window_timestamp: Timestamp) -> None:
         if window_timestamp > int(time.time()) - (NUMBER_OF_HEAD_HASH_TO_SAVE) * TIME_BETWEEN_HEAD_HASH_SAVE:
             # onlike the root hashes, this window is for the blocks added after the time
             window_timestamp = int(window_timestamp/TIME_BETWEEN_HEAD_HASH_SAVE) * TIME_BETWEEN_HEAD_HASH_SAVE
 
-            data = self.load_chronological_block_window(window_timestamp)
-            hashes = [x[1] for x in data]
             for block_hash in block_hash_list:
-                try:
-                    idx = hashes.index(block_hash)
-                    del (data[idx])
-                except ValueError:
-                    continue
-
-            if data is not None:
-                # self.logger.debug("Saving chronological block window with new data {}".format(new_data))
-                self.save_chronological_block_window(data, window_timestamp)
-
+                self._delete_chronological_block_window_entry(window_timestamp, block_hash)
 
     def delete_block_hash_from_chronological_window(self, head_hash: Hash32, timestamp: Timestamp = None, window_timestamp:Timestamp = None) -> None:
         '''
-        If timestamp is given, then deleted [timestamp, head_hash] from the list. This is fastest.
-        But if head_hash and window_timestamp is given, without a timestamp, then we search the list for the given hash and delete it. This is slower
+        If timestamp is given, then deleted [timestamp, head_hash] from the window. Otherwise, if window_timestamp is
+        given, head_hash is deleted from that window whatever its timestamp is.
         :param head_hash:
         :param timestamp:
         :param window_timestamp:
@@ -779,17 +924,7 @@ class ChainHeadDB():
                 # onlike the root hashes, this window is for the blocks added after the time
                 window_timestamp = int(window_timestamp/TIME_BETWEEN_HEAD_HASH_SAVE) * TIME_BETWEEN_HEAD_HASH_SAVE
 
-                data = self.load_chronological_block_window(window_timestamp)
-                hashes = [x[1] for x in data]
-                try:
-                    idx = hashes.index(head_hash)
-                    del(data[idx])
-                except ValueError:
-                    return
-
-                if data is not None:
-                    # self.logger.debug("Saving chronological block window with new data {}".format(new_data))    
-                    self.save_chronological_block_window(data, window_timestamp)
+                self._delete_chronological_block_window_entry(window_timestamp, head_hash)
                     
         else:
             #only add blocks for the proper time period        
@@ -797,46 +932,54 @@ class ChainHeadDB():
                 #onlike the root hashes, this window is for the blocks added after the time
                 window_for_this_block = int(timestamp/TIME_BETWEEN_HEAD_HASH_SAVE) * TIME_BETWEEN_HEAD_HASH_SAVE
                 
-                data = self.load_chronological_block_window(window_for_this_block)
-                if data is not None:
-                    #most of the time we will be adding the timestamp near the end. so lets iterate backwards
-                    try:
-                        data.remove([timestamp,head_hash])
-                    except ValueError:
-                        pass
-    
-                if data is not None:
-                    #self.logger.debug("Saving chronological block window with new data {}".format(new_data))    
-                    self.save_chronological_block_window(data, window_for_this_block)
+                self._delete_chronological_block_window_entry(window_for_this_block, head_hash, timestamp)
 
-            
-            
     def save_chronological_block_window(self, data, timestamp):
         validate_uint256(timestamp, title='timestamp')
         if timestamp % TIME_BETWEEN_HEAD_HASH_SAVE != 0:
             raise InvalidHeadRootTimestamp("Can only save or load chronological block for timestamps in increments of {} seconds.".format(TIME_BETWEEN_HEAD_HASH_SAVE))
-        
-        chronological_window_lookup_key = SchemaV1.make_chronological_window_lookup_key(timestamp)
-        encoded_data = rlp.encode(data,sedes=rlp.sedes.FCountableList(rlp.sedes.FList([f_big_endian_int, hash32])))
-        self.db.set(
-            chronological_window_lookup_key,
-            encoded_data,
-        )
+
+        self._delete_chronological_block_window(timestamp)
+
+        # A block hash is only saved once. The last timestamp wins, the same as add_block_hash_to_chronological_window
+        entries = {}
+        for entry_timestamp, block_hash in data:
+            entries[block_hash] = entry_timestamp
+
+        self.db.set_many(itertools.chain(
+            (
+                (SchemaV1.make_chronological_window_entry_lookup_key(timestamp, index),
+                 rlp.encode([entry_timestamp, block_hash], sedes=chronological_window_entry_sedes))
+                for index, (block_hash, entry_timestamp) in enumerate(entries.items())
+            ),
+            (
+                (SchemaV1.make_chronological_window_hash_lookup_key(timestamp, block_hash),
+                 rlp.encode(index, sedes=f_big_endian_int))
+                for index, block_hash in enumerate(entries)
+            ),
+        ))
+        self._set_chronological_block_window_length(timestamp, len(entries))
     
     def load_chronological_block_window(self, timestamp: Timestamp) -> Optional[List[Tuple[int, Hash32]]]:
         validate_uint256(timestamp, title='timestamp')
         if timestamp % TIME_BETWEEN_HEAD_HASH_SAVE != 0:
             raise InvalidHeadRootTimestamp("Can only save or load chronological block for timestamps in increments of {} seconds.".format(TIME_BETWEEN_HEAD_HASH_SAVE))
-        
-        chronological_window_lookup_key = SchemaV1.make_chronological_window_lookup_key(timestamp)
+
+        length_lookup_key = SchemaV1.make_chronological_window_length_lookup_key(timestamp)
         try:
-            data = rlp.decode(self.db[chronological_window_lookup_key], sedes=rlp.sedes.FCountableList(rlp.sedes.FList([f_big_endian_int, hash32])), use_list = True)
-            data.sort()
-            return data
+            window_length = rlp.decode(self.db[length_lookup_key], sedes=f_big_endian_int)
         except KeyError:
-            return None
-        
-    
+            return self._load_legacy_chronological_block_window(timestamp)
+
+        encoded_entries = self.db.get_many(
+            SchemaV1.make_chronological_window_entry_lookup_key(timestamp, index) for index in range(window_length)
+        )
+        data = [
+            rlp.decode(encoded_entry, sedes=chronological_window_entry_sedes, use_list=True)
+            for encoded_entry in encoded_entries
+        ]
+        data.sort()
+        return data
     
     def delete_chronological_block_window(self, timestamp):
         validate_uint256(timestamp, title='timestamp')
@@ -844,12 +987,93 @@ class ChainHeadDB():
             raise InvalidHeadRootTimestamp("Can only save or load chronological block for timestamps in increments of {} seconds.".format(TIME_BETWEEN_HEAD_HASH_SAVE))
         
         self.logger.debug("deleting chronological block window for timestamp {}".format(timestamp))
+        self._delete_chronological_block_window(timestamp)
+
+    def _delete_chronological_block_window(self, timestamp: Timestamp) -> None:
+        data = self.load_chronological_block_window(timestamp)
+        if data is None:
+            return
+
+        self.db.delete_many(itertools.chain(
+            (SchemaV1.make_chronological_window_entry_lookup_key(timestamp, index) for index in range(len(data))),
+            (SchemaV1.make_chronological_window_hash_lookup_key(timestamp, block_hash) for _, block_hash in data),
+            (SchemaV1.make_chronological_window_length_lookup_key(timestamp), SchemaV1.make_chronological_window_lookup_key(timestamp)),
+        ))
+
+    def _load_legacy_chronological_block_window(self, timestamp: Timestamp) -> Optional[List[Tuple[int, Hash32]]]:
         chronological_window_lookup_key = SchemaV1.make_chronological_window_lookup_key(timestamp)
         try:
-            del(self.db[chronological_window_lookup_key])
+            data = rlp.decode(self.db[chronological_window_lookup_key], sedes=rlp.sedes.FCountableList(rlp.sedes.FList([f_big_endian_int, hash32])), use_list = True)
+            data.sort()
+            return data
+        except KeyError:
+            return None
+
+    def _get_chronological_block_window_length(self, window_timestamp: Timestamp) -> int:
+        """
+        Returns the number of block hashes in the window. A window that is still saved as one list is moved to its
+        own keys first.
+        """
+        length_lookup_key = SchemaV1.make_chronological_window_length_lookup_key(window_timestamp)
+        try:
+            return rlp.decode(self.db[length_lookup_key], sedes=f_big_endian_int)
         except KeyError:
             pass
 
+        legacy_data = self._load_legacy_chronological_block_window(window_timestamp)
+        if legacy_data is None:
+            return 0
+
+        self.save_chronological_block_window(legacy_data, window_timestamp)
+        return rlp.decode(self.db[length_lookup_key], sedes=f_big_endian_int)
+
+    def _set_chronological_block_window_length(self, window_timestamp: Timestamp, window_length: int) -> None:
+        length_lookup_key = SchemaV1.make_chronological_window_length_lookup_key(window_timestamp)
+        self.db[length_lookup_key] = rlp.encode(window_length, sedes=f_big_endian_int)
+
+    def _get_chronological_block_window_index(self, window_timestamp: Timestamp, block_hash: Hash32) -> Optional[int]:
+        hash_lookup_key = SchemaV1.make_chronological_window_hash_lookup_key(window_timestamp, block_hash)
+        try:
+            return rlp.decode(self.db[hash_lookup_key], sedes=f_big_endian_int)
+        except KeyError:
+            return None
+
+    def _get_chronological_block_window_entry(self, window_timestamp: Timestamp, index: int) -> List[Union[int, Hash32]]:
+        entry_lookup_key = SchemaV1.make_chronological_window_entry_lookup_key(window_timestamp, index)
+        return rlp.decode(self.db[entry_lookup_key], sedes=chronological_window_entry_sedes, use_list=True)
+
+    def _set_chronological_block_window_entry(self, window_timestamp: Timestamp, index: int, timestamp: Timestamp, block_hash: Hash32) -> None:
+        entry_lookup_key = SchemaV1.make_chronological_window_entry_lookup_key(window_timestamp, index)
+        hash_lookup_key = SchemaV1.make_chronological_window_hash_lookup_key(window_timestamp, block_hash)
+        self.db[entry_lookup_key] = rlp.encode([timestamp, block_hash], sedes=chronological_window_entry_sedes)
+        self.db[hash_lookup_key] = rlp.encode(index, sedes=f_big_endian_int)
+
+    def _delete_chronological_block_window_entry(self, window_timestamp: Timestamp, block_hash: Hash32, timestamp: Timestamp = None) -> None:
+        """
+        Deletes block_hash from the window by moving the last block hash into its place. If timestamp is given, it is only
+        deleted if it was saved with that timestamp.
+        """
+        window_length = self._get_chronological_block_window_length(window_timestamp)
+        index = self._get_chronological_block_window_index(window_timestamp, block_hash)
+        if index is None:
+            return
+
+        if timestamp is not None:
+            entry_timestamp, _ = self._get_chronological_block_window_entry(window_timestamp, index)
+            if entry_timestamp != timestamp:
+                return
+
+        last_index = window_length - 1
+        if index != last_index:
+            last_timestamp, last_block_hash = self._get_chronological_block_window_entry(window_timestamp, last_index)
+            self._set_chronological_block_window_entry(window_timestamp, index, last_timestamp, last_block_hash)
+
+        self.db.delete_many([
+            SchemaV1.make_chronological_window_entry_lookup_key(window_timestamp, last_index),
+            SchemaV1.make_chronological_window_hash_lookup_key(window_timestamp, block_hash),
+        ])
+        self._set_chronological_block_window_length(window_timestamp, last_index)
+
     def load_root_hash_backup(self) -> List[Tuple[int, Hash32]]:
         db_key = SchemaV1.make_chain_head_root_hash_backup_key()
 
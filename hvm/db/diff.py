@@ -5,6 +5,7 @@ from collections.abc import (
 from typing import (  # noqa: F401
     Dict,
     Iterable,
+    Tuple,
     Union,
 )
 
@@ -16,6 +17,14 @@ class MissingReason:
     def __str__(self, reason):
         return "Key is missing because it was {}".format(self.reason)
 
+    def __reduce__(self):
+        # Diffs are pickled when they are sent to a db in another process. The reasons
+        # are compared by identity, so unpickle to the module level singletons.
+        if self.reason == "deleted":
+            return "DELETED"
+        else:
+            return "NEVER_INSERTED"
+
 
 NEVER_INSERTED = MissingReason("never inserted")
 DELETED = MissingReason("deleted")
@@ -118,6 +127,22 @@ class DBDiff(Mapping):
     def __len__(self):
         return len(self._changes)
 
+    def pending_items(self) -> Iterable[Tuple[bytes, bytes]]:
+        """
+        All of the keys that were inserted or updated, along with their new values
+        """
+        return tuple(
+            (key, value)
+            for key, value in self._changes.items()
+            if value is not DELETED
+        )
+
+    def deleted_keys(self) -> Iterable[bytes]:
+        """
+        All of the keys that were deleted
+        """
+        return tuple(key for key, value in self._changes.items() if value is DELETED)
+
     def apply_to(self, db: MutableMapping, apply_deletes: bool = True) -> None:
         """
         Apply the changes in this diff to the given database.
@@ -1,17 +1,13 @@
 import collections
-from typing import cast, Dict, Union  # noqa: F401
+from typing import cast, Dict, List, Tuple, Union  # noqa: F401
 import uuid
 
-from cytoolz import (
-    first,
-    merge,
-    last,
-)
 from eth_utils import (
     ValidationError,
 )
 
 from hvm.db.backends.base import BaseDB
+from hvm.db.diff import DBDiffTracker
 
 
 class DeletedEntry:
@@ -21,129 +17,200 @@ class DeletedEntry:
 DELETED_ENTRY = DeletedEntry()
 
 
+class MissingEntry:
+    pass
+
+
+# The previous value in the undo log of a key that had not been written to the journal yet
+MISSING_ENTRY = MissingEntry()
+
+
 class Journal(BaseDB):
     """
-    A Journal is an ordered list of changesets.  A changeset is a dictionary
-    of database keys and values.  The values are tracked changes that were
-    written after the changeset was created
+    A Journal is an ordered list of changesets. Each changeset tracks the changes that were
+    written after it was created.
+
+    The journal keeps one dictionary with the current value of every key that has been written,
+    so reads are a single lookup no matter how many changesets are open. Each write to a key
+    that hasn't been written in the latest changeset yet appends the key and its previous value
+    to a flat undo log, and each changeset remembers where it starts in the log. Committing a
+    changeset only forgets where it starts, so its entries become part of the previous
+    changeset. Discarding a changeset walks its part of the undo log backwards, restoring the
+    previous values. Writes made while only the root changeset is open are not logged, because
+    discarding the root changeset throws everything away.
 
     Changesets are referenced by a random uuid4.
     """
 
     def __init__(self) -> None:
-        # contains a mapping from all of the `uuid4` changeset_ids
-        # to a dictionary of key:value pairs with the recorded changes
-        # that belong to the changeset
-        self.journal_data = collections.OrderedDict()  # type: collections.OrderedDict[uuid.UUID, Dict[bytes, Union[bytes, DeletedEntry]]]  # noqa E501
+        # the current value of every key written to the journal
+        self._current = {}  # type: Dict[bytes, Union[bytes, DeletedEntry]]
+        # (key, previous value) for the first write to a key in each changeset after the root
+        self._undo_log = []  # type: List[Tuple[bytes, Union[bytes, DeletedEntry, MissingEntry]]]
+        # the ids of the open changesets, from the root to the latest
+        self._changeset_ids = []  # type: List[uuid.UUID]
+        # changeset id -> (index in _changeset_ids, start of its entries in _undo_log, serial number)
+        self._changesets = {}  # type: Dict[uuid.UUID, Tuple[int, int, int]]
+        # key -> serial number of the last changeset that logged it. Serial numbers are never reused.
+        self._logged_in = {}  # type: Dict[bytes, int]
+        self._latest_serial = 0
+        self._next_serial = 0
 
     @property
-    def root_changeset_id(self) -> uuid.UUID:
+    def journal_data(self) -> 'collections.OrderedDict[uuid.UUID, Dict[bytes, Union[bytes, DeletedEntry]]]':
         """
-        Returns the id of the root changeset
+        The keys written in each open changeset, with their values at the end of that changeset,
+        in order. It is rebuilt from the undo log on every access by undoing the changesets from
+        the latest to the root, so it is only meant for debugging and tests.
         """
-        return first(self.journal_data.keys())
+        journal_data = collections.OrderedDict()  # type: collections.OrderedDict[uuid.UUID, Dict[bytes, Union[bytes, DeletedEntry]]]  # noqa E501
+        if self.is_empty():
+            return journal_data
+
+        values = dict(self._current)
+        undo_end = len(self._undo_log)
+        changeset_data = []
+        for changeset_id in reversed(self._changeset_ids[1:]):
+            undo_start = self._changesets[changeset_id][1]
+            entries = self._undo_log[undo_start:undo_end]
+            changeset_data.append((changeset_id, {key: values[key] for key, _ in entries}))
+            for key, previous_value in reversed(entries):
+                if previous_value is MISSING_ENTRY:
+                    del values[key]
+                else:
+                    values[key] = previous_value
+            undo_end = undo_start
 
-    @property
-    def latest_id(self) -> uuid.UUID:
-        """
-        Returns the id of the latest changeset
-        """
-        return last(self.journal_data.keys())
+        # Whatever is left was written in the root changeset
+        journal_data[self.root_changeset_id] = values
+        for changeset_id, data in reversed(changeset_data):
+            journal_data[changeset_id] = data
+        return journal_data
 
     @property
-    def latest(self) -> Dict[bytes, Union[bytes, DeletedEntry]]:
+    def root_changeset_id(self) -> uuid.UUID:
         """
-        Returns the dictionary of db keys and values for the latest changeset.
+        Returns the id of the root changeset
         """
-        return self.journal_data[self.latest_id]
+        return self._changeset_ids[0]
 
-    @latest.setter
-    def latest(self, value: Dict[bytes, Union[bytes, DeletedEntry]]) -> None:
+    @property
+    def latest_id(self) -> uuid.UUID:
         """
-        Setter for updating the *latest* changeset.
+        Returns the id of the latest changeset
         """
-        self.journal_data[self.latest_id] = value
+        return self._changeset_ids[-1]
 
     def is_empty(self) -> bool:
-        return len(self.journal_data) == 0
+        return len(self._changeset_ids) == 0
 
     def has_changeset(self, changeset_id: uuid.UUID) -> bool:
-        return changeset_id in self.journal_data
+        return changeset_id in self._changesets
 
-    def record_changeset(self) -> uuid.UUID:
+    def record_changeset(self, custom_changeset_id: uuid.UUID = None) -> uuid.UUID:
         """
         Creates a new changeset. Changesets are referenced by a random uuid4
         to prevent collisions between multiple changesets.
+
+        A ``custom_changeset_id`` can be given to keep this journal's changesets in step
+        with another journal.
         """
-        changeset_id = uuid.uuid4()
-        self.journal_data[changeset_id] = {}
+        if custom_changeset_id is not None:
+            if custom_changeset_id in self._changesets:
+                raise ValidationError("Tried to record with an existing changeset id: {0}".format(
+                    custom_changeset_id
+                ))
+            changeset_id = custom_changeset_id
+        else:
+            changeset_id = uuid.uuid4()
+
+        self._next_serial += 1
+        self._latest_serial = self._next_serial
+        self._changesets[changeset_id] = (len(self._changeset_ids), len(self._undo_log), self._latest_serial)
+        self._changeset_ids.append(changeset_id)
         return changeset_id
 
-    def pop_changeset(self, changeset_id: uuid.UUID) -> Dict[bytes, bytes]:
+    def _close_changesets(self, changeset_id: uuid.UUID) -> int:
         """
-        Returns all changes from the given changeset.  This includes all of
-        the changes from any subsequent changeset, giving precidence to
-        later changesets.
+        Forgets the given changeset and all subsequent changesets, and returns where the given
+        changeset started in the undo log.
         """
-        if changeset_id not in self.journal_data:
+        if changeset_id not in self._changesets:
             raise KeyError("Unknown changeset: {0}".format(changeset_id))
 
-        all_ids = tuple(self.journal_data.keys())
-        changeset_idx = all_ids.index(changeset_id)
-        changesets_to_pop = all_ids[changeset_idx:]
+        index, undo_start, _ = self._changesets[changeset_id]
+        for closed_id in self._changeset_ids[index:]:
+            del self._changesets[closed_id]
+        del self._changeset_ids[index:]
+
+        if self._changeset_ids:
+            self._latest_serial = self._changesets[self.latest_id][2]
+        return undo_start
+
+    def pop_changeset(self, changeset_id: uuid.UUID) -> None:
+        """
+        Throws away all changes from the given changeset and from any subsequent changeset,
+        restoring the values from before it was recorded.
+        """
+        undo_start = self._close_changesets(changeset_id)
+
+        if self.is_empty():
+            self._current.clear()
+        else:
+            current = self._current
+            for key, previous_value in reversed(self._undo_log[undo_start:]):
+                if previous_value is MISSING_ENTRY:
+                    del current[key]
+                else:
+                    current[key] = previous_value
+
+        self._truncate_undo_log(undo_start)
 
-        # we pull all of the changesets *after* the changeset we are
-        # reverting to and collapse them to a single set of keys (giving
-        # precedence to later changesets)
-        changeset_data = merge(*(
-            self.journal_data.pop(c_id)
-            for c_id
-            in changesets_to_pop
-        ))
+    def commit_changeset(self, changeset_id: uuid.UUID) -> None:
+        """
+        Collapses all changes for the given changeset, and any subsequent changeset, into the
+        previous changeset if it exists. Committing the root changeset leaves the journal empty,
+        with all of the changes still available from :meth:`merged_changesets`.
+        """
+        self._close_changesets(changeset_id)
 
-        return changeset_data
+        if len(self._changeset_ids) <= 1:
+            # Nothing can be discarded back to a value from before the root changeset,
+            # other than by discarding everything
+            self._truncate_undo_log(0)
 
-    def commit_changeset(self, changeset_id: uuid.UUID) -> Dict[bytes, bytes]:
+    def _truncate_undo_log(self, undo_start: int) -> None:
+        if undo_start == 0:
+            self._undo_log.clear()
+            self._logged_in.clear()
+        else:
+            del self._undo_log[undo_start:]
+
+    def merged_changesets(self) -> Dict[bytes, Union[bytes, DeletedEntry]]:
         """
-        Collapses all changes for the given changeset into the previous
-        changesets if it exists.
+        Returns the changes from all changesets as one dictionary, without changing the journal.
+        This is the journal's own dictionary, so it must not be modified.
         """
-        changeset_data = self.pop_changeset(changeset_id)
-        if not self.is_empty():
-            # we only have to merge the changes into the latest changeset if
-            # there is one.
-            self.latest = merge(
-                self.latest,
-                changeset_data,
-            )
-        return changeset_data
+        return self._current
 
     #
     # Database API
     #
     def __getitem__(self, key: bytes) -> Union[bytes, DeletedEntry]:
-        """
-        For key lookups we need to iterate through the changesets in reverse
-        order, returning from the first one in which the key is present.
-        """
-        # Ignored from mypy because of https://github.com/python/typeshed/issues/2078
-        for changeset_data in reversed(self.journal_data.values()):  # type: ignore
-            if key in changeset_data:
-                return changeset_data[key]
-            else:
-                continue
-
-        return None
+        return self._current.get(key)
 
     def __setitem__(self, key: bytes, value: bytes) -> None:
-        self.latest[key] = value
+        if len(self._changeset_ids) > 1 and self._logged_in.get(key) != self._latest_serial:
+            self._undo_log.append((key, self._current.get(key, MISSING_ENTRY)))
+            self._logged_in[key] = self._latest_serial
+        self._current[key] = value
 
     def _exists(self, key: bytes) -> bool:
         val = self.get(key)
         return val is not None and val is not DELETED_ENTRY
 
     def __delitem__(self, key: bytes) -> None:
-        self.latest[key] = DELETED_ENTRY
+        self[key] = DELETED_ENTRY
 
 
 class JournalDB(BaseDB):
@@ -161,9 +228,10 @@ class JournalDB(BaseDB):
     Nothing is written to the underlying db until `persist()` is called.
 
     The added memory footprint for a JournalDB is one key/value stored per
-    database key which is changed.  Subsequent changes to the same key within
+    database key which is changed, plus one undo log entry per key changed
+    in each nested changeset.  Subsequent changes to the same key within
     the same changeset will not increase the journal size since we only need
-    to track latest value for any given key within any given changeset.
+    to track its previous value once per changeset.
     """
     wrapped_db = None
     journal = None  # type: Journal
@@ -234,17 +302,17 @@ class JournalDB(BaseDB):
         the underlying database and the Journal starts a new recording.
         """
         self._validate_changeset(changeset_id)
-        journal_data = self.journal.commit_changeset(changeset_id)
+        self.journal.commit_changeset(changeset_id)
 
         if self.journal.is_empty():
-            for key, value in journal_data.items():
+            # Write all of the changes to the underlying db in a single call
+            diff_tracker = DBDiffTracker()
+            for key, value in self.journal.merged_changesets().items():
                 if value is not DELETED_ENTRY:
-                    self.wrapped_db[key] = value
+                    diff_tracker[key] = value
                 else:
-                    try:
-                        del self.wrapped_db[key]
-                    except KeyError:
-                        pass
+                    del diff_tracker[key]
+            self.wrapped_db.apply_diff(diff_tracker.diff(), apply_deletes=True)
 
             # Ensure the journal automatically restarts recording after
             # it has been persisted to the underlying db
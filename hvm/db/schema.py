@@ -36,6 +36,14 @@ class SchemaV1(BaseSchema):
     def make_account_lookup_key(wallet_address:Address) -> bytes:
         return b'account:%s' % wallet_address
 
+    @staticmethod
+    def make_receivable_transactions_summary_lookup_key(wallet_address:Address) -> bytes:
+        return b'receivable-transactions:%b' % wallet_address
+
+    @staticmethod
+    def make_receivable_transaction_lookup_key(wallet_address:Address, transaction_hash: Hash32) -> bytes:
+        return b'receivable-transaction:%b-%b' % (wallet_address, transaction_hash)
+
     @staticmethod
     def make_block_number_to_hash_lookup_key(wallet_address:Address, block_number: BlockNumber) -> bytes:
         number_to_hash_key = b'block-number-to-hash:%b-%d' % (wallet_address, block_number)
@@ -55,6 +63,10 @@ class SchemaV1(BaseSchema):
     def make_historical_head_root_lookup_key() -> bytes:
         return b'historical-head-root-list'
     
+    @staticmethod
+    def make_historical_head_root_range_lookup_key() -> bytes:
+        return b'historical-head-root-range'
+
     @staticmethod
     def make_head_root_for_timestamp_lookup_key(timestamp: int) -> bytes:
         #require that it is mod of 1000 seconds
@@ -72,6 +84,24 @@ class SchemaV1(BaseSchema):
         if timestamp % TIME_BETWEEN_HEAD_HASH_SAVE != 0:
             raise InvalidHeadRootTimestamp("Can only save or load chronological block for timestamps in increments of {} seconds.".format(TIME_BETWEEN_HEAD_HASH_SAVE))
         return b'chronological-block-window:%i' % timestamp
+
+    @staticmethod
+    def make_chronological_window_length_lookup_key(timestamp: int) -> bytes:
+        if timestamp % TIME_BETWEEN_HEAD_HASH_SAVE != 0:
+            raise InvalidHeadRootTimestamp("Can only save or load chronological block for timestamps in increments of {} seconds.".format(TIME_BETWEEN_HEAD_HASH_SAVE))
+        return b'chronological-block-window-length:%i' % timestamp
+
+    @staticmethod
+    def make_chronological_window_entry_lookup_key(timestamp: int, index: int) -> bytes:
+        if timestamp % TIME_BETWEEN_HEAD_HASH_SAVE != 0:
+            raise InvalidHeadRootTimestamp("Can only save or load chronological block for timestamps in increments of {} seconds.".format(TIME_BETWEEN_HEAD_HASH_SAVE))
+        return b'chronological-block-window-entry:%i-%i' % (timestamp, index)
+
+    @staticmethod
+    def make_chronological_window_hash_lookup_key(timestamp: int, block_hash: Hash32) -> bytes:
+        if timestamp % TIME_BETWEEN_HEAD_HASH_SAVE != 0:
+            raise InvalidHeadRootTimestamp("Can only save or load chronological block for timestamps in increments of {} seconds.".format(TIME_BETWEEN_HEAD_HASH_SAVE))
+        return b'chronological-block-window-hash:%i-%b' % (timestamp, block_hash)
     
     @staticmethod
     def make_block_children_lookup_key(block_hash: Hash32) -> bytes:
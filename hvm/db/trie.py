@@ -29,7 +29,15 @@ from hvm.rlp.sedes import hash32
 
 def make_trie_root_and_nodes(
         items: Union[List[Receipt], List[BaseTransaction]]) -> Tuple[bytes, Dict[bytes, bytes]]:
-    return _make_trie_root_and_nodes(tuple(rlp.encode(item) for item in items))
+    return _make_trie_root_and_nodes(tuple(item.encoded for item in items))
+
+
+def make_trie_root(items: Union[List[Receipt], List[BaseTransaction]]) -> Hash32:
+    """
+    The same root hash as make_trie_root_and_nodes, without building the trie nodes. Use this when the root is only
+    being compared, and make_trie_root_and_nodes when the items are going to be saved.
+    """
+    return _make_trie_root(tuple(item.encoded for item in items))
 
 # This cache is expected to be useful when importing blocks as we call this once when importing
 # and again when validating the imported block. But it should also help for post-Byzantium blocks
@@ -54,6 +62,97 @@ def _make_trie_root_and_nodes_isometric_on_order(items: Tuple[bytes, ...]) -> Tu
     return trie.root_hash, kv_store
 
 
+@functools.lru_cache(128)
+def _make_trie_root(items: Tuple[bytes, ...]) -> Hash32:
+    keys = [rlp.encode(index, sedes=rlp.sedes.big_endian_int) for index in range(len(items))]
+    # rlp encoded indexes don't sort in index order, eg. 0 is encoded as 0x80
+    return _make_trie_root_from_sorted_items(sorted(zip(keys, items)))
+
+
+@functools.lru_cache(128)
+def _make_trie_root_isometric_on_order(items: Tuple[bytes, ...]) -> Hash32:
+    """
+    The same root hash as _make_trie_root_and_nodes_isometric_on_order, without building the trie nodes.
+    """
+    return _make_trie_root_from_sorted_items([(item, item) for item in sorted(set(items))])
+
+
+#
+# Root-only hexary trie
+#
+def _make_trie_root_from_sorted_items(items: List[Tuple[bytes, bytes]]) -> Hash32:
+    """
+    Computes the root hash that a HexaryTrie would have after setting each key to its value, given the items
+    sorted by key. Each node is encoded once, when its subtree is finished, and only the references to its
+    children are kept, so no node database is built. Keys must be unique and values non-empty.
+    """
+    if len(items) == 0:
+        return BLANK_ROOT_HASH
+    nibble_items = [(_bytes_to_nibbles(key), value) for key, value in items]
+    root_node = _make_trie_node(nibble_items, 0, len(nibble_items), 0)
+    return keccak(rlp.encode(root_node))
+
+
+def _make_trie_node(items: List[Tuple[bytes, bytes]], start: int, end: int, depth: int) -> list:
+    """
+    Builds the node for the items in items[start:end], which all share their first depth nibbles.
+    """
+    first_key, first_value = items[start]
+    if end - start == 1:
+        return [_compact_encode(first_key[depth:], is_leaf=True), first_value]
+
+    # The items are sorted, so the prefix shared by the first and last keys is shared by all of them
+    last_key = items[end - 1][0]
+    prefix_end = depth
+    max_prefix_end = min(len(first_key), len(last_key))
+    while prefix_end < max_prefix_end and first_key[prefix_end] == last_key[prefix_end]:
+        prefix_end += 1
+
+    if prefix_end > depth:
+        child = _make_trie_node(items, start, end, prefix_end)
+        return [_compact_encode(first_key[depth:prefix_end], is_leaf=False), _make_node_reference(child)]
+
+    branch = [b''] * 17
+    if len(first_key) == depth:
+        # A key that ends here sorts first, and its value is stored in the branch itself
+        branch[16] = first_value
+        start += 1
+
+    while start < end:
+        nibble = items[start][0][depth]
+        child_end = start + 1
+        while child_end < end and items[child_end][0][depth] == nibble:
+            child_end += 1
+        branch[nibble] = _make_node_reference(_make_trie_node(items, start, child_end, depth + 1))
+        start = child_end
+
+    return branch
+
+
+def _make_node_reference(node: list) -> Union[list, bytes]:
+    # Like HexaryTrie, nodes that encode to less than 32 bytes are embedded in their parent instead of hashed
+    encoded_node = rlp.encode(node)
+    if len(encoded_node) < 32:
+        return node
+    return keccak(encoded_node)
+
+
+def _bytes_to_nibbles(value: bytes) -> bytes:
+    nibbles = bytearray(len(value) * 2)
+    nibbles[0::2] = (byte >> 4 for byte in value)
+    nibbles[1::2] = (byte & 0x0f for byte in value)
+    return bytes(nibbles)
+
+
+def _compact_encode(nibbles: bytes, is_leaf: bool) -> bytes:
+    flag = 2 if is_leaf else 0
+    if len(nibbles) % 2:
+        nibbles = bytes([flag + 1]) + nibbles
+    else:
+        nibbles = bytes([flag, 0]) + nibbles
+    return bytes(nibbles[i] << 4 | nibbles[i + 1] for i in range(0, len(nibbles), 2))
+
+
 
 class BinaryTrie(ParentBinaryTrie):
     def get_leaf_nodes(self, node, reverse = False):
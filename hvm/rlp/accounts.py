@@ -15,6 +15,7 @@ from hvm.constants import (
 from .sedes import (
     trie_root,
     hash32,
+    hash32_or_empty,
     address
     
 )
@@ -31,6 +32,38 @@ class TransactionKey(rlp.Serializable):
     ]
 
  
+class ReceivableTransactionEntry(rlp.Serializable):
+    """
+    One receivable transaction in an account's receivable transaction index. The entries of an
+    account form a doubly linked list, in the order they were added. An empty hash means there is
+    no previous or next entry.
+    """
+    fields = [
+        ('sender_block_hash', hash32),
+        ('previous_transaction_hash', hash32_or_empty),
+        ('next_transaction_hash', hash32_or_empty),
+    ]
+
+
+class ReceivableTransactionsSummary(rlp.Serializable):
+    """
+    The number of receivable transactions an account has, and the ends of its linked list of
+    :class:`ReceivableTransactionEntry`.
+    """
+    fields = [
+        ('count', f_big_endian_int),
+        ('first_transaction_hash', hash32_or_empty),
+        ('last_transaction_hash', hash32_or_empty),
+    ]
+
+    def __init__(self,
+                 count: int=0,
+                 first_transaction_hash: bytes=b'',
+                 last_transaction_hash: bytes=b'',
+                 **kwargs: Any) -> None:
+        super(ReceivableTransactionsSummary, self).__init__(count, first_transaction_hash, last_transaction_hash, **kwargs)
+
+
 class BlockConflictKey(rlp.Serializable):
     fields = [
         ('slash_block_hash', hash32),
@@ -40,6 +73,10 @@ class BlockConflictKey(rlp.Serializable):
 class Account(rlp.Serializable):
     """
     RLP object for accounts.
+
+    Receivable transactions are kept in their own index by :class:`~hvm.db.account.AccountDB`,
+    so ``receivable_transactions`` is empty in stored accounts. It is only filled in accounts
+    saved by account hash, and in accounts written before the index existed.
     """
     fields = [
         ('nonce', f_big_endian_int),
@@ -13,7 +13,7 @@ from rlp_cython.sedes import (
     binary,
 )
 
-from hvm.db.trie import make_trie_root_and_nodes
+from hvm.db.trie import make_trie_root
 
 from eth_utils import int_to_big_endian
 
@@ -28,6 +28,7 @@ from eth_typing import (
 )
 
 from hvm.exceptions import ValidationError
+from hvm.rlp.encoding import CachedEncodingMixin
 
 
 from hvm.utils.transactions import (
@@ -82,7 +83,7 @@ class PeerNodeHealth(rlp.Serializable, metaclass=ABCMeta):
         return output
 
 
-class NodeStakingScore(rlp.Serializable, metaclass=ABCMeta):
+class NodeStakingScore(CachedEncodingMixin, rlp.Serializable, metaclass=ABCMeta):
     fields = [
         ('recipient_node_wallet_address', address),
         ('score', f_big_endian_int), #a score out of 1,000,000
@@ -98,10 +99,6 @@ class NodeStakingScore(rlp.Serializable, metaclass=ABCMeta):
     _sender = None
     _valid_score = None
 
-    @property
-    def hash(self) -> bytes:
-        return keccak(rlp.encode(self))
-
     @property
     def sender(self) -> Address:
         """
@@ -155,7 +152,7 @@ class NodeStakingScore(rlp.Serializable, metaclass=ABCMeta):
         if chain_id is None:
             chain_id = self.chain_id
 
-        transaction_parts = rlp.decode(rlp.encode(self), use_list=True)
+        transaction_parts = rlp.decode(self.encoded, use_list=True)
 
         transaction_parts_for_signature = transaction_parts[:-3] + [int_to_big_endian(chain_id), b'', b'']
 
@@ -237,8 +234,7 @@ class StakeRewardType2(rlp.Serializable, metaclass=ABCMeta):
 
     @property
     def proof_root_hash(self) -> bytes:
-        root_hash, kv_nodes = make_trie_root_and_nodes(self.proof)
-        return root_hash
+        return make_trie_root(self.proof)
 
 class BaseRewardBundle(rlp.Serializable, metaclass=ABCMeta):
     reward_type_1_class = StakeRewardType1
@@ -0,0 +1,26 @@
+import rlp_cython as rlp
+
+from eth_hash.auto import keccak
+
+from eth_typing import Hash32
+
+
+class CachedEncodingMixin:
+    """
+    Remembers the rlp encoding and hash of an rlp.Serializable, the same way BaseBlockHeader remembers its hash.
+    The objects are immutable, and copy() builds a new object, so a changed copy never sees the old encoding.
+    """
+    _encoded = None
+    _hash = None
+
+    @property
+    def encoded(self) -> bytes:
+        if self._encoded is None:
+            self._encoded = rlp.encode(self)
+        return self._encoded
+
+    @property
+    def hash(self) -> Hash32:
+        if self._hash is None:
+            self._hash = keccak(self.encoded)
+        return self._hash
@@ -348,11 +348,33 @@ from hvm.utils.blocks import (
 
 
 class BlockHeader(BaseBlockHeader):
+    # Only set once the signature has been checked
+    _sender = None
+
     def check_signature_validity(self):
-        validate_block_header_signature(self)
+        if self._sender is None:
+            self._sender = validate_block_header_signature(self, return_sender=True)
 
     def get_sender(self):
+        if self._sender is not None:
+            return self._sender
         return extract_block_header_sender(self)
+
+    def set_checked_sender(self, sender: Address) -> None:
+        """
+        Saves the sender of a signature that has already been checked, so that it isn't recovered again.
+        """
+        self._sender = sender
+
+    def copy_checked_sender_from(self, header: 'BlockHeader') -> None:
+        """
+        If header has the same signature and signed fields as this one, and its signature has been checked, then
+        this one doesn't need to be checked either.
+        """
+        if (header._sender is not None and
+                (self.v, self.r, self.s) == (header.v, header.r, header.s) and
+                self.get_message_for_signing() == header.get_message_for_signing()):
+            self._sender = header._sender
     
         
     def get_signed(self, private_key, chain_id):
@@ -16,12 +16,13 @@ from .sedes import (
     int32,
 )
 
+from .encoding import CachedEncodingMixin
 from .logs import Log
 
 from typing import Iterable
 
 
-class Receipt(rlp.Serializable):
+class Receipt(CachedEncodingMixin, rlp.Serializable):
 
     fields = [
         ('status_code', binary),
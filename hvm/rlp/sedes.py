@@ -11,6 +11,7 @@ from hvm.constants import (
 address = Binary.fixed_length(20, allow_empty=True)
 collation_body = Binary.fixed_length(COLLATION_SIZE)
 hash32 = Binary.fixed_length(32)
+hash32_or_empty = Binary.fixed_length(32, allow_empty=True)
 int32 = BigEndianInt(32)
 int256 = BigEndianInt(256)
 trie_root = Binary.fixed_length(32, allow_empty=True)
@@ -19,11 +19,10 @@ from eth_typing import (
     Address
 )
 
-from eth_hash.auto import keccak
-
 from hvm.exceptions import (
     ValidationError,
 )
+from hvm.rlp.encoding import CachedEncodingMixin
 
 from hvm.rlp.sedes import (
     address,
@@ -64,7 +63,7 @@ class BaseTransactionCommonMethods:
         return self.get_intrinsic_gas() + computation.get_gas_used()
 
 
-class BaseTransaction(rlp.Serializable, BaseTransactionCommonMethods):
+class BaseTransaction(CachedEncodingMixin, rlp.Serializable, BaseTransactionCommonMethods):
     fields = [
         ('nonce', big_endian_int),
         ('gas_price', big_endian_int),
@@ -79,12 +78,7 @@ class BaseTransaction(rlp.Serializable, BaseTransactionCommonMethods):
 
     @classmethod
     def from_base_transaction(cls, transaction: 'BaseTransaction') -> 'BaseTransaction':
-        return rlp.decode(rlp.encode(transaction), sedes=cls)
-
-
-    @property
-    def hash(self) -> bytes:
-        return keccak(rlp.encode(self))
+        return rlp.decode(transaction.encoded, sedes=cls)
 
     @property
     def sender(self) -> Address:
@@ -152,7 +146,7 @@ class BaseTransaction(rlp.Serializable, BaseTransactionCommonMethods):
 
 
 
-class BaseReceiveTransaction(rlp.Serializable, BaseTransactionCommonMethods):
+class BaseReceiveTransaction(CachedEncodingMixin, rlp.Serializable, BaseTransactionCommonMethods):
 
     fields = [
         ('sender_block_hash', hash32),
@@ -163,12 +157,7 @@ class BaseReceiveTransaction(rlp.Serializable, BaseTransactionCommonMethods):
 
     @classmethod
     def from_base_transaction(cls, transaction: 'BaseReceiveTransaction') -> 'BaseReceiveTransaction':
-        return rlp.decode(rlp.encode(transaction), sedes=cls)
-
-    @property
-    def hash(self) -> bytes:
-        return keccak(rlp.encode(self))
-
+        return rlp.decode(transaction.encoded, sedes=cls)
 
     # +-------------------------------------------------------------+
     # | API that must be implemented by all Transaction subclasses. |
@@ -12,6 +12,7 @@ from hvm.utils.numeric import (
     is_even,
     int_to_big_endian,
 )
+from hvm.utils.signatures import signature_cache
 
 from hvm.rlp.headers import (
     BaseBlockHeader,
@@ -75,7 +76,7 @@ def create_block_header_signature(block_header: BaseBlockHeader, private_key, ch
     return v, r, s
 
 
-def validate_block_header_signature(block_header: BaseBlockHeader) -> None:
+def validate_block_header_signature(block_header: BaseBlockHeader, return_sender = False) -> None:
     v = extract_signature_v(block_header.v)
 
     canonical_v = v - 27
@@ -84,14 +85,21 @@ def validate_block_header_signature(block_header: BaseBlockHeader) -> None:
     signature = keys.Signature(vrs=vrs)
 
     message = block_header.get_message_for_signing()
-    
-    try:
-        public_key = signature.recover_public_key_from_msg(message)
-    except BadSignature as e:
-        raise ValidationError("Bad Signature: {0}".format(str(e)))
+    sender = signature_cache.get_sender(message, block_header.v, block_header.r, block_header.s)
+    if sender is None:
+        try:
+            public_key = signature.recover_public_key_from_msg(message)
+        except BadSignature as e:
+            raise ValidationError("Bad Signature: {0}".format(str(e)))
+
+        if not signature.verify_msg(message, public_key):
+            raise ValidationError("Invalid Signature")
+
+        sender = public_key.to_canonical_address()
+        signature_cache.set_sender(message, block_header.v, block_header.r, block_header.s, sender)
 
-    if not signature.verify_msg(message, public_key):
-        raise ValidationError("Invalid Signature")
+    if return_sender:
+        return sender
 
 
 def extract_block_header_sender(block_header: BaseBlockHeader) -> bytes:
@@ -107,7 +115,10 @@ def extract_block_header_sender(block_header: BaseBlockHeader) -> bytes:
     signature = keys.Signature(vrs=vrs)
 
     message = block_header.get_message_for_signing()
-    
+    sender = signature_cache.get_sender(message, block_header.v, block_header.r, block_header.s)
+    if sender is not None:
+        return sender
+
     public_key = signature.recover_public_key_from_msg(message)
     sender = public_key.to_canonical_address()
     return sender
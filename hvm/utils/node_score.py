@@ -13,6 +13,7 @@ from hvm.utils.numeric import (
     is_even,
     int_to_big_endian,
 )
+from hvm.utils.signatures import signature_cache
 from typing import Union
 
 
@@ -65,17 +66,21 @@ def validate_node_staking_score_signature(node_staking_score: 'NodeStakingScore'
     signature = keys.Signature(vrs=vrs)
 
     message = node_staking_score.get_message_for_signing()
-    
-    try:
-        public_key = signature.recover_public_key_from_msg(message)
-    except BadSignature as e:
-        raise ValidationError("Bad Signature: {0}".format(str(e)))
+    sender = signature_cache.get_sender(message, node_staking_score.v, node_staking_score.r, node_staking_score.s)
+    if sender is None:
+        try:
+            public_key = signature.recover_public_key_from_msg(message)
+        except BadSignature as e:
+            raise ValidationError("Bad Signature: {0}".format(str(e)))
 
-    if not signature.verify_msg(message, public_key):
-        raise ValidationError("Invalid Signature")
+        if not signature.verify_msg(message, public_key):
+            raise ValidationError("Invalid Signature")
+
+        sender = public_key.to_canonical_address()
+        signature_cache.set_sender(message, node_staking_score.v, node_staking_score.r, node_staking_score.s, sender)
 
     if return_sender:
-        return public_key.to_canonical_address()
+        return sender
 
 #@lru_cache(maxsize=32)
 def extract_node_staking_score_sender(node_staking_score: 'NodeStakingScore') -> bytes:
@@ -87,7 +92,10 @@ def extract_node_staking_score_sender(node_staking_score: 'NodeStakingScore') ->
     signature = keys.Signature(vrs=vrs)
 
     message = node_staking_score.get_message_for_signing()
-    
+    sender = signature_cache.get_sender(message, node_staking_score.v, node_staking_score.r, node_staking_score.s)
+    if sender is not None:
+        return sender
+
     public_key = signature.recover_public_key_from_msg(message)
     sender = public_key.to_canonical_address()
     return sender
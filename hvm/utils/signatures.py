@@ -0,0 +1,195 @@
+import itertools
+import multiprocessing
+import os
+import signal
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+)
+
+from eth_keys import keys
+from eth_keys.exceptions import (
+    BadSignature,
+    ValidationError as EthKeysValidationError,
+)
+from eth_hash.auto import keccak
+from eth_typing import Address
+from lru import LRU
+
+from hvm.utils.numeric import is_even
+
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
+if TYPE_CHECKING:
+    from hvm.rlp.blocks import BaseBlock
+
+
+# Below this many signatures, sending them to the processes takes longer than recovering them here.
+MIN_SIGNATURES_FOR_PROCESS_POOL = 64
+
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+DEFAULT_SIGNATURE_CACHE_SIZE = 16384
+
+
+class SignatureCache:
+    """
+    The senders of signatures that have been checked, keyed by (keccak(message), v, r, s). The same transaction,
+    header or node staking score is usually checked many times after it arrives, so this is shared by all of them
+    within a process. Only valid signatures are saved.
+    """
+    def __init__(self, size: int) -> None:
+        self._senders = LRU(size)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _make_key(message: bytes, v: int, r: int, s: int) -> Tuple[bytes, int, int, int]:
+        return (keccak(message), v, r, s)
+
+    def get_sender(self, message: bytes, v: int, r: int, s: int) -> Optional[Address]:
+        """
+        Returns the saved sender of the signature, or None if it hasn't been checked yet.
+        """
+        try:
+            sender = self._senders[self._make_key(message, v, r, s)]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return sender
+
+    def set_sender(self, message: bytes, v: int, r: int, s: int, sender: Address) -> None:
+        self._senders[self._make_key(message, v, r, s)] = sender
+
+    def set_size(self, size: int) -> None:
+        self._senders.set_size(size)
+
+    def clear(self) -> None:
+        self._senders.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._senders),
+            'max_size': self._senders.get_size(),
+        }
+
+
+signature_cache = SignatureCache(DEFAULT_SIGNATURE_CACHE_SIZE)
+
+
+def set_signature_cache_size(size: int) -> None:
+    signature_cache.set_size(size)
+
+
+def get_signature_cache_stats() -> Dict[str, int]:
+    return signature_cache.get_stats()
+
+
+def recover_signature_sender(message: bytes, v: int, r: int, s: int) -> Optional[Address]:
+    """
+    Returns the address that signed the message, or None if the signature is invalid. v can be EIP155 encoded.
+    """
+    canonical_v = 1 if is_even(v) else 0
+    try:
+        signature = keys.Signature(vrs=(canonical_v, r, s))
+        public_key = signature.recover_public_key_from_msg(message)
+    except (BadSignature, EthKeysValidationError):
+        return None
+
+    if not signature.verify_msg(message, public_key):
+        return None
+
+    return public_key.to_canonical_address()
+
+
+_recovery_executor = None  # type: Executor
+
+
+def start_recovery_executor(max_workers: int = DEFAULT_MAX_WORKERS) -> Optional[Executor]:
+    """
+    Starts the process pool used by recover_block_senders, or does nothing if it is already running. It is meant
+    to be started once, when the process that imports blocks starts, and kept until it exits.
+
+    The workers are started with forkserver, or spawn where that isn't available, rather than forked. Block import
+    runs in the threads of a manager server, and forking while another thread holds a lock can leave that lock
+    held forever in the child.
+    """
+    global _recovery_executor
+
+    if _recovery_executor is None and max_workers > 1:
+        if 'forkserver' in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context('forkserver')
+        else:
+            mp_context = multiprocessing.get_context('spawn')
+        # Ignore SIGINT in the worker processes, so that only this process handles it
+        original_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+        try:
+            _recovery_executor = ProcessPoolExecutor(max_workers, mp_context=mp_context)
+            # Start the workers now rather than during the first import
+            list(_recovery_executor.map(int, range(max_workers)))
+        finally:
+            signal.signal(signal.SIGINT, original_handler)
+    return _recovery_executor
+
+
+def shutdown_recovery_executor() -> None:
+    global _recovery_executor
+
+    if _recovery_executor is not None:
+        _recovery_executor.shutdown(wait=True)
+        _recovery_executor = None
+
+
+def recover_block_senders(blocks: Iterable['BaseBlock'], executor: Executor = None) -> None:
+    """
+    Checks the signatures of the headers and send transactions of all of the blocks. They are checked in executor,
+    or in the pool from start_recovery_executor if it is None, when there are enough of them. Without a pool they
+    are checked here. The senders are saved on the headers and transactions with set_checked_sender, so that
+    check_signature_validity and get_sender don't recover them again during import. Anything with an invalid
+    signature is left alone, so that its own check raises the usual error.
+    """
+    signed_objects = []
+    messages = []
+    for block in blocks:
+        for signed_object in itertools.chain((block.header,), block.transactions):
+            if not hasattr(signed_object, 'set_checked_sender') or signed_object._sender is not None:
+                continue
+            message = signed_object.get_message_for_signing()
+            sender = signature_cache.get_sender(message, signed_object.v, signed_object.r, signed_object.s)
+            if sender is not None:
+                signed_object.set_checked_sender(sender)
+            else:
+                signed_objects.append(signed_object)
+                messages.append(message)
+
+    if len(signed_objects) == 0:
+        return
+
+    vs = [signed_object.v for signed_object in signed_objects]
+    rs = [signed_object.r for signed_object in signed_objects]
+    ss = [signed_object.s for signed_object in signed_objects]
+
+    if executor is None:
+        executor = _recovery_executor
+
+    if executor is None or len(signed_objects) < MIN_SIGNATURES_FOR_PROCESS_POOL:
+        senders = list(map(recover_signature_sender, messages, vs, rs, ss))
+    else:
+        chunksize = max(1, len(signed_objects) // (DEFAULT_MAX_WORKERS * 4))
+        senders = list(executor.map(recover_signature_sender, messages, vs, rs, ss, chunksize=chunksize))
+
+    for signed_object, message, sender in zip(signed_objects, messages, senders):
+        if sender is not None:
+            signature_cache.set_sender(message, signed_object.v, signed_object.r, signed_object.s, sender)
+            signed_object.set_checked_sender(sender)
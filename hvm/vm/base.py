@@ -37,7 +37,10 @@ from hvm.constants import (
     MAX_UNCLES,
     ZERO_HASH32,
     BLANK_REWARD_HASH)
-from hvm.db.trie import make_trie_root_and_nodes
+from hvm.db.trie import (
+    make_trie_root,
+    make_trie_root_and_nodes,
+)
 from hvm.db.chain import BaseChainDB  # noqa: F401
 from hvm.exceptions import (
     HeaderNotFound,
@@ -677,6 +680,8 @@ class VM(BaseVM):
                                   "The timestamp of this VM is {}, and the timestamp of the block being imported is {}".format(self.header.timestamp, block.header.timestamp))
 
 
+        imported_header = block.header
+
         if isinstance(block, self.get_queue_block_class()):
             is_queue_block = True
             head_block = self.queue_block
@@ -778,6 +783,9 @@ class VM(BaseVM):
             block = self.pack_block(block, **kwargs)
             self.logger.debug("signing block")
             block = block.as_complete_block(private_key, self.network_id)
+        else:
+            # Don't check the signature again if it is unchanged from the block being imported
+            block.header.copy_checked_sender_from(imported_header)
             
         # Delete all receivable transactions that have been received in this block
         # Moved this from within the computation executor because it can revert memory on error, which will put the transactions back even though they were received already.
@@ -1166,13 +1174,13 @@ class VM(BaseVM):
                     )
                 )
 
-        tx_root_hash, _ = make_trie_root_and_nodes(block.transactions)
+        tx_root_hash = make_trie_root(block.transactions)
         if tx_root_hash != block.header.transaction_root:
             raise ValidationError(
                 "Block's transaction_root ({0}) does not match expected value: {1}".format(
                     block.header.transaction_root, tx_root_hash))
             
-        re_tx_root_hash, _ = make_trie_root_and_nodes(block.receive_transactions)
+        re_tx_root_hash = make_trie_root(block.receive_transactions)
         if re_tx_root_hash != block.header.receive_transaction_root:
             raise ValidationError(
                 "Block's receive transaction_root ({0}) does not match expected value: {1}".format(
@@ -1,9 +1,10 @@
+from collections import OrderedDict
 import contextlib
-import io
 import logging
+from threading import Lock
 from typing import (  # noqa: F401
+    Dict,
     Iterator,
-    Set
 )
 
 from hvm.validation import (
@@ -12,54 +13,158 @@ from hvm.validation import (
 from hvm.vm import opcode_values
 
 
+class CodeAnalysis(object):
+    """
+    Everything about a piece of bytecode that can be worked out before running it.
+
+    - ``valid_positions``: one byte per position in the code, 1 if an instruction starts there and
+      0 if it is inside the data of a PUSH.
+    - ``push_values``: position -> the value pushed by the PUSH instruction whose data starts there,
+      as an int. Only positions that start PUSH data are included.
+    """
+    __slots__ = ['valid_positions', 'push_values']
+
+    def __init__(self, code_bytes: bytes) -> None:
+        code_length = len(code_bytes)
+        valid_positions = bytearray(code_length)
+        push_values = {}  # type: Dict[int, int]
+
+        i = 0
+        while i < code_length:
+            valid_positions[i] = 1
+            opcode = code_bytes[i]
+            i += 1
+            if opcode_values.PUSH1 <= opcode <= opcode_values.PUSH32:
+                size = opcode - opcode_values.PUSH1 + 1
+                # Missing bytes at the end of the code are read as zeros
+                push_values[i] = int.from_bytes(code_bytes[i:i + size].ljust(size, b'\x00'), 'big')
+                i += size
+
+        self.valid_positions = bytes(valid_positions)
+        self.push_values = push_values
+
+
+# The total length of the bytecode whose analysis is kept. An analysis takes memory in proportion to the
+# length of its code, so this bounds the memory used by the cache no matter how large the contracts are.
+MAX_CODE_ANALYSIS_CACHE_BYTES = 4 * 1024 * 1024
+
+
+class CodeAnalysisCache(object):
+    """
+    Keeps the analysis of the most recently used bytecode, up to ``max_code_bytes`` of code in total.
+    Contracts are usually called many times, so the analysis is kept per distinct bytecode.
+    """
+    def __init__(self, max_code_bytes: int) -> None:
+        self.max_code_bytes = max_code_bytes
+        self._analyses = OrderedDict()  # type: OrderedDict[bytes, CodeAnalysis]
+        self._code_bytes = 0
+        # Blocks are imported from many threads in the chain process
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._analyses)
+
+    @property
+    def code_bytes(self) -> int:
+        return self._code_bytes
+
+    def get(self, code_bytes: bytes) -> CodeAnalysis:
+        with self._lock:
+            analysis = self._analyses.get(code_bytes)
+            if analysis is not None:
+                self._analyses.move_to_end(code_bytes)
+                return analysis
+
+        analysis = CodeAnalysis(code_bytes)
+        if len(code_bytes) > self.max_code_bytes:
+            return analysis
+
+        with self._lock:
+            if code_bytes not in self._analyses:
+                self._analyses[code_bytes] = analysis
+                self._code_bytes += len(code_bytes)
+                while self._code_bytes > self.max_code_bytes:
+                    evicted_code, _ = self._analyses.popitem(last=False)
+                    self._code_bytes -= len(evicted_code)
+        return analysis
+
+    def clear(self) -> None:
+        with self._lock:
+            self._analyses.clear()
+            self._code_bytes = 0
+
+
+_code_analysis_cache = CodeAnalysisCache(MAX_CODE_ANALYSIS_CACHE_BYTES)
+
+
+def get_code_analysis(code_bytes: bytes) -> CodeAnalysis:
+    return _code_analysis_cache.get(code_bytes)
+
+
 class CodeStream(object):
-    stream = None
-    depth_processed = None
+    __slots__ = ['_code', '_length', '_pc', '_analysis']
 
     logger = logging.getLogger('hvm.vm.CodeStream')
 
     def __init__(self, code_bytes: bytes) -> None:
         validate_is_bytes(code_bytes, title="CodeStream bytes")
-        self.stream = io.BytesIO(code_bytes)
-        self.invalid_positions = set()  # type: Set[int]
-        self.depth_processed = 0
+        self._code = code_bytes
+        self._length = len(code_bytes)
+        self._pc = 0
+        self._analysis = None  # type: CodeAnalysis
 
     def read(self, size: int) -> bytes:
-        return self.stream.read(size)
+        pc = self._pc
+        self._pc = min(pc + size, self._length)
+        return self._code[pc:pc + size]
+
+    def read_push_value(self, size: int) -> int:
+        """
+        Reads the data of the PUSH instruction that was just read, and returns it as an int.
+        """
+        value = self.analysis.push_values.get(self._pc)
+        if value is None:
+            # Not at the data of a PUSH. Decode it the slow way.
+            value = int.from_bytes(self.read(size).ljust(size, b'\x00'), 'big')
+        else:
+            self._pc = min(self._pc + size, self._length)
+        return value
 
     def __len__(self) -> int:
-        return len(self.stream.getvalue())
+        return self._length
 
     def __iter__(self) -> 'CodeStream':
         return self
 
     def __next__(self) -> int:
-        return self.next()
+        # This is called for every instruction, so it doesn't call next().
+        pc = self._pc
+        if pc < self._length:
+            self._pc = pc + 1
+            return self._code[pc]
+        else:
+            return opcode_values.STOP
 
     def __getitem__(self, i: int) -> int:
-        return self.stream.getvalue()[i]
+        return self._code[i]
 
     def next(self) -> int:
-        next_opcode_as_byte = self.read(1)
+        return self.__next__()
 
-        if next_opcode_as_byte:
-            return ord(next_opcode_as_byte)
+    def peek(self) -> int:
+        pc = self._pc
+        if pc < self._length:
+            return self._code[pc]
         else:
             return opcode_values.STOP
 
-    def peek(self) -> int:
-        current_pc = self.pc
-        next_opcode = next(self)
-        self.pc = current_pc
-        return next_opcode
-
     @property
     def pc(self):
-        return self.stream.tell()
+        return self._pc
 
     @pc.setter
     def pc(self, value):
-        self.stream.seek(min(value, len(self)))
+        self._pc = min(value, self._length)
 
     @contextlib.contextmanager
     def seek(self, pc: int) -> Iterator['CodeStream']:
@@ -70,30 +175,13 @@ class CodeStream(object):
         finally:
             self.pc = anchor_pc
 
-    invalid_positions = None
+    @property
+    def analysis(self) -> CodeAnalysis:
+        if self._analysis is None:
+            self._analysis = get_code_analysis(self._code)
+        return self._analysis
 
     def is_valid_opcode(self, position: int) -> bool:
-        if position >= len(self):
-            return False
-        if position in self.invalid_positions:
+        if position >= self._length:
             return False
-        if position <= self.depth_processed:
-            return True
-        else:
-            i = self.depth_processed
-            while i <= position:
-                opcode = self.__getitem__(i)
-                if opcode >= opcode_values.PUSH1 and opcode <= opcode_values.PUSH32:
-                    left_bound = (i + 1)
-                    right_bound = left_bound + (opcode - 95)
-                    invalid_range = range(left_bound, right_bound)
-                    self.invalid_positions.update(invalid_range)
-                    i = right_bound
-                else:
-                    self.depth_processed = i
-                    i += 1
-
-            if position in self.invalid_positions:
-                return False
-            else:
-                return True
+        return self.analysis.valid_positions[position] == 1
@@ -12,6 +12,8 @@ from typing import (  # noqa: F401
     Iterator,
     List,
     Tuple,
+    Type,
+    Union,
 )
 
 from eth_typing import (
@@ -36,7 +38,8 @@ from hvm.utils.numeric import (
     ceil32,
 )
 from hvm.utils.logging import (
-    TraceLogger
+    TRACE_LEVEL_NUM,
+    TraceLogger,
 )
 from hvm.validation import (
     validate_canonical_address,
@@ -62,6 +65,7 @@ from hvm.vm.opcode import (  # noqa: F401
     Opcode
 )
 from hvm.vm.stack import (
+    IntStack,
     Stack,
 )
 from hvm.vm.state import (
@@ -94,12 +98,15 @@ class BaseComputation(Configurable, metaclass=ABCMeta):
 
         ``_precompiles``: A mapping of contract address to the precompile function for execution
         of precompiled contracts.
+
+        ``stack_class``: The stack implementation. Defaults to :class:`~hvm.vm.stack.Stack`.
     """
     state: BaseState = None
     msg: Message = None
     transaction_context: BaseTransactionContext = None
 
     _memory = None
+    _memory_gas_cost = 0
     _stack = None
     _gas_meter = None
 
@@ -117,6 +124,7 @@ class BaseComputation(Configurable, metaclass=ABCMeta):
     # VM configuration
     opcodes = None  # type: Dict[int, Opcode]
     _precompiles = None  # type: Dict[bytes, Callable[['BaseComputation'], Any]]
+    stack_class = Stack  # type: Type[Union[Stack, IntStack]]
 
     logger = cast(TraceLogger, logging.getLogger('hvm.vm.computation.Computation'))
 
@@ -130,7 +138,7 @@ class BaseComputation(Configurable, metaclass=ABCMeta):
         self.transaction_context = transaction_context
 
         self._memory = Memory()
-        self._stack = Stack()
+        self._stack = self.stack_class()
         self._gas_meter = GasMeter(message.gas)
 
         self.children = []
@@ -223,10 +231,16 @@ class BaseComputation(Configurable, metaclass=ABCMeta):
         validate_uint256(start_position, title="Memory start position")
         validate_uint256(size, title="Memory size")
 
-        before_size = ceil32(len(self._memory))
+        if not size:
+            return
+
+        before_size = len(self._memory)
         after_size = ceil32(start_position + size)
+        if after_size <= before_size:
+            return
 
-        before_cost = memory_gas_cost(before_size)
+        # memory only grows, so the cost of the current size is whatever was charged last
+        before_cost = self._memory_gas_cost
         after_cost = memory_gas_cost(after_size)
 
         self.logger.debug(
@@ -237,20 +251,20 @@ class BaseComputation(Configurable, metaclass=ABCMeta):
             after_cost,
         )
 
-        if size:
-            if before_cost < after_cost:
-                gas_fee = after_cost - before_cost
-                self._gas_meter.consume_gas(
-                    gas_fee,
-                    reason=" ".join((
-                        "Expanding memory",
-                        str(before_size),
-                        "->",
-                        str(after_size),
-                    ))
-                )
+        if before_cost < after_cost:
+            gas_fee = after_cost - before_cost
+            self._gas_meter.consume_gas(
+                gas_fee,
+                reason=" ".join((
+                    "Expanding memory",
+                    str(before_size),
+                    "->",
+                    str(after_size),
+                ))
+            )
 
-            self._memory.extend(start_position, size)
+        self._memory.extend(start_position, size)
+        self._memory_gas_cost = after_cost
 
     def memory_write(self, start_position: int, size: int, value: bytes) -> None:
         """
@@ -264,6 +278,13 @@ class BaseComputation(Configurable, metaclass=ABCMeta):
         """
         return self._memory.read(start_position, size)
 
+    def memory_read_view(self, start_position: int, size: int) -> memoryview:
+        """
+        Return a view of ``size`` bytes of memory starting at ``start_position``, without
+        copying them. The view must be released before memory is extended again.
+        """
+        return self._memory.read_view(start_position, size)
+
     def consume_gas(self, amount: int, reason: str) -> None:
         """
         Consume ``amount`` of gas from the remaining gas.
@@ -538,20 +559,30 @@ class BaseComputation(Configurable, metaclass=ABCMeta):
                 computation.precompiles[message.code_address](computation)
                 return computation
 
-            for opcode in computation.code:
-                opcode_fn = computation.get_opcode_fn(opcode)
+            opcode_fns = computation.get_opcode_fn_table()
+            code = computation.code
 
-                computation.logger.trace(
-                    "OPCODE: 0x%x (%s) | pc: %s",
-                    opcode,
-                    opcode_fn.mnemonic,
-                    max(0, computation.code.pc - 1),
-                )
+            if computation.logger.isEnabledFor(TRACE_LEVEL_NUM):
+                for opcode in code:
+                    opcode_fn = opcode_fns[opcode]
+
+                    computation.logger.trace(
+                        "OPCODE: 0x%x (%s) | pc: %s",
+                        opcode,
+                        opcode_fn.mnemonic,
+                        max(0, code.pc - 1),
+                    )
 
+                    try:
+                        opcode_fn(computation)
+                    except Halt:
+                        break
+            else:
                 try:
-                    opcode_fn(computation=computation)
+                    for opcode in code:
+                        opcode_fns[opcode](computation)
                 except Halt:
-                    break
+                    pass
         return computation
 
     #
@@ -569,3 +600,16 @@ class BaseComputation(Configurable, metaclass=ABCMeta):
             return self.opcodes[opcode]
         except KeyError:
             return InvalidOpcode(opcode)
+
+    @classmethod
+    def get_opcode_fn_table(cls) -> Tuple[Opcode, ...]:
+        """
+        Return a tuple with the opcode function for each of the 256 possible opcodes. It is built once
+        per computation class, so that the interpreter loop can index it instead of looking up a dict.
+        """
+        if '_opcode_fn_table' not in cls.__dict__:
+            cls._opcode_fn_table = tuple(
+                cls.opcodes[opcode] if opcode in cls.opcodes else InvalidOpcode(opcode)
+                for opcode in range(256)
+            )
+        return cls._opcode_fn_table
@@ -2,6 +2,8 @@
 from hvm.vm.forks.helios_testnet import HeliosTestnetComputation
 from hvm.vm.forks.helios_testnet.computation import HELIOS_TESTNET_PRECOMPILES
 
+from hvm.vm.stack import IntStack
+
 from .opcodes import BOSON_OPCODES
 
 
@@ -15,5 +17,6 @@ class BosonComputation(HeliosTestnetComputation):
     # Override
     opcodes = BOSON_OPCODES
     _precompiles = BOSON_PRECOMPILES
+    stack_class = IntStack
     
 
@@ -1,4 +1,4 @@
-from eth_typing import Hash32
+from eth_typing import Address, Hash32
 
 import rlp_cython as rlp
 
@@ -48,8 +48,6 @@ from hvm.rlp.sedes import (
     address,
     hash32,
 )
-import functools
-
 
 
 class HeliosTestnetTransaction(BaseTransaction):
@@ -58,19 +56,17 @@ class HeliosTestnetTransaction(BaseTransaction):
     _sender = None
     _valid_transaction = None
 
-    @functools.lru_cache(maxsize=128)
     def get_message_for_signing(self, chain_id: int = None) -> bytes:
         if chain_id is None:
             chain_id = self.chain_id
 
-        transaction_parts = rlp.decode(rlp.encode(self), use_list=True)
+        transaction_parts = rlp.decode(self.encoded, use_list=True)
 
         transaction_parts_for_signature = transaction_parts[:-3] + [int_to_big_endian(chain_id), b'', b'']
 
         message = rlp.encode(transaction_parts_for_signature)
         return message
 
-    @functools.lru_cache(maxsize=128)
     def check_signature_validity(self):
         if self._cache:
             if self._valid_transaction is not None:
@@ -84,7 +80,6 @@ class HeliosTestnetTransaction(BaseTransaction):
         else:
             validate_transaction_signature(self)
 
-    @functools.lru_cache(maxsize=128)
     def get_sender(self):
         if self._cache:
             if self._sender is not None:
@@ -97,6 +92,14 @@ class HeliosTestnetTransaction(BaseTransaction):
         else:
             return extract_transaction_sender(self)
 
+    def set_checked_sender(self, sender: Address) -> None:
+        """
+        Saves the sender of a signature that has already been checked, so that it isn't recovered again.
+        """
+        if self._cache:
+            self._sender = sender
+            self._valid_transaction = True
+
     def get_intrinsic_gas(self):
         return _get_helios_testnet_intrinsic_gas(self)
     
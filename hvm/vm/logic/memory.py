@@ -30,8 +30,8 @@ def mload(computation):
 
     computation.extend_memory(start_position, 32)
 
-    value = computation.memory_read(start_position, 32)
-    computation.stack_push(value)
+    with computation.memory_read_view(start_position, 32) as value:
+        computation.stack_push(int.from_bytes(value, 'big'))
 
 
 def msize(computation):
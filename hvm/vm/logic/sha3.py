@@ -11,12 +11,12 @@ def sha3(computation):
 
     computation.extend_memory(start_position, size)
 
-    sha3_bytes = computation.memory_read(start_position, size)
-    word_count = ceil32(len(sha3_bytes)) // 32
+    word_count = ceil32(size) // 32
 
     gas_cost = constants.GAS_SHA3WORD * word_count
     computation.consume_gas(gas_cost, reason="SHA3: word gas cost")
 
-    result = keccak(sha3_bytes)
+    # eth_hash only hashes bytes and bytearray, so this is the one copy that's needed
+    result = keccak(computation.memory_read(start_position, size))
 
     computation.stack_push(result)
@@ -8,13 +8,8 @@ def pop(computation):
 
 
 def push_XX(computation, size):
-    raw_value = computation.code.read(size)
-
-    if not raw_value.strip(b'\x00'):
-        computation.stack_push(0)
-    else:
-        padded_value = raw_value.ljust(size, b'\x00')
-        computation.stack_push(padded_value)
+    # The value is decoded once per contract by the code analysis, see hvm.vm.code_stream
+    computation.stack_push(computation.code.read_push_value(size))
 
 
 push1 = functools.partial(push_XX, size=1)
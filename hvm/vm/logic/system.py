@@ -25,8 +25,7 @@ def return_op(computation):
 
     computation.extend_memory(start_position, size)
 
-    output = computation.memory_read(start_position, size)
-    computation.output = bytes(output)
+    computation.output = computation.memory_read(start_position, size)
     raise Halt('RETURN')
 
 
@@ -35,8 +34,7 @@ def revert(computation):
 
     computation.extend_memory(start_position, size)
 
-    output = computation.memory_read(start_position, size)
-    computation.output = bytes(output)
+    computation.output = computation.memory_read(start_position, size)
     raise Revert(computation.output)
 
 
@@ -1,4 +1,3 @@
-import itertools
 import logging
 
 from hvm.validation import (
@@ -16,26 +15,34 @@ from hvm.utils.numeric import (
 class Memory(object):
     """
     VM Memory
+
+    The underlying buffer grows geometrically and is always zero filled past the end of the
+    memory, so ``len(memory)`` is tracked separately from the size of the buffer.
     """
-    __slots__ = ['_bytes']
+    __slots__ = ['_bytes', '_size']
     logger = logging.getLogger('hvm.vm.memory.Memory')
 
     def __init__(self):
         self._bytes = bytearray()
+        self._size = 0
 
     def extend(self, start_position: int, size: int) -> None:
         if size == 0:
             return
 
         new_size = ceil32(start_position + size)
-        if new_size <= len(self):
+        if new_size <= self._size:
             return
 
-        size_to_extend = new_size - len(self)
-        self._bytes.extend(itertools.repeat(0, size_to_extend))
+        capacity = len(self._bytes)
+        if new_size > capacity:
+            new_capacity = max(new_size, capacity * 2)
+            self._bytes.extend(bytes(new_capacity - capacity))
+
+        self._size = new_size
 
     def __len__(self) -> int:
-        return len(self._bytes)
+        return self._size
 
     def write(self, start_position: int, size: int, value: bytes) -> None:
         """
@@ -48,17 +55,22 @@ class Memory(object):
             validate_length(value, length=size)
             validate_lte(start_position + size, maximum=len(self))
 
-            if len(self._bytes) < start_position + size:
-                self._bytes.extend(itertools.repeat(
-                    0,
-                    len(self._bytes) - (start_position + size),
-                ))
-
-            for idx, v in enumerate(value):
-                self._bytes[start_position + idx] = v
+            self._bytes[start_position:start_position + size] = value
 
     def read(self, start_position: int, size: int) -> bytes:
         """
         Read a value from memory.
         """
-        return bytes(self._bytes[start_position:start_position + size])
+        return bytes(self.read_view(start_position, size))
+
+    def read_view(self, start_position: int, size: int) -> memoryview:
+        """
+        Return a view of memory, without copying it. The view must not be written to.
+
+        The memory can't grow while a view of it exists, so the view must be released before
+        the next call to :meth:`extend`.
+        """
+        # reads past the end of the memory are clamped, the same as slicing a bytearray.
+        end_position = min(start_position + size, self._size)
+        start_position = min(start_position, end_position)
+        return memoryview(self._bytes)[start_position:end_position]
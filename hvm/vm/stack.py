@@ -4,6 +4,7 @@ from hvm import constants
 from hvm.exceptions import (
     InsufficientStack,
     FullStack,
+    ValidationError,
 )
 from hvm.validation import (
     validate_stack_item,
@@ -102,3 +103,101 @@ class Stack(object):
             self.push(self.values[idx])
         except IndexError:
             raise InsufficientStack("Insufficient stack items for DUP{0}".format(position))
+
+
+class IntStack(object):
+    """
+    VM Stack that only stores ints.
+
+    Bytes are converted to ints when they are pushed, and back to bytes only when an opcode
+    pops them with the ``bytes`` type hint. Most opcodes work on ints, so this avoids the
+    conversions and type checks that :class:`Stack` does on every push and pop.
+
+    Every opcode that pops bytes pads them to the length it needs, so it makes no difference
+    to them that leading zeros are not kept.
+    """
+    __slots__ = ['values']
+    logger = logging.getLogger('hvm.vm.stack.IntStack')
+
+    def __init__(self):
+        self.values = []  # type: List[int]
+
+    def __len__(self):
+        return len(self.values)
+
+    def push(self, value):
+        """
+        Push an item onto the stack.
+        """
+        if len(self.values) > 1023:
+            raise FullStack('Stack limit reached')
+
+        if value.__class__ is int:
+            if value < 0 or value > constants.UINT_256_MAX:
+                raise ValidationError(
+                    "Invalid Stack Item: Must be a 256 bit integer. Got {0}".format(value)
+                )
+        else:
+            validate_stack_item(value)
+            if isinstance(value, bytes):
+                value = big_endian_to_int(value)
+            else:
+                # int subclasses, like bool
+                value = int(value)
+
+        self.values.append(value)
+
+    def pop(self, num_items, type_hint):
+        """
+        Pop an item off the stack.
+
+        Note: This function is optimized for speed over readability.
+        """
+        values = self.values
+        if len(values) < num_items:
+            raise InsufficientStack("No stack items")
+
+        if type_hint != constants.UINT256 and type_hint != constants.ANY and type_hint != constants.BYTES:
+            raise TypeError(
+                "Unknown type_hint: {0}.  Must be one of {1}".format(
+                    type_hint,
+                    ", ".join((constants.UINT256, constants.BYTES)),
+                )
+            )
+
+        if num_items == 1:
+            value = values.pop()
+            if type_hint == constants.BYTES:
+                return int_to_big_endian(value)
+            else:
+                return value
+        else:
+            # The first item is the one that was on top of the stack
+            popped = tuple(reversed(values[-num_items:]))
+            del values[-num_items:]
+            if type_hint == constants.BYTES:
+                return tuple(int_to_big_endian(value) for value in popped)
+            else:
+                return popped
+
+    def swap(self, position):
+        """
+        Perform a SWAP operation on the stack.
+        """
+        idx = -1 * position - 1
+        try:
+            self.values[-1], self.values[idx] = self.values[idx], self.values[-1]
+        except IndexError:
+            raise InsufficientStack("Insufficient stack items for SWAP{0}".format(position))
+
+    def dup(self, position):
+        """
+        Perform a DUP operation on the stack.
+        """
+        values = self.values
+        if len(values) > 1023:
+            raise FullStack('Stack limit reached')
+        try:
+            values.append(values[-1 * position])
+        except IndexError:
+            raise InsufficientStack("Insufficient stack items for DUP{0}".format(position))
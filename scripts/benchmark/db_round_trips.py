@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Counts the number of calls made to the database while building and importing blocks.
+
+When the node is running, the database lives in its own process and every one of these calls
+is a round trip over the database manager's socket. This script wraps an in-memory db with a
+counter instead of starting a database process so that it can be run anywhere.
+
+Usage:
+
+    python scripts/benchmark/db_round_trips.py --blocks 20
+
+Pass ``--unbatched`` to count every key written by the multi-key API as its own round trip,
+which is how the database was used before the multi-key API existed.
+"""
+import argparse
+import logging
+import time
+from typing import (
+    Iterable,
+    Tuple,
+)
+
+from hvm.db.backends.base import BaseDB
+from hvm.db.backends.memory import MemoryDB
+from hvm.db.diff import DBDiff
+
+from helios.dev_tools import create_dev_test_random_blockchain_database
+
+
+class RoundTripCountingDB(BaseDB):
+    """
+    Counts one round trip for every call that would cross the process boundary if this db
+    were accessed through a :class:`helios.db.base.DBProxy`.
+    """
+    def __init__(self, batched: bool = True) -> None:
+        self.wrapped_db = MemoryDB()
+        self.batched = batched
+        self.round_trips = 0
+
+    def __getitem__(self, key: bytes) -> bytes:
+        self.round_trips += 1
+        return self.wrapped_db[key]
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        self.round_trips += 1
+        self.wrapped_db[key] = value
+
+    def __delitem__(self, key: bytes) -> None:
+        self.round_trips += 1
+        del self.wrapped_db[key]
+
+    def _exists(self, key: bytes) -> bool:
+        self.round_trips += 1
+        return key in self.wrapped_db
+
+    def get_many(self, keys: Iterable[bytes]) -> Tuple[bytes, ...]:
+        if not self.batched:
+            return super().get_many(keys)
+        self.round_trips += 1
+        return self.wrapped_db.get_many(keys)
+
+    def exists_many(self, keys: Iterable[bytes]) -> Tuple[bool, ...]:
+        if not self.batched:
+            return super().exists_many(keys)
+        self.round_trips += 1
+        return self.wrapped_db.exists_many(keys)
+
+    def set_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        if not self.batched:
+            return super().set_many(items)
+        self.round_trips += 1
+        self.wrapped_db.set_many(items)
+
+    def delete_many(self, keys: Iterable[bytes]) -> None:
+        if not self.batched:
+            return super().delete_many(keys)
+        self.round_trips += 1
+        self.wrapped_db.delete_many(keys)
+
+    def apply_diff(self, diff: DBDiff, apply_deletes: bool = True) -> None:
+        if not self.batched:
+            return super().apply_diff(diff, apply_deletes)
+        self.round_trips += 1
+        self.wrapped_db.apply_diff(diff, apply_deletes)
+
+
+def run(num_blocks: int, batched: bool) -> None:
+    db = RoundTripCountingDB(batched=batched)
+
+    start = time.perf_counter()
+    create_dev_test_random_blockchain_database(db, num_iterations=num_blocks)
+    duration = time.perf_counter() - start
+
+    # every iteration creates a send block and a receive block
+    num_imported = num_blocks * 2
+    print("batched: {}".format(batched))
+    print("imported blocks: {}".format(num_imported))
+    print("db round trips: {}".format(db.round_trips))
+    print("db round trips per block: {:.1f}".format(db.round_trips / num_imported))
+    print("duration: {:.2f}s".format(duration))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--blocks', type=int, default=10, help="number of send/receive iterations")
+    parser.add_argument(
+        '--unbatched',
+        action='store_true',
+        help="count each key written through the multi-key API as a separate round trip",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    run(args.blocks, batched=not args.unbatched)
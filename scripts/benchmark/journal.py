@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Times reads, commits and discards on a JournalDB with nested changesets, like the ones opened by nested calls.
+
+Usage:
+
+    python scripts/benchmark/journal.py --keys 100 --reads 10000 --rounds 3
+"""
+import argparse
+import logging
+import time
+from typing import List, Tuple
+
+from hvm.db.backends.memory import MemoryDB
+from hvm.db.journal import JournalDB
+
+DEPTHS = (1, 4, 16, 64, 256)
+
+
+def make_nested_journal(depth: int, num_keys: int) -> Tuple[JournalDB, List]:
+    """
+    Returns a JournalDB with depth changesets open on top of the root changeset. Every changeset
+    writes to all of the keys, and the returned changesets are ordered from outermost to innermost.
+    """
+    journal_db = JournalDB(MemoryDB())
+    keys = [index.to_bytes(32, 'big') for index in range(num_keys)]
+    changesets = []
+    for level in range(depth):
+        changesets.append(journal_db.record())
+        for key in keys:
+            journal_db[key] = level.to_bytes(4, 'big')
+    return journal_db, changesets
+
+
+def time_depth(depth: int, num_keys: int, num_reads: int) -> Tuple[float, float, float]:
+    keys = [index.to_bytes(32, 'big') for index in range(num_keys)]
+
+    journal_db, changesets = make_nested_journal(depth, num_keys)
+    start = time.perf_counter()
+    for index in range(num_reads):
+        journal_db[keys[index % num_keys]]
+    read_time = time.perf_counter() - start
+
+    # commit from the innermost changeset out, like returning from nested calls
+    start = time.perf_counter()
+    for changeset in reversed(changesets):
+        journal_db.commit(changeset)
+    commit_time = time.perf_counter() - start
+
+    journal_db, changesets = make_nested_journal(depth, num_keys)
+    start = time.perf_counter()
+    for changeset in reversed(changesets):
+        journal_db.discard(changeset)
+    discard_time = time.perf_counter() - start
+
+    return read_time, commit_time, discard_time
+
+
+def run(num_keys: int, num_reads: int, rounds: int) -> None:
+    print("{} keys written per changeset, {} reads (best of {})".format(num_keys, num_reads, rounds))
+    print("{:>6} {:>10} {:>10} {:>10}".format("depth", "reads", "commits", "discards"))
+    for depth in DEPTHS:
+        best_read = best_commit = best_discard = float('inf')
+        for _ in range(rounds):
+            read_time, commit_time, discard_time = time_depth(depth, num_keys, num_reads)
+            best_read = min(best_read, read_time)
+            best_commit = min(best_commit, commit_time)
+            best_discard = min(best_discard, discard_time)
+        print("{:>6} {:>9.4f}s {:>9.4f}s {:>9.4f}s".format(depth, best_read, best_commit, best_discard))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--keys', type=int, default=100, help="number of keys written in each changeset")
+    parser.add_argument('--reads', type=int, default=10000, help="number of reads at each depth")
+    parser.add_argument('--rounds', type=int, default=3, help="number of times to time each depth")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    run(args.keys, args.reads, args.rounds)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Times recovering the header and transaction senders of a synthetic chain segment, one at a time and with
+:func:`hvm.utils.signatures.recover_block_senders` using a process pool.
+
+Usage:
+
+    python scripts/benchmark/signatures.py --blocks 1000 --transactions 2 --workers 4
+"""
+import argparse
+import logging
+import time
+from typing import List
+
+from eth_keys import keys
+import rlp_cython as rlp
+
+from hvm.constants import ZERO_HASH32
+from hvm.rlp.headers import BlockHeader
+from hvm.utils.signatures import (
+    recover_block_senders,
+    shutdown_recovery_executor,
+    start_recovery_executor,
+)
+from hvm.vm.forks.helios_testnet.blocks import HeliosTestnetBlock
+from hvm.vm.forks.helios_testnet.transactions import HeliosTestnetTransaction
+
+CHAIN_ID = 1
+
+
+def make_segment(num_blocks: int, transactions_per_block: int) -> List[bytes]:
+    """
+    Returns num_blocks signed blocks on one chain, each with transactions_per_block signed send transactions,
+    rlp encoded so that every run decodes fresh objects without saved senders.
+    """
+    private_key = keys.PrivateKey(b'\x01' * 32)
+    chain_address = private_key.public_key.to_canonical_address()
+
+    encoded_blocks = []
+    parent_hash = ZERO_HASH32
+    for block_number in range(num_blocks):
+        transactions = [
+            HeliosTestnetTransaction(
+                nonce=block_number * transactions_per_block + index,
+                gas_price=1,
+                gas=21000,
+                to=b'\x02' * 20,
+                value=1,
+                data=b'',
+                v=0,
+                r=0,
+                s=0,
+            ).get_signed(private_key, CHAIN_ID)
+            for index in range(transactions_per_block)
+        ]
+        header = BlockHeader(
+            block_number=block_number,
+            timestamp=1500000000 + block_number,
+            parent_hash=parent_hash,
+            chain_address=chain_address,
+        ).get_signed(private_key, CHAIN_ID)
+        block = HeliosTestnetBlock(header, transactions)
+        encoded_blocks.append(rlp.encode(block))
+        parent_hash = header.hash
+
+    return encoded_blocks
+
+
+def decode_segment(encoded_blocks: List[bytes]) -> List[HeliosTestnetBlock]:
+    return [rlp.decode(encoded_block, sedes=HeliosTestnetBlock) for encoded_block in encoded_blocks]
+
+
+def run(num_blocks: int, transactions_per_block: int, workers: int, rounds: int) -> None:
+    encoded_blocks = make_segment(num_blocks, transactions_per_block)
+    # Started once, like the chain process does, so that starting the workers isn't timed
+    executor = start_recovery_executor(workers)
+
+    best_serial = best_pool = float('inf')
+    for _ in range(rounds):
+        blocks = decode_segment(encoded_blocks)
+        start = time.perf_counter()
+        for block in blocks:
+            block.header.check_signature_validity()
+            for transaction in block.transactions:
+                transaction.check_signature_validity()
+        best_serial = min(best_serial, time.perf_counter() - start)
+
+        blocks = decode_segment(encoded_blocks)
+        start = time.perf_counter()
+        recover_block_senders(blocks, executor=executor)
+        for block in blocks:
+            block.header.check_signature_validity()
+            for transaction in block.transactions:
+                transaction.check_signature_validity()
+        best_pool = min(best_pool, time.perf_counter() - start)
+
+        assert all(block.header._sender is not None for block in blocks)
+
+    shutdown_recovery_executor()
+
+    num_signatures = num_blocks * (transactions_per_block + 1)
+    print("{} blocks, {} signatures (best of {})".format(num_blocks, num_signatures, rounds))
+    print("serial: {:.4f}s".format(best_serial))
+    print("{} workers: {:.4f}s".format(workers, best_pool))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--blocks', type=int, default=1000, help="number of blocks in the segment")
+    parser.add_argument('--transactions', type=int, default=2, help="number of send transactions per block")
+    parser.add_argument('--workers', type=int, default=4, help="number of processes to recover signatures with")
+    parser.add_argument('--rounds', type=int, default=3, help="number of times to time each approach")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    run(args.blocks, args.transactions, args.workers, args.rounds)
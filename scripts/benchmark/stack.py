@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Runs arithmetic heavy bytecode with each of the VM stack implementations and compares the time taken.
+
+Usage:
+
+    python scripts/benchmark/stack.py --iterations 10000 --rounds 5
+"""
+import argparse
+import logging
+import time
+
+from eth_utils import decode_hex
+
+from hvm.constants import ZERO_HASH32
+from hvm.db.atomic import AtomicDB
+from hvm.vm.message import Message
+from hvm.vm.stack import (
+    IntStack,
+    Stack,
+)
+
+from helios.dev_tools import import_genesis_block
+
+
+def make_loop_code(iterations: int) -> bytes:
+    """
+    A loop that increments a counter, squares it and takes the result mod 7, until the counter
+    reaches ``iterations``.
+    """
+    return decode_hex(
+        '6000'  # PUSH1 0x00 (counter)
+        '5b'  # JUMPDEST
+        '6001'  # PUSH1 0x01
+        '01'  # ADD
+        '80'  # DUP1
+        '80'  # DUP1
+        '02'  # MUL
+        '6007'  # PUSH1 0x07
+        '06'  # MOD
+        '50'  # POP
+        '80'  # DUP1
+        '61{:04x}'  # PUSH2 iterations
+        '11'  # GT
+        '6002'  # PUSH1 0x02
+        '57'  # JUMPI
+        '00'.format(iterations)  # STOP
+    )
+
+
+def run(iterations: int, rounds: int) -> None:
+    chain = import_genesis_block(AtomicDB())
+    state = chain.get_vm().state
+    address = chain.wallet_address
+
+    code = make_loop_code(iterations)
+    transaction_context = state.get_transaction_context_class()(
+        origin=address,
+        send_tx_hash=ZERO_HASH32,
+        caller_chain_address=address,
+        gas_price=1,
+    )
+
+    for stack_class in (Stack, IntStack):
+        computation_class = state.computation_class.configure(stack_class=stack_class)
+        best = float('inf')
+        for _ in range(rounds):
+            message = Message(
+                gas=10**8,
+                to=address,
+                sender=address,
+                value=0,
+                data=b'',
+                code=code,
+            )
+            start = time.perf_counter()
+            computation = computation_class.apply_computation(state, message, transaction_context)
+            best = min(best, time.perf_counter() - start)
+            if computation.is_error:
+                raise computation._error
+
+        print("{}: {:.4f}s for {} loop iterations (best of {})".format(
+            stack_class.__name__,
+            best,
+            iterations,
+            rounds,
+        ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--iterations', type=int, default=10000, help="loop iterations, at most 65535")
+    parser.add_argument('--rounds', type=int, default=5, help="number of times to run each stack")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    run(args.iterations, args.rounds)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Runs a contract that writes many storage slots, and times executing it and persisting the state.
+
+Usage:
+
+    python scripts/benchmark/storage.py --slots 500 --rounds 5
+"""
+import argparse
+import logging
+import time
+
+from eth_utils import decode_hex
+
+from hvm.constants import ZERO_HASH32
+from hvm.db.atomic import AtomicDB
+from hvm.vm.message import Message
+
+from helios.dev_tools import import_genesis_block
+
+
+def make_storage_code(num_slots: int) -> bytes:
+    """
+    A loop that sets storage slot i to i + 1, for every i below ``num_slots``.
+    """
+    return decode_hex(
+        '6000'  # PUSH1 0x00 (counter)
+        '5b'  # JUMPDEST
+        '80'  # DUP1
+        '6001'  # PUSH1 0x01
+        '01'  # ADD
+        '81'  # DUP2
+        '55'  # SSTORE
+        '6001'  # PUSH1 0x01
+        '01'  # ADD
+        '80'  # DUP1
+        '61{:04x}'  # PUSH2 num_slots
+        '11'  # GT
+        '6002'  # PUSH1 0x02
+        '57'  # JUMPI
+        '00'.format(num_slots)  # STOP
+    )
+
+
+def run(num_slots: int, rounds: int) -> None:
+    chain = import_genesis_block(AtomicDB())
+    address = chain.wallet_address
+    code = make_storage_code(num_slots)
+
+    best_execute = best_persist = float('inf')
+    for _ in range(rounds):
+        state = chain.get_vm().state
+        transaction_context = state.get_transaction_context_class()(
+            origin=address,
+            send_tx_hash=ZERO_HASH32,
+            caller_chain_address=address,
+            gas_price=1,
+        )
+        message = Message(
+            gas=10**9,
+            to=address,
+            sender=address,
+            value=0,
+            data=b'',
+            code=code,
+        )
+
+        start = time.perf_counter()
+        computation = state.computation_class.apply_computation(state, message, transaction_context)
+        executed = time.perf_counter()
+        if computation.is_error:
+            raise computation._error
+        state.account_db.persist()
+        persisted = time.perf_counter()
+
+        best_execute = min(best_execute, executed - start)
+        best_persist = min(best_persist, persisted - executed)
+
+        assert state.account_db.get_storage(address, num_slots - 1) == num_slots
+
+    print("{} storage writes (best of {})".format(num_slots, rounds))
+    print("execute: {:.4f}s".format(best_execute))
+    print("persist: {:.4f}s".format(best_persist))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--slots', type=int, default=500, help="number of slots to write, at most 65535")
+    parser.add_argument('--rounds', type=int, default=5, help="number of times to run the contract")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    run(args.slots, args.rounds)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Measures how many VMs are built while importing blocks, and how long repeated get_vm calls take,
+with and without the VM cache that :meth:`hvm.chains.base.Chain.get_vm` keeps during a block import.
+
+Usage:
+
+    python scripts/benchmark/vm_cache.py --blocks 10 --calls 1000
+"""
+import argparse
+import logging
+import time
+
+from hvm.db.atomic import AtomicDB
+from hvm.vm.base import VM
+
+from helios.dev_tools import (
+    create_dev_test_random_blockchain_database,
+    import_genesis_block,
+)
+
+
+class VMCounter:
+    """
+    Counts the number of VM instances that are created while it is installed.
+    """
+    def __init__(self) -> None:
+        self.count = 0
+        self._original_init = None
+
+    def __enter__(self) -> 'VMCounter':
+        counter = self
+        original_init = self._original_init = VM.__init__
+
+        def counting_init(vm, *args, **kwargs):  # type: ignore
+            counter.count += 1
+            original_init(vm, *args, **kwargs)
+
+        VM.__init__ = counting_init
+        return self
+
+    def __exit__(self, *exc_info) -> None:  # type: ignore
+        VM.__init__ = self._original_init
+
+
+def count_vms_per_import(num_blocks: int) -> None:
+    with VMCounter() as counter:
+        create_dev_test_random_blockchain_database(AtomicDB(), num_iterations=num_blocks)
+
+    # every iteration imports a send block and a receive block, each into a throwaway chain to complete
+    # it and then into the real chain.
+    num_imports = num_blocks * 4
+    print("block imports: {}".format(num_imports))
+    print("VMs built: {}".format(counter.count))
+    print("VMs built per import: {:.1f}".format(counter.count / num_imports))
+
+
+def time_get_vm(num_calls: int) -> None:
+    chain = import_genesis_block(AtomicDB())
+    timestamp = chain.header.timestamp
+
+    def run() -> float:
+        start = time.perf_counter()
+        for _ in range(num_calls):
+            # read the state like import_block does
+            chain.get_vm(timestamp=timestamp).state
+        return time.perf_counter() - start
+
+    uncached = run()
+    # import_block caches the VMs in the same way
+    with chain.cache_vms():
+        cached = run()
+    print("{} get_vm calls without cache: {:.4f}s".format(num_calls, uncached))
+    print("{} get_vm calls with cache:    {:.4f}s".format(num_calls, cached))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--blocks', type=int, default=10, help="number of send/receive iterations")
+    parser.add_argument('--calls', type=int, default=1000, help="number of get_vm calls to time")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    count_vms_per_import(args.blocks)
+    time_get_vm(args.calls)
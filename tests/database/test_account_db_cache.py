@@ -0,0 +1,148 @@
+import pytest
+
+from hvm.db.account import AccountDB
+from hvm.db.backends.memory import MemoryDB
+from hvm.db.schema import SchemaV1
+
+ADDRESS = b'\x01' * 20
+
+
+@pytest.fixture
+def base_db():
+    return MemoryDB()
+
+
+@pytest.fixture
+def account_db(base_db):
+    return AccountDB(base_db)
+
+
+def test_accounts_are_only_encoded_on_persist(base_db, account_db):
+    account_db.set_balance(ADDRESS, 10)
+    account_db.increment_nonce(ADDRESS)
+
+    assert SchemaV1.make_account_lookup_key(ADDRESS) not in account_db._journaldb
+    assert account_db.account_exists(ADDRESS)
+
+    account_db.persist()
+
+    assert SchemaV1.make_account_lookup_key(ADDRESS) in base_db
+    reloaded_db = AccountDB(base_db)
+    assert reloaded_db.get_balance(ADDRESS) == 10
+    assert reloaded_db.get_nonce(ADDRESS) == 1
+
+
+def test_discard_reverts_cached_accounts(account_db):
+    account_db.set_balance(ADDRESS, 10)
+
+    changeset = account_db.record()
+    account_db.set_balance(ADDRESS, 20)
+    assert account_db.get_balance(ADDRESS) == 20
+    account_db.discard(changeset)
+
+    assert account_db.get_balance(ADDRESS) == 10
+
+
+def test_commit_keeps_cached_accounts(account_db):
+    outer = account_db.record()
+    account_db.set_balance(ADDRESS, 10)
+
+    inner = account_db.record()
+    account_db.set_balance(ADDRESS, 20)
+    account_db.commit(inner)
+    assert account_db.get_balance(ADDRESS) == 20
+
+    account_db.discard(outer)
+    assert account_db.get_balance(ADDRESS) == 0
+
+
+def test_deleted_accounts_are_removed_on_persist(base_db, account_db):
+    account_db.set_balance(ADDRESS, 10)
+    account_db.persist()
+
+    account_db.delete_account(ADDRESS)
+    assert not account_db.account_exists(ADDRESS)
+    assert account_db.get_balance(ADDRESS) == 0
+
+    account_db.persist()
+    assert SchemaV1.make_account_lookup_key(ADDRESS) not in base_db
+
+
+def test_delete_missing_account(account_db):
+    with pytest.raises(KeyError):
+        account_db.delete_account(ADDRESS)
+
+
+def test_storage_writes_are_applied_on_persist(base_db, account_db):
+    account_db.set_storage(ADDRESS, 1, 10)
+    account_db.set_storage(ADDRESS, 2, 20)
+    account_db.set_storage(ADDRESS, 2, 0)
+
+    assert account_db.get_storage(ADDRESS, 1) == 10
+    assert account_db.get_storage(ADDRESS, 2) == 0
+    account_hash = account_db.get_account_hash(ADDRESS)
+
+    account_db.persist()
+
+    reloaded_db = AccountDB(base_db)
+    assert reloaded_db.get_storage(ADDRESS, 1) == 10
+    assert reloaded_db.get_storage(ADDRESS, 2) == 0
+    assert reloaded_db.get_account_hash(ADDRESS) == account_hash
+
+
+def test_discard_reverts_storage_writes(account_db):
+    account_db.set_storage(ADDRESS, 1, 10)
+
+    changeset = account_db.record()
+    account_db.set_storage(ADDRESS, 1, 20)
+    account_db.discard(changeset)
+
+    assert account_db.get_storage(ADDRESS, 1) == 10
+
+
+def test_delete_storage_hides_buffered_writes(account_db):
+    account_db.set_storage(ADDRESS, 1, 10)
+    account_db.persist()
+    account_db.set_storage(ADDRESS, 2, 20)
+
+    changeset = account_db.record()
+    account_db.delete_storage(ADDRESS)
+    assert account_db.get_storage(ADDRESS, 1) == 0
+    assert account_db.get_storage(ADDRESS, 2) == 0
+    account_db.set_storage(ADDRESS, 3, 30)
+    account_db.discard(changeset)
+
+    assert account_db.get_storage(ADDRESS, 1) == 10
+    assert account_db.get_storage(ADDRESS, 2) == 20
+    assert account_db.get_storage(ADDRESS, 3) == 0
+
+
+def test_account_hash_does_not_write_storage_trie_nodes(account_db):
+    account_db.set_storage(ADDRESS, 1, 10)
+
+    account_db.get_account_hash(ADDRESS)
+
+    assert account_db._journaldb.journal.merged_changesets() == {}
+
+
+def test_account_hash_follows_storage_writes(base_db, account_db):
+    account_db.set_storage(ADDRESS, 1, 10)
+    first_hash = account_db.get_account_hash(ADDRESS)
+    assert account_db.get_account_hash(ADDRESS) == first_hash
+
+    changeset = account_db.record()
+    account_db.set_storage(ADDRESS, 2, 20)
+    second_hash = account_db.get_account_hash(ADDRESS)
+    assert second_hash != first_hash
+
+    account_db.discard(changeset)
+    assert account_db.get_account_hash(ADDRESS) == first_hash
+
+    account_db.delete_storage(ADDRESS)
+    assert account_db.get_account_hash(ADDRESS) != first_hash
+
+    account_db.set_storage(ADDRESS, 1, 10)
+    assert account_db.get_account_hash(ADDRESS) == first_hash
+
+    account_db.persist()
+    assert AccountDB(base_db).get_account_hash(ADDRESS) == first_hash
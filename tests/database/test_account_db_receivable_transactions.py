@@ -0,0 +1,98 @@
+import pytest
+
+import rlp_cython as rlp
+
+from hvm.db.account import AccountDB
+from hvm.db.backends.memory import MemoryDB
+from hvm.db.schema import SchemaV1
+from hvm.exceptions import ReceivableTransactionNotFound
+from hvm.rlp.accounts import (
+    Account,
+    TransactionKey,
+)
+
+ADDRESS = b'\x01' * 20
+TX_KEYS = tuple(
+    TransactionKey(bytes([i]) * 32, bytes([i + 100]) * 32)
+    for i in range(1, 5)
+)
+
+
+@pytest.fixture
+def account_db():
+    return AccountDB(MemoryDB())
+
+
+def test_receivable_transactions_keep_insertion_order(account_db):
+    account_db.add_receivable_transactions(ADDRESS, TX_KEYS)
+
+    assert account_db.get_receivable_transactions(ADDRESS) == TX_KEYS
+    assert account_db.has_receivable_transactions(ADDRESS)
+    assert account_db.get_receivable_transaction(ADDRESS, TX_KEYS[2].transaction_hash) == TX_KEYS[2]
+
+
+def test_delete_receivable_transactions(account_db):
+    account_db.add_receivable_transactions(ADDRESS, TX_KEYS)
+
+    # middle, first, last, then the only one left
+    for index in (2, 0, 3, 1):
+        account_db.delete_receivable_transaction(ADDRESS, TX_KEYS[index].transaction_hash)
+        assert TX_KEYS[index] not in account_db.get_receivable_transactions(ADDRESS)
+
+    assert account_db.get_receivable_transactions(ADDRESS) == ()
+    assert not account_db.has_receivable_transactions(ADDRESS)
+
+    with pytest.raises(ReceivableTransactionNotFound):
+        account_db.delete_receivable_transaction(ADDRESS, TX_KEYS[0].transaction_hash)
+
+
+def test_add_duplicate_receivable_transaction(account_db):
+    account_db.add_receivable_transactions(ADDRESS, TX_KEYS[:1])
+    with pytest.raises(ValueError):
+        account_db.add_receivable_transactions(ADDRESS, TX_KEYS[:1])
+
+
+def test_receivable_transactions_are_not_stored_in_account(account_db):
+    account_db.set_balance(ADDRESS, 10)
+    account_hash = account_db.get_account_hash(ADDRESS)
+
+    account_db.add_receivable_transactions(ADDRESS, TX_KEYS)
+
+    assert account_db._get_account(ADDRESS).receivable_transactions == ()
+    assert account_db.get_account_hash(ADDRESS) == account_hash
+
+
+def test_receivable_transactions_in_old_accounts_are_migrated(account_db):
+    old_account = Account(balance=10, receivable_transactions=TX_KEYS[:2])
+    account_db._journaldb[SchemaV1.make_account_lookup_key(ADDRESS)] = rlp.encode(old_account, sedes=Account)
+
+    assert account_db.get_receivable_transactions(ADDRESS) == TX_KEYS[:2]
+
+    account_db.add_receivable_transaction(ADDRESS, TX_KEYS[2].transaction_hash, TX_KEYS[2].sender_block_hash)
+
+    assert account_db._get_account(ADDRESS).receivable_transactions == ()
+    assert account_db.get_receivable_transactions(ADDRESS) == TX_KEYS[:3]
+    assert account_db.get_balance(ADDRESS) == 10
+
+
+def test_revert_to_account_hash_restores_receivable_transactions(account_db):
+    account_db.add_receivable_transactions(ADDRESS, TX_KEYS[:2])
+    account_db.persist(save_account_hash=True, wallet_address=ADDRESS)
+    account_hash = account_db.get_account_hash(ADDRESS)
+
+    account_db.delete_receivable_transaction(ADDRESS, TX_KEYS[0].transaction_hash)
+    account_db.add_receivable_transactions(ADDRESS, TX_KEYS[2:])
+
+    account_db.revert_to_account_from_hash(account_hash, ADDRESS)
+    assert account_db.get_receivable_transactions(ADDRESS) == TX_KEYS[:2]
+
+
+def test_discard_restores_receivable_transactions(account_db):
+    account_db.add_receivable_transactions(ADDRESS, TX_KEYS[:2])
+
+    changeset = account_db.record()
+    account_db.delete_receivable_transaction(ADDRESS, TX_KEYS[1].transaction_hash)
+    account_db.add_receivable_transactions(ADDRESS, TX_KEYS[2:])
+    account_db.discard(changeset)
+
+    assert account_db.get_receivable_transactions(ADDRESS) == TX_KEYS[:2]
@@ -76,3 +76,37 @@ def test_database_api_missing_key_for_deletion(db):
 
     with pytest.raises(KeyError):
         del db[b'does-not-exist']
+
+
+def test_database_api_get_many(db):
+    db[b'key-1'] = b'value-1'
+    db[b'key-2'] = b'value-2'
+
+    assert db.get_many((b'key-1', b'missing', b'key-2')) == (b'value-1', None, b'value-2')
+    assert db.exists_many((b'key-1', b'missing')) == (True, False)
+
+
+def test_database_api_set_many_and_delete_many(db):
+    db.set_many(((b'key-1', b'value-1'), (b'key-2', b'value-2')))
+
+    assert db[b'key-1'] == b'value-1'
+    assert db[b'key-2'] == b'value-2'
+
+    db.delete_many((b'key-1', b'missing'))
+
+    assert not db.exists(b'key-1')
+    assert db.exists(b'key-2')
+
+
+def test_database_api_apply_diff(db):
+    db[b'key-1'] = b'value-1'
+
+    batch = BatchDB(MemoryDB())
+    batch[b'key-2'] = b'value-2'
+    batch[b'key-3'] = b'value-3'
+    del batch[b'key-3']
+    diff = batch.diff()
+
+    db.apply_diff(diff)
+    assert db[b'key-2'] == b'value-2'
+    assert not db.exists(b'key-3')
@@ -0,0 +1,95 @@
+import pytest
+
+from hvm.constants import GENESIS_PARENT_HASH
+from hvm.db import chain as chain_module
+from hvm.db.backends.memory import MemoryDB
+from hvm.db.chain import ChainDB
+from hvm.rlp.headers import BlockHeader
+
+CHAIN_ADDRESS = b'\x01' * 20
+
+
+@pytest.fixture
+def chaindb():
+    chain_module.balance_at_time_cache.clear()
+    yield ChainDB(MemoryDB())
+    chain_module.balance_at_time_cache.clear()
+
+
+def add_blocks(chaindb, timestamps_and_balances, parent=None):
+    headers = []
+    for timestamp, balance in timestamps_and_balances:
+        header = BlockHeader(
+            block_number=0 if parent is None else parent.block_number + 1,
+            timestamp=timestamp,
+            account_balance=balance,
+            parent_hash=GENESIS_PARENT_HASH if parent is None else parent.hash,
+            chain_address=CHAIN_ADDRESS,
+        )
+        chaindb.persist_header(header)
+        headers.append(header)
+        parent = header
+    return headers
+
+
+@pytest.fixture
+def headers(chaindb):
+    return add_blocks(chaindb, [(100, 10), (200, 20), (300, 30), (400, 40), (500, 50)])
+
+
+@pytest.mark.parametrize(
+    'timestamp,expected_balance',
+    (
+        # before the genesis block
+        (0, 0),
+        (99, 0),
+        # exactly at a block
+        (100, 10),
+        (300, 30),
+        (500, 50),
+        # between blocks
+        (101, 10),
+        (299, 20),
+        (499, 40),
+        # after the head
+        (501, 50),
+        (10 ** 10, 50),
+    ),
+)
+def test_balance_at_time(chaindb, headers, timestamp, expected_balance):
+    assert chaindb._get_balance_at_time(CHAIN_ADDRESS, timestamp) == expected_balance
+    # The second time comes from the cache when it is in the same window
+    assert chaindb._get_balance_at_time(CHAIN_ADDRESS, timestamp) == expected_balance
+
+
+def test_find_canonical_header_at_or_before_timestamp(chaindb, headers):
+    head = headers[-1]
+    assert chaindb._find_canonical_header_at_or_before_timestamp(head, 99) == (None, headers[0])
+    assert chaindb._find_canonical_header_at_or_before_timestamp(head, 200) == (headers[1], headers[2])
+    assert chaindb._find_canonical_header_at_or_before_timestamp(head, 250) == (headers[1], headers[2])
+    assert chaindb._find_canonical_header_at_or_before_timestamp(head, 500) == (head, None)
+
+
+def test_balance_without_a_chain_is_zero(chaindb):
+    assert chaindb._get_balance_at_time(CHAIN_ADDRESS, 100) == 0
+
+
+def test_new_head_is_not_served_from_the_cache(chaindb, headers):
+    assert chaindb._get_balance_at_time(CHAIN_ADDRESS, 600) == 50
+    assert (CHAIN_ADDRESS, headers[-1].hash) in chain_module.balance_at_time_cache
+
+    new_head = add_blocks(chaindb, [(600, 60)], parent=headers[-1])[0]
+
+    assert chaindb._get_balance_at_time(CHAIN_ADDRESS, 600) == 60
+    assert chaindb._get_balance_at_time(CHAIN_ADDRESS, 599) == 50
+    assert (CHAIN_ADDRESS, new_head.hash) in chain_module.balance_at_time_cache
+
+
+def test_replaced_head_is_not_served_from_the_cache(chaindb, headers):
+    assert chaindb._get_balance_at_time(CHAIN_ADDRESS, 450) == 40
+
+    # Replace the last two blocks with one that has a different balance
+    add_blocks(chaindb, [(450, 45)], parent=headers[2])
+
+    assert chaindb._get_balance_at_time(CHAIN_ADDRESS, 450) == 45
+    assert chaindb._get_balance_at_time(CHAIN_ADDRESS, 10 ** 10) == 45
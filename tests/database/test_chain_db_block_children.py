@@ -0,0 +1,69 @@
+import pytest
+
+import rlp_cython as rlp
+
+from hvm.db.backends.memory import MemoryDB
+from hvm.db.chain import ChainDB
+from hvm.rlp.headers import BlockHeader
+
+
+@pytest.fixture
+def chaindb():
+    return ChainDB(MemoryDB())
+
+
+def make_block(chaindb, chain_number, block_number=0):
+    header = BlockHeader(block_number=block_number, timestamp=1, chain_address=bytes([chain_number]) * 20)
+    chaindb.db[header.hash] = rlp.encode(header)
+    return header.hash
+
+
+def test_descendants_of_deep_graph(chaindb):
+    # A receive chain far deeper than the recursion limit
+    block_hashes = [bytes([i % 256, i // 256]) * 16 for i in range(5000)]
+    for parent_block_hash, child_block_hash in zip(block_hashes, block_hashes[1:]):
+        chaindb.add_block_child(parent_block_hash, child_block_hash)
+
+    assert chaindb.get_all_descendant_block_hashes(block_hashes[0]) == set(block_hashes[1:])
+    assert chaindb.get_all_descendant_block_hashes(block_hashes[-1]) is None
+
+
+def test_descendants_with_cycle(chaindb):
+    a, b, c = (bytes([i]) * 32 for i in range(1, 4))
+    chaindb.add_block_child(a, b)
+    chaindb.add_block_child(b, c)
+    chaindb.add_block_child(c, a)
+
+    assert chaindb.get_all_descendant_block_hashes(a) == {a, b, c}
+
+
+def test_block_children_chains(chaindb):
+    root = make_block(chaindb, 1)
+    child_1 = make_block(chaindb, 2)
+    child_2 = make_block(chaindb, 3)
+    grandchild = make_block(chaindb, 4)
+    chaindb.add_block_child(root, child_1)
+    chaindb.add_block_child(root, child_2)
+    chaindb.add_block_child(child_1, grandchild)
+    chaindb.add_block_child(child_2, grandchild)
+
+    expected = {bytes([i]) * 20 for i in (2, 3, 4)}
+    assert chaindb.get_block_children_chains(root) == expected
+    assert chaindb.get_block_children_chains(root, exclude_chains={bytes([2]) * 20}) == expected - {bytes([2]) * 20}
+    assert chaindb.get_block_children_chains(grandchild) == set()
+
+
+def test_memoized_block_children_chains_see_new_children(chaindb):
+    root = make_block(chaindb, 1)
+    child = make_block(chaindb, 2)
+    later_child = make_block(chaindb, 3)
+    chaindb.add_block_child(root, child)
+
+    with chaindb.memoize_block_children_chains():
+        assert chaindb.get_block_children_chains(root) == {bytes([2]) * 20}
+        assert chaindb.get_block_children_chains(root) == {bytes([2]) * 20}
+
+        chaindb.add_block_child(child, later_child)
+        assert chaindb.get_block_children_chains(root) == {bytes([2]) * 20, bytes([3]) * 20}
+
+    assert chaindb._block_children_chains_memo is None
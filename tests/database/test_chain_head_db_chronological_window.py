@@ -0,0 +1,129 @@
+import time
+
+import pytest
+
+import rlp_cython as rlp
+from rlp_cython.sedes import f_big_endian_int
+
+from hvm.constants import TIME_BETWEEN_HEAD_HASH_SAVE
+from hvm.db.backends.memory import MemoryDB
+from hvm.db.chain_head import ChainHeadDB
+from hvm.db.schema import SchemaV1
+from hvm.rlp.sedes import hash32
+
+WINDOW = int(time.time() / TIME_BETWEEN_HEAD_HASH_SAVE) * TIME_BETWEEN_HEAD_HASH_SAVE
+BLOCKS = [[WINDOW + i % 7, bytes([i]) * 32] for i in range(1, 11)]
+
+
+@pytest.fixture
+def chain_head_db():
+    return ChainHeadDB(MemoryDB())
+
+
+def test_load_returns_sorted_window(chain_head_db):
+    for timestamp, block_hash in BLOCKS:
+        chain_head_db.add_block_hash_to_chronological_window(block_hash, timestamp)
+
+    assert chain_head_db.load_chronological_block_window(WINDOW) == sorted(BLOCKS)
+    assert chain_head_db.load_chronological_block_window(WINDOW + TIME_BETWEEN_HEAD_HASH_SAVE) is None
+
+
+def test_block_hash_is_only_added_once(chain_head_db):
+    timestamp, block_hash = BLOCKS[0]
+    chain_head_db.add_block_hash_to_chronological_window(block_hash, timestamp)
+    chain_head_db.add_block_hash_to_chronological_window(block_hash, timestamp)
+
+    assert chain_head_db.load_chronological_block_window(WINDOW) == [BLOCKS[0]]
+
+
+def test_delete_block_hashes(chain_head_db):
+    chain_head_db.save_chronological_block_window(BLOCKS, WINDOW)
+
+    # first, last, and one with the wrong timestamp which is not deleted
+    chain_head_db.delete_block_hash_from_chronological_window(BLOCKS[0][1], timestamp=BLOCKS[0][0])
+    chain_head_db.delete_block_hash_from_chronological_window(BLOCKS[-1][1], timestamp=BLOCKS[-1][0])
+    chain_head_db.delete_block_hash_from_chronological_window(BLOCKS[1][1], timestamp=BLOCKS[1][0] + 1)
+    chain_head_db.delete_block_hashes_from_chronological_window([BLOCKS[4][1], b'\xff' * 32], WINDOW)
+
+    expected = [BLOCKS[i] for i in (1, 2, 3, 5, 6, 7, 8)]
+    assert chain_head_db.load_chronological_block_window(WINDOW) == sorted(expected)
+
+    for _, block_hash in expected:
+        chain_head_db.delete_block_hashes_from_chronological_window([block_hash], WINDOW)
+    assert chain_head_db.load_chronological_block_window(WINDOW) == []
+
+
+def test_delete_window(chain_head_db):
+    chain_head_db.save_chronological_block_window(BLOCKS, WINDOW)
+    chain_head_db.delete_chronological_block_window(WINDOW)
+
+    assert chain_head_db.load_chronological_block_window(WINDOW) is None
+    chain_head_db.add_block_hash_to_chronological_window(BLOCKS[0][1], BLOCKS[0][0])
+    assert chain_head_db.load_chronological_block_window(WINDOW) == [BLOCKS[0]]
+
+
+def test_legacy_window_is_migrated(chain_head_db):
+    chain_head_db.db[SchemaV1.make_chronological_window_lookup_key(WINDOW)] = rlp.encode(
+        BLOCKS[:3],
+        sedes=rlp.sedes.FCountableList(rlp.sedes.FList([f_big_endian_int, hash32])),
+    )
+    assert chain_head_db.load_chronological_block_window(WINDOW) == sorted(BLOCKS[:3])
+
+    chain_head_db.add_block_hash_to_chronological_window(BLOCKS[3][1], BLOCKS[3][0])
+
+    assert SchemaV1.make_chronological_window_lookup_key(WINDOW) not in chain_head_db.db
+    assert chain_head_db.load_chronological_block_window(WINDOW) == sorted(BLOCKS[:4])
+
+
+def test_save_replaces_window(chain_head_db):
+    chain_head_db.save_chronological_block_window(BLOCKS, WINDOW)
+    chain_head_db.save_chronological_block_window(BLOCKS[:2], WINDOW)
+
+    assert chain_head_db.load_chronological_block_window(WINDOW) == sorted(BLOCKS[:2])
+    # The entries from the first save are all gone
+    for index in range(2, len(BLOCKS)):
+        assert SchemaV1.make_chronological_window_entry_lookup_key(WINDOW, index) not in chain_head_db.db
+    for _, block_hash in BLOCKS[2:]:
+        assert SchemaV1.make_chronological_window_hash_lookup_key(WINDOW, block_hash) not in chain_head_db.db
+
+    chain_head_db.add_block_hash_to_chronological_window(BLOCKS[5][1], BLOCKS[5][0])
+    assert chain_head_db.load_chronological_block_window(WINDOW) == sorted(BLOCKS[:2] + [BLOCKS[5]])
+
+
+def test_save_keeps_the_last_timestamp_of_a_block_hash(chain_head_db):
+    block_hash = BLOCKS[0][1]
+    chain_head_db.save_chronological_block_window([[WINDOW + 1, block_hash], [WINDOW + 2, block_hash]], WINDOW)
+
+    assert chain_head_db.load_chronological_block_window(WINDOW) == [[WINDOW + 2, block_hash]]
+
+
+def test_save_does_not_log_a_delete(chain_head_db, caplog):
+    caplog.set_level('DEBUG', logger=chain_head_db.logger.name)
+    chain_head_db.save_chronological_block_window(BLOCKS, WINDOW)
+    chain_head_db.save_chronological_block_window(BLOCKS, WINDOW)
+
+    assert 'deleting chronological block window' not in caplog.text
+
+
+def test_legacy_window_is_migrated_on_delete(chain_head_db):
+    chain_head_db.db[SchemaV1.make_chronological_window_lookup_key(WINDOW)] = rlp.encode(
+        BLOCKS[:3],
+        sedes=rlp.sedes.FCountableList(rlp.sedes.FList([f_big_endian_int, hash32])),
+    )
+
+    chain_head_db.delete_block_hashes_from_chronological_window([BLOCKS[0][1]], WINDOW)
+
+    assert SchemaV1.make_chronological_window_lookup_key(WINDOW) not in chain_head_db.db
+    assert chain_head_db.load_chronological_block_window(WINDOW) == sorted(BLOCKS[1:3])
+
+
+def test_legacy_window_is_deleted(chain_head_db):
+    chain_head_db.db[SchemaV1.make_chronological_window_lookup_key(WINDOW)] = rlp.encode(
+        BLOCKS[:3],
+        sedes=rlp.sedes.FCountableList(rlp.sedes.FList([f_big_endian_int, hash32])),
+    )
+
+    chain_head_db.delete_chronological_block_window(WINDOW)
+
+    assert SchemaV1.make_chronological_window_lookup_key(WINDOW) not in chain_head_db.db
+    assert chain_head_db.load_chronological_block_window(WINDOW) is None
@@ -0,0 +1,153 @@
+import rlp_cython as rlp
+from rlp_cython.sedes import f_big_endian_int
+
+import pytest
+
+from trie.constants import BLANK_HASH
+
+from hvm.chains.base import Chain
+from hvm.constants import (
+    NUMBER_OF_HEAD_HASH_TO_SAVE,
+    TIME_BETWEEN_HEAD_HASH_SAVE,
+)
+from hvm.db.backends.memory import MemoryDB
+from hvm.db.chain_head import ChainHeadDB
+from hvm.db.schema import SchemaV1
+from hvm.rlp.sedes import hash32
+
+T = TIME_BETWEEN_HEAD_HASH_SAVE
+
+
+def make_root_hashes(start, count, fill=1):
+    return [[start + i * T, bytes([fill + i % 200]) * 32] for i in range(count)]
+
+
+def test_each_window_has_its_own_key():
+    db = MemoryDB()
+    chain_head_db = ChainHeadDB(db)
+    root_hashes = make_root_hashes(T, 3)
+    chain_head_db.save_historical_root_hashes(root_hashes)
+
+    for timestamp, root_hash in root_hashes:
+        assert db[SchemaV1.make_head_root_for_timestamp_lookup_key(timestamp)] == root_hash
+
+    assert ChainHeadDB(db).get_historical_root_hashes() == root_hashes
+    assert chain_head_db.get_historical_root_hash(2 * T + 1) == root_hashes[1][1]
+    assert chain_head_db.get_historical_root_hash(0) is None
+
+
+def test_save_single_historical_root_hash_is_seen_by_other_instances():
+    db = MemoryDB()
+    reader = ChainHeadDB(db)
+    writer = ChainHeadDB(db)
+    writer.save_historical_root_hashes(make_root_hashes(T, 2))
+    assert reader.get_latest_historical_root_hash() == [2 * T, bytes([2]) * 32]
+
+    writer.save_single_historical_root_hash(b'\xaa' * 32, 3 * T)
+    assert reader.get_latest_historical_root_hash() == [3 * T, b'\xaa' * 32]
+
+
+def test_old_windows_are_deleted():
+    db = MemoryDB()
+    chain_head_db = ChainHeadDB(db)
+    chain_head_db.save_historical_root_hashes(make_root_hashes(T, NUMBER_OF_HEAD_HASH_TO_SAVE))
+    chain_head_db.save_single_historical_root_hash(b'\xaa' * 32, (NUMBER_OF_HEAD_HASH_TO_SAVE + 1) * T)
+
+    historical_root_hashes = chain_head_db.get_historical_root_hashes()
+    assert len(historical_root_hashes) == NUMBER_OF_HEAD_HASH_TO_SAVE
+    assert historical_root_hashes[0][0] == 2 * T
+    assert SchemaV1.make_head_root_for_timestamp_lookup_key(T) not in db
+
+
+def test_delete_historical_root_hashes():
+    db = MemoryDB()
+    chain_head_db = ChainHeadDB(db)
+    chain_head_db.save_historical_root_hashes(make_root_hashes(T, 3))
+    chain_head_db.delete_historical_root_hashes()
+
+    assert chain_head_db.get_historical_root_hashes() is None
+    assert ChainHeadDB(db).get_latest_historical_root_hash() == (None, None)
+    assert SchemaV1.make_head_root_for_timestamp_lookup_key(T) not in db
+
+
+def test_legacy_root_hash_list_is_migrated():
+    db = MemoryDB()
+    root_hashes = make_root_hashes(T, 3)
+    db[SchemaV1.make_historical_head_root_lookup_key()] = rlp.encode(
+        root_hashes,
+        sedes=rlp.sedes.FCountableList(rlp.sedes.FList([f_big_endian_int, hash32])),
+    )
+
+    chain_head_db = ChainHeadDB(db)
+    assert chain_head_db.get_historical_root_hashes() == root_hashes
+
+    chain_head_db.save_single_historical_root_hash(b'\xaa' * 32, 4 * T)
+
+    assert SchemaV1.make_historical_head_root_lookup_key() not in db
+    assert ChainHeadDB(db).get_historical_root_hashes() == root_hashes + [[4 * T, b'\xaa' * 32]]
+
+
+def test_add_block_hashes_to_timestamps_matches_adding_one_at_a_time():
+    block_hashes = [
+        (b'\x01' * 20, b'\x11' * 32, 5 * T + 1),
+        (b'\x02' * 20, b'\x12' * 32, 2 * T),
+        (b'\x01' * 20, b'\x13' * 32, 3 * T + 5),
+        (b'\x03' * 20, b'\x14' * 32, 8 * T),
+        (b'\x02' * 20, BLANK_HASH, 9 * T),
+        (b'\x04' * 20, b'\x15' * 32, 0),
+    ]
+
+    one_at_a_time_db = ChainHeadDB(MemoryDB())
+    one_at_a_time_db.initialize_historical_root_hashes(BLANK_HASH, 2 * T)
+    for address, head_hash, timestamp in block_hashes:
+        one_at_a_time_db.add_block_hash_to_timestamp(address, head_hash, timestamp)
+
+    batched_db = ChainHeadDB(MemoryDB())
+    batched_db.initialize_historical_root_hashes(BLANK_HASH, 2 * T)
+    batched_db.add_block_hashes_to_timestamps(block_hashes)
+
+    assert batched_db.get_historical_root_hashes() == one_at_a_time_db.get_historical_root_hashes()
+    assert batched_db.root_hash == one_at_a_time_db.root_hash
+
+
+def test_queued_block_hashes_are_saved_before_reading():
+    chain_head_db = ChainHeadDB(MemoryDB())
+    chain_head_db.initialize_historical_root_hashes(BLANK_HASH, T)
+
+    chain_head_db.queue_block_hash_to_timestamp(b'\x01' * 20, b'\x11' * 32, T)
+    chain_head_db.queue_block_hash_to_timestamp(b'\x01' * 20, b'\x12' * 32, T + 1)
+
+    assert chain_head_db.get_chain_head_hash_at_timestamp(b'\x01' * 20, 2 * T) == b'\x12' * 32
+
+
+def test_moved_queue_is_saved_by_the_new_chain_head_db():
+    db = MemoryDB()
+    old_chain_head_db = ChainHeadDB(db)
+    old_chain_head_db.initialize_historical_root_hashes(BLANK_HASH, T)
+    old_chain_head_db.queue_block_hash_to_timestamp(b'\x01' * 20, b'\x11' * 32, T)
+
+    new_chain_head_db = ChainHeadDB(db)
+    old_chain_head_db.move_queued_block_hashes_to_timestamps(new_chain_head_db)
+    new_chain_head_db.queue_block_hash_to_timestamp(b'\x02' * 20, b'\x12' * 32, T + 1)
+
+    # Nothing is saved until the new one is flushed
+    assert ChainHeadDB(db).get_chain_head_hash_at_timestamp(b'\x01' * 20, 2 * T) is None
+
+    new_chain_head_db.flush_queued_block_hashes_to_timestamps()
+    assert ChainHeadDB(db).get_chain_head_hash_at_timestamp(b'\x01' * 20, 2 * T) == b'\x11' * 32
+    assert ChainHeadDB(db).get_chain_head_hash_at_timestamp(b'\x02' * 20, 2 * T) == b'\x12' * 32
+
+
+def test_queued_block_hashes_of_imported_blocks_are_saved_when_the_import_fails():
+    db = MemoryDB()
+    chain = Chain.__new__(Chain)
+    chain.chain_head_db = ChainHeadDB(db)
+    chain.chain_head_db.initialize_historical_root_hashes(BLANK_HASH, T)
+
+    with pytest.raises(ValueError):
+        with chain.queue_block_hashes_to_timestamps():
+            chain.chain_head_db.queue_block_hash_to_timestamp(b'\x01' * 20, b'\x11' * 32, T)
+            raise ValueError("the next block failed to import")
+
+    assert not chain._queue_block_hashes_to_timestamps
+    assert ChainHeadDB(db).get_chain_head_hash_at_timestamp(b'\x01' * 20, 2 * T) == b'\x11' * 32
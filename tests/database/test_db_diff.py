@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from hvm.db.diff import (
@@ -139,3 +141,18 @@ def join_diffs(db, series_of_diffs, expected):
 
     DBDiff.join(diffs).apply_to(db)
     assert db == expected
+
+
+def test_diff_survives_pickling():
+    tracker = DBDiffTracker()
+    tracker[b'key-1'] = b'value-1'
+    tracker[b'key-2'] = b'value-2'
+    del tracker[b'key-2']
+
+    diff = pickle.loads(pickle.dumps(tracker.diff()))
+
+    assert diff.pending_items() == ((b'key-1', b'value-1'),)
+    assert diff.deleted_keys() == (b'key-2',)
+    with pytest.raises(DiffMissingError) as excinfo:
+        diff[b'key-2']
+    assert excinfo.value.is_deleted
@@ -0,0 +1,129 @@
+import uuid
+
+import pytest
+
+from eth_utils import ValidationError
+
+from hvm.db.journal import (
+    DELETED_ENTRY,
+    Journal,
+)
+
+
+@pytest.fixture
+def journal():
+    journal = Journal()
+    journal.record_changeset()
+    return journal
+
+
+def test_discard_restores_values_from_before_changeset(journal):
+    journal[b'1'] = b'root'
+    changeset_a = journal.record_changeset()
+    journal[b'1'] = b'a'
+    journal[b'2'] = b'a'
+    journal.record_changeset()
+    journal[b'1'] = b'b'
+    del journal[b'2']
+    assert journal[b'2'] is DELETED_ENTRY
+
+    journal.pop_changeset(changeset_a)
+
+    assert journal[b'1'] == b'root'
+    assert journal[b'2'] is None
+    assert journal.merged_changesets() == {b'1': b'root'}
+
+
+def test_committed_changes_are_discarded_with_parent(journal):
+    changeset_a = journal.record_changeset()
+    journal[b'1'] = b'a'
+    changeset_b = journal.record_changeset()
+    journal[b'1'] = b'b'
+
+    journal.commit_changeset(changeset_b)
+    assert journal[b'1'] == b'b'
+    assert not journal.has_changeset(changeset_b)
+
+    journal[b'1'] = b'a2'
+    journal.pop_changeset(changeset_a)
+
+    assert journal[b'1'] is None
+
+
+def test_changeset_ids_are_not_reused_after_commit(journal):
+    changeset_a = journal.record_changeset()
+    journal[b'1'] = b'a'
+    journal.commit_changeset(changeset_a)
+
+    changeset_b = journal.record_changeset()
+    journal[b'1'] = b'b'
+    journal.pop_changeset(changeset_b)
+
+    assert journal[b'1'] == b'a'
+
+
+def test_commit_root_keeps_merged_changes(journal):
+    journal[b'1'] = b'root'
+    journal.record_changeset()
+    journal[b'2'] = b'a'
+
+    journal.commit_changeset(journal.root_changeset_id)
+
+    assert journal.is_empty()
+    assert journal.merged_changesets() == {b'1': b'root', b'2': b'a'}
+
+
+def test_pop_root_clears_journal(journal):
+    journal[b'1'] = b'root'
+    journal.record_changeset()
+    journal[b'2'] = b'a'
+
+    journal.pop_changeset(journal.root_changeset_id)
+
+    assert journal.is_empty()
+    assert journal.merged_changesets() == {}
+
+
+def test_journal_data_lists_keys_by_changeset(journal):
+    journal[b'1'] = b'root'
+    changeset_a = journal.record_changeset()
+    journal[b'2'] = b'a'
+    journal[b'1'] = b'a'
+
+    changeset_b = journal.record_changeset()
+    journal[b'1'] = b'b'
+    del journal[b'2']
+
+    assert list(journal.journal_data.items()) == [
+        (journal.root_changeset_id, {b'1': b'root'}),
+        (changeset_a, {b'2': b'a', b'1': b'a'}),
+        (changeset_b, {b'1': b'b', b'2': DELETED_ENTRY}),
+    ]
+
+
+def test_journal_data_after_commit(journal):
+    changeset_a = journal.record_changeset()
+    journal[b'1'] = b'a'
+    changeset_b = journal.record_changeset()
+    journal[b'1'] = b'b'
+    journal[b'2'] = b'b'
+    journal.commit_changeset(changeset_b)
+    changeset_c = journal.record_changeset()
+    journal[b'1'] = b'c'
+
+    assert list(journal.journal_data.items()) == [
+        (journal.root_changeset_id, {}),
+        (changeset_a, {b'1': b'b', b'2': b'b'}),
+        (changeset_c, {b'1': b'c'}),
+    ]
+
+
+def test_custom_changeset_ids(journal):
+    changeset = uuid.uuid4()
+    assert journal.record_changeset(changeset) == changeset
+
+    with pytest.raises(ValidationError):
+        journal.record_changeset(changeset)
+
+    with pytest.raises(KeyError):
+        journal.pop_changeset(uuid.uuid4())
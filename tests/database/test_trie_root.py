@@ -0,0 +1,44 @@
+import pytest
+
+from eth_hash.auto import keccak
+
+from hvm.constants import BLANK_ROOT_HASH
+from hvm.db.trie import (
+    _make_trie_root,
+    _make_trie_root_and_nodes,
+    _make_trie_root_and_nodes_isometric_on_order,
+    _make_trie_root_from_sorted_items,
+    _make_trie_root_isometric_on_order,
+)
+from trie import HexaryTrie
+
+
+@pytest.mark.parametrize('num_items', (0, 1, 2, 16, 17, 127, 128, 129, 300))
+@pytest.mark.parametrize('item_size', (1, 20, 100))
+def test_trie_root_matches_hexary_trie(num_items, item_size):
+    items = tuple(keccak(index.to_bytes(2, 'big'))[:item_size] for index in range(num_items))
+
+    root_hash, _ = _make_trie_root_and_nodes(items)
+    assert _make_trie_root(items) == root_hash
+
+
+def test_empty_trie_root():
+    assert _make_trie_root(()) == BLANK_ROOT_HASH
+
+
+def test_isometric_trie_root_matches_hexary_trie():
+    items = tuple(keccak(bytes([index])) for index in range(50))
+    # duplicates are only set once
+    items = items + items[:10]
+
+    root_hash, _ = _make_trie_root_and_nodes_isometric_on_order(items)
+    assert _make_trie_root_isometric_on_order(items) == root_hash
+
+
+def test_keys_that_are_prefixes_of_other_keys():
+    items = {b'a': b'1', b'ab': b'2', b'abc': b'3' * 40, b'b': b'4'}
+    trie = HexaryTrie({}, BLANK_ROOT_HASH)
+    for key, value in items.items():
+        trie[key] = value
+
+    assert _make_trie_root_from_sorted_items(sorted(items.items())) == trie.root_hash
@@ -0,0 +1,64 @@
+import hashlib
+import struct
+import zlib
+
+import pytest
+
+from hp2p.constants import (
+    FRAME_COMPRESSION_MIN_SIZE,
+    MAX_FRAME_SIZE,
+)
+from hp2p.exceptions import MalformedMessage
+from hp2p.protocol import (
+    compress_frame,
+    decompress_msg,
+    is_compressed_frame,
+    make_frame,
+)
+
+
+def get_frame_size(header):
+    (frame_size,) = struct.unpack(b'>I', b'\x00' + header[:3])
+    return frame_size
+
+
+def test_compressed_frame_round_trip():
+    msg = b'\x90' + b'block data' * 1000
+    header, body = make_frame(msg)
+
+    compressed_header, compressed_body = compress_frame(header, body)
+
+    assert is_compressed_frame(compressed_header)
+    assert not is_compressed_frame(header)
+    assert len(compressed_body) < len(body)
+    assert len(compressed_header) == len(header) == 16
+    compressed_msg = compressed_body[:get_frame_size(compressed_header)]
+    # the cmd_id isn't compressed
+    assert compressed_msg[:1] == b'\x90'
+    assert decompress_msg(compressed_msg) == msg
+
+
+def test_small_frames_are_not_compressed():
+    header, body = make_frame(b'\x90' + b'\x00' * (FRAME_COMPRESSION_MIN_SIZE - 2))
+    assert compress_frame(header, body) == (header, body)
+
+
+def test_incompressible_frames_are_not_compressed():
+    random_data = b''.join(hashlib.sha256(bytes([i])).digest() for i in range(64))
+    header, body = make_frame(b'\x90' + random_data)
+    assert compress_frame(header, body) == (header, body)
+
+
+def test_malformed_compressed_msg():
+    with pytest.raises(MalformedMessage):
+        decompress_msg(b'\x90' + b'not zlib')
+
+    truncated = zlib.compress(b'x' * 10000)[:-4]
+    with pytest.raises(MalformedMessage):
+        decompress_msg(b'\x90' + truncated)
+
+
+def test_decompressed_msg_size_is_limited():
+    too_large = zlib.compress(b'\x00' * (MAX_FRAME_SIZE + 1))
+    with pytest.raises(MalformedMessage):
+        decompress_msg(b'\x90' + too_large)
@@ -0,0 +1,60 @@
+import pytest
+
+import rlp_cython as rlp
+
+from hp2p import utils
+from hp2p.exceptions import MalformedMessage
+from hp2p.p2p_proto import Hello
+from hp2p.utils import (
+    get_decode_executor,
+    set_decode_executor_max_workers,
+    shutdown_decode_executor,
+)
+
+
+@pytest.fixture
+def decode_executor():
+    set_decode_executor_max_workers(1)
+    yield get_decode_executor()
+    shutdown_decode_executor()
+    set_decode_executor_max_workers(utils.DEFAULT_DECODE_EXECUTOR_MAX_WORKERS)
+
+
+def make_hello_msg(client_version_string):
+    cmd = Hello(cmd_id_offset=0)
+    payload = cmd.encode_payload(dict(
+        version=4,
+        client_version_string=client_version_string,
+        capabilities=[('hls', 1)],
+        listen_port=30303,
+        remote_pubkey=b'\x01' * 64,
+    ))
+    # The decrypted message that read_msg passes to decode, without the frame padding
+    return cmd, rlp.encode(cmd.cmd_id, sedes=rlp.sedes.big_endian_int) + payload
+
+
+def test_decode_in_executor_matches_inline_decode(decode_executor):
+    cmd, msg = make_hello_msg('x' * 100000)
+
+    assert decode_executor.submit(cmd.decode, msg).result() == cmd.decode(msg)
+
+
+def test_malformed_message_raised_from_executor(decode_executor):
+    cmd, msg = make_hello_msg('helios')
+
+    with pytest.raises(MalformedMessage):
+        # Wrong packet type
+        decode_executor.submit(cmd.decode, b'\x05' + msg[1:]).result()
+
+
+def test_executor_can_be_disabled():
+    set_decode_executor_max_workers(0)
+    try:
+        assert get_decode_executor() is None
+    finally:
+        set_decode_executor_max_workers(utils.DEFAULT_DECODE_EXECUTOR_MAX_WORKERS)
+
+
+def test_workers_cannot_change_after_start(decode_executor):
+    with pytest.raises(ValueError):
+        set_decode_executor_max_workers(2)
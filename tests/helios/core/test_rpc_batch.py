@@ -0,0 +1,129 @@
+import asyncio
+import json
+import logging
+
+import pytest
+
+from cancel_token import CancelToken
+
+from helios.rpc.constants import MAX_RPC_BATCH_SIZE
+from helios.rpc.ipc import (
+    connection_loop,
+    strip_non_json_prefix,
+)
+from helios.rpc.main import (
+    RPCContext,
+    RPCServer,
+)
+
+
+@pytest.fixture
+def rpc():
+    return RPCServer(None, RPCContext())
+
+
+def make_request(request_id, method, params=None):
+    return {
+        'jsonrpc': '2.0',
+        'id': request_id,
+        'method': method,
+        'params': params or [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_responses_are_in_request_order(rpc):
+    batch = [
+        make_request(1, 'web3_sha3', ['0x01']),
+        make_request(2, 'web3_clientVersion'),
+        make_request(3, 'web3_notAMethod'),
+    ]
+
+    responses = json.loads(await rpc.execute(batch))
+
+    assert [response['id'] for response in responses] == [1, 2, 3]
+    assert responses[0] == json.loads(await rpc.execute(batch[0]))
+    assert 'result' in responses[1]
+    assert 'error' in responses[2]
+
+
+@pytest.mark.asyncio
+async def test_invalid_batch_items_get_errors(rpc):
+    responses = json.loads(await rpc.execute([1, make_request(2, 'web3_clientVersion')]))
+
+    assert len(responses) == 2
+    assert 'error' in responses[0]
+    assert responses[1]['id'] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('batch_size', (0, MAX_RPC_BATCH_SIZE + 1))
+async def test_empty_and_oversized_batches_are_rejected(rpc, batch_size):
+    batch = [make_request(index, 'web3_clientVersion') for index in range(batch_size)]
+
+    response = json.loads(await rpc.execute(batch))
+
+    assert isinstance(response, dict)
+    assert 'error' in response
+
+
+@pytest.mark.parametrize(
+    'raw_request, expected',
+    (
+        ('{"id": 1}', ('', '{"id": 1}')),
+        ('[{"id": 1}]', ('', '[{"id": 1}]')),
+        (' \n[{"id": 1}]', ('', '[{"id": 1}]')),
+        ('junk {"id": 1}', ('junk', '{"id": 1}')),
+        ('junk', ('junk', '')),
+    ),
+)
+def test_strip_non_json_prefix(raw_request, expected):
+    assert strip_non_json_prefix(raw_request) == expected
+
+
+class FakeWriter:
+    def __init__(self):
+        self.written = b''
+
+    def write(self, data):
+        self.written += data
+
+    async def drain(self):
+        pass
+
+
+async def run_ipc_connection(rpc, *chunks):
+    reader = asyncio.StreamReader()
+    for chunk in chunks:
+        reader.feed_data(chunk)
+    reader.feed_eof()
+    writer = FakeWriter()
+    await connection_loop(rpc.execute, reader, writer, logging.getLogger('test'), CancelToken('test'))
+    return writer.written.decode()
+
+
+@pytest.mark.asyncio
+async def test_ipc_empty_batch_gets_a_response(rpc):
+    response = json.loads(await run_ipc_connection(rpc, b'[]'))
+
+    assert 'error' in response
+    assert response['jsonrpc'] == '2.0'
+
+
+@pytest.mark.asyncio
+async def test_ipc_requests_split_and_joined_across_chunks(rpc):
+    batch = json.dumps([make_request(1, 'web3_sha3', ['0x01'])]).encode()
+    single = json.dumps(make_request(2, 'web3_sha3', ['0x02'])).encode()
+
+    written = await run_ipc_connection(rpc, batch[:5], batch[5:] + b'\n' + single[:3], single[3:] + b'[]')
+
+    decoder = json.JSONDecoder()
+    responses = []
+    while written:
+        response, end = decoder.raw_decode(written)
+        responses.append(response)
+        written = written[end:]
+
+    assert [response['id'] for response in responses[0]] == [1]
+    assert responses[1]['id'] == 2
+    assert 'error' in responses[2]
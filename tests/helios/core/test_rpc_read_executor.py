@@ -0,0 +1,65 @@
+import json
+import threading
+
+import pytest
+
+from helios.rpc.latency import LatencyHistogram
+from helios.rpc.main import (
+    RPCContext,
+    RPCServer,
+)
+from helios.rpc.modules import (
+    RPCModule,
+    blocking_read,
+)
+
+
+class ThreadReporter(RPCModule):
+    @blocking_read
+    def threadName(self, suffix):
+        return threading.current_thread().name + suffix
+
+
+@pytest.fixture
+def rpc_context():
+    rpc_context = RPCContext(read_workers=1)
+    yield rpc_context
+    rpc_context.read_executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_blocking_reads_run_in_read_executor(rpc_context):
+    module = ThreadReporter(None, None, rpc_context)
+
+    thread_name = await module.threadName('!')
+
+    assert thread_name != threading.current_thread().name + '!'
+    assert thread_name.startswith('rpc-read')
+    assert thread_name.endswith('!')
+
+
+@pytest.mark.asyncio
+async def test_method_latencies_are_recorded(rpc_context):
+    rpc = RPCServer(None, rpc_context)
+    request = {'jsonrpc': '2.0', 'id': 1, 'method': 'web3_clientVersion', 'params': []}
+
+    await rpc.execute(request)
+    await rpc.execute(request)
+    await rpc.execute(dict(request, method='web3_notAMethod'))
+
+    assert list(rpc_context.method_latencies) == ['web3_clientVersion']
+    assert rpc_context.method_latencies['web3_clientVersion'].count == 2
+    assert 'result' in json.loads(await rpc.execute(request))
+
+
+def test_latency_histogram_buckets():
+    histogram = LatencyHistogram(buckets=(0.1, 1))
+
+    for seconds in (0.05, 0.1, 0.5, 2):
+        histogram.observe(seconds)
+
+    stats = histogram.to_dict()
+    assert stats['count'] == 4
+    assert stats['max'] == 2
+    assert stats['mean'] == pytest.approx(2.65 / 4)
+    assert stats['buckets'] == {'<=0.1': 2, '<=1': 1, '>1': 1}
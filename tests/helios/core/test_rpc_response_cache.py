@@ -0,0 +1,114 @@
+import json
+
+import pytest
+
+from helios.rpc.cache import RPCResponseCache
+from helios.rpc.main import (
+    RPCContext,
+    RPCServer,
+)
+
+
+class CountingMethod:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, *params):
+        self.calls += 1
+        return {'call': self.calls}
+
+
+@pytest.fixture
+def rpc():
+    return RPCServer(None, RPCContext(response_cache_size=16))
+
+
+def make_request(method, params):
+    return {'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params}
+
+
+async def get_result(rpc, method, params):
+    return json.loads(await rpc.execute(make_request(method, params)))['result']
+
+
+@pytest.mark.asyncio
+async def test_immutable_responses_are_not_invalidated(rpc):
+    get_block_by_hash = rpc.modules['hls'].getBlockByHash = CountingMethod()
+
+    assert await get_result(rpc, 'hls_getBlockByHash', ['0x01', False]) == {'call': 1}
+    assert await get_result(rpc, 'hls_getBlockByHash', ['0x01', False]) == {'call': 1}
+    assert await get_result(rpc, 'hls_getBlockByHash', ['0x01', True]) == {'call': 2}
+
+    rpc.rpc_context.response_cache.invalidate_head_dependent()
+
+    assert await get_result(rpc, 'hls_getBlockByHash', ['0x01', False]) == {'call': 1}
+    assert get_block_by_hash.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_head_dependent_responses_are_invalidated(rpc):
+    get_newest_blocks = rpc.modules['hls'].getNewestBlocks = CountingMethod()
+
+    assert await get_result(rpc, 'hls_getNewestBlocks', [10]) == {'call': 1}
+    assert await get_result(rpc, 'hls_getNewestBlocks', [10]) == {'call': 1}
+
+    rpc.rpc_context.response_cache.invalidate_head_dependent()
+
+    assert await get_result(rpc, 'hls_getNewestBlocks', [10]) == {'call': 2}
+    assert get_newest_blocks.calls == 2
+
+    stats = rpc.rpc_context.response_cache.get_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['invalidations'] == 1
+
+
+@pytest.mark.asyncio
+async def test_receipts_are_invalidated_with_the_heads(rpc):
+    get_transaction_receipt = rpc.modules['hls'].getTransactionReceipt = CountingMethod()
+
+    assert await get_result(rpc, 'hls_getTransactionReceipt', ['0x01']) == {'call': 1}
+    assert await get_result(rpc, 'hls_getTransactionReceipt', ['0x01']) == {'call': 1}
+
+    # The block that the transaction is in might have been replaced
+    rpc.rpc_context.response_cache.invalidate_head_dependent()
+
+    assert await get_result(rpc, 'hls_getTransactionReceipt', ['0x01']) == {'call': 2}
+    assert get_transaction_receipt.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_clear_drops_immutable_responses(rpc):
+    get_block_by_hash = rpc.modules['hls'].getBlockByHash = CountingMethod()
+
+    assert await get_result(rpc, 'hls_getBlockByHash', ['0x01', False]) == {'call': 1}
+
+    # Like when the block has been removed
+    rpc.rpc_context.response_cache.clear()
+
+    assert await get_result(rpc, 'hls_getBlockByHash', ['0x01', False]) == {'call': 2}
+    assert get_block_by_hash.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(rpc):
+    calls = []
+
+    async def failing_method(*params):
+        calls.append(params)
+        raise ValueError("not found")
+
+    rpc.modules['hls'].getBlockByHash = failing_method
+
+    for _ in range(2):
+        response = json.loads(await rpc.execute(make_request('hls_getBlockByHash', ['0x01', False])))
+        assert 'error' in response
+
+    assert len(calls) == 2
+
+
+def test_disabled_cache():
+    cache = RPCResponseCache(0)
+
+    assert not cache.enabled
+    assert cache.get_stats()['max_size'] == 0
@@ -0,0 +1,145 @@
+import asyncio
+import json
+
+import pytest
+
+from hvm.rlp.accounts import TransactionKey
+
+from helios.rpc.constants import (
+    SUBSCRIPTION_RECEIVABLE_TRANSACTIONS,
+    SUBSCRIPTION_SYNC_STAGE,
+)
+from helios.rpc.main import (
+    RPCContext,
+    RPCServer,
+)
+from helios.rpc import subscriptions as subscriptions_module
+from helios.rpc.subscriptions import SubscriptionManager
+
+
+class FakeWebsocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+@pytest.fixture
+def rpc():
+    return RPCServer(None, RPCContext())
+
+
+def make_request(method, params):
+    return {'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params}
+
+
+@pytest.mark.asyncio
+async def test_sync_stage_subscription(rpc):
+    websocket = FakeWebsocket()
+
+    response = json.loads(await rpc.execute(make_request('hls_subscribe', ['syncStage']), subscriber=websocket.send))
+    subscription_id = response['result']
+
+    await rpc._notify_sync_stage(2)
+    await rpc.rpc_context.subscriptions.wait_until_sent()
+
+    assert websocket.sent == [{
+        'jsonrpc': '2.0',
+        'method': 'hls_subscription',
+        'params': {
+            'subscription': subscription_id,
+            'result': {'syncStage': 2, 'syncing': True},
+        },
+    }]
+
+    response = json.loads(await rpc.execute(
+        make_request('hls_unsubscribe', [subscription_id]),
+        subscriber=websocket.send,
+    ))
+    assert response['result'] is True
+
+    await rpc._notify_sync_stage(4)
+    await rpc.rpc_context.subscriptions.wait_until_sent()
+    assert len(websocket.sent) == 1
+
+
+@pytest.mark.asyncio
+async def test_subscriptions_require_a_subscriber(rpc):
+    response = json.loads(await rpc.execute(make_request('hls_subscribe', ['syncStage'])))
+
+    assert 'error' in response
+    assert len(rpc.rpc_context.subscriptions) == 0
+
+
+@pytest.mark.asyncio
+async def test_only_the_subscriber_can_unsubscribe(rpc):
+    websocket = FakeWebsocket()
+    other_websocket = FakeWebsocket()
+    response = json.loads(await rpc.execute(make_request('hls_subscribe', ['syncStage']), subscriber=websocket.send))
+
+    response = json.loads(await rpc.execute(
+        make_request('hls_unsubscribe', [response['result']]),
+        subscriber=other_websocket.send,
+    ))
+    assert response['result'] is False
+
+    rpc.unsubscribe_all(websocket.send)
+    assert len(rpc.rpc_context.subscriptions) == 0
+
+
+@pytest.mark.asyncio
+async def test_failing_subscribers_are_removed():
+    subscriptions = SubscriptionManager()
+
+    async def closed_connection(message):
+        raise ConnectionError()
+
+    subscription = subscriptions.subscribe(closed_connection, SUBSCRIPTION_SYNC_STAGE)
+    subscriptions.notify(subscription, {})
+    await subscriptions.wait_until_sent()
+
+    assert len(subscriptions) == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_subscribers_dont_block_the_others(monkeypatch):
+    monkeypatch.setattr(subscriptions_module, 'MAX_PENDING_NOTIFICATIONS_PER_CONNECTION', 2)
+    subscriptions = SubscriptionManager()
+    stalled = asyncio.Event()
+
+    async def stalled_connection(message):
+        await stalled.wait()
+
+    websocket = FakeWebsocket()
+    stalled_subscription = subscriptions.subscribe(stalled_connection, SUBSCRIPTION_SYNC_STAGE)
+    subscription = subscriptions.subscribe(websocket.send, SUBSCRIPTION_SYNC_STAGE)
+
+    for sync_stage in range(4):
+        subscriptions.notify(stalled_subscription, sync_stage)
+        subscriptions.notify(subscription, sync_stage)
+        await asyncio.sleep(0)
+    await subscriptions.wait_until_sent()
+
+    assert [message['params']['result'] for message in websocket.sent] == [0, 1, 2, 3]
+    # The stalled one fell too far behind, and lost its subscription
+    assert subscriptions.get_subscriptions(SUBSCRIPTION_SYNC_STAGE) == [subscription]
+
+
+def test_only_new_receivable_transactions_are_notified():
+    subscriptions = SubscriptionManager()
+    subscription = subscriptions.subscribe(FakeWebsocket().send, SUBSCRIPTION_RECEIVABLE_TRANSACTIONS, b'\x01' * 20)
+    first_key = TransactionKey(b'\x02' * 32, b'\x03' * 32)
+    second_key = TransactionKey(b'\x04' * 32, b'\x05' * 32)
+    subscription.known_transaction_hashes = {first_key.transaction_hash}
+
+    notification = RPCServer._make_receivable_transactions_notification(subscription, [first_key, second_key])
+
+    assert notification == {
+        'chainAddress': '0x' + '01' * 20,
+        'receivableTransactions': [{
+            'transactionHash': '0x' + '04' * 32,
+            'senderBlockHash': '0x' + '05' * 32,
+        }],
+    }
+    assert RPCServer._make_receivable_transactions_notification(subscription, [first_key, second_key]) is None
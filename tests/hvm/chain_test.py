@@ -3,6 +3,7 @@ import os
 import time
 import sys
 from pprint import pprint
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
@@ -1539,6 +1540,101 @@ def test_read_only_db():
 # test_read_only_db()
 # exit()
 
+
+def test_get_vm_is_cached_until_head_changes():
+    testdb = MemoryDB()
+
+    chain = TestnetChain.from_genesis(testdb, TESTNET_GENESIS_PRIVATE_KEY.public_key.to_canonical_address(), TESTNET_GENESIS_PARAMS, TESTNET_GENESIS_STATE, private_key = TESTNET_GENESIS_PRIVATE_KEY)
+
+    # Outside of cache_vms, every call builds a new vm
+    assert chain.get_vm() is not chain.get_vm()
+
+    with chain.cache_vms():
+        vm = chain.get_vm()
+        assert chain.get_vm() is vm
+        assert chain.get_vm(timestamp = chain.header.timestamp) is vm
+        assert chain.get_vm(timestamp = chain.header.timestamp + 1) is not vm
+
+        # Other threads don't get the cached vm
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(chain.get_vm).result() is not vm
+
+        chain.create_and_sign_transaction_for_queue_block(
+            gas_price=1,
+            gas=21000,
+            to=RECEIVER.public_key.to_canonical_address(),
+            value=1,
+            data=b"",
+            v=0,
+            r=0,
+            s=0
+        )
+        chain.import_current_queue_block()
+
+        # The head changed, so the old vm must not be handed out again
+        new_vm = chain.get_vm()
+        assert new_vm is not vm
+        assert new_vm.header == chain.header
+
+        chain.set_new_wallet_address(RECEIVER.public_key.to_canonical_address())
+        assert chain.get_vm() is not new_vm
+
+    assert chain._vm_cache is None
+
+
+def test_import_chains_returns_import_errors_and_raises_others(monkeypatch):
+    testdb = MemoryDB()
+
+    chain = TestnetChain.from_genesis(testdb, TESTNET_GENESIS_PRIVATE_KEY.public_key.to_canonical_address(), TESTNET_GENESIS_PARAMS, TESTNET_GENESIS_STATE, private_key = TESTNET_GENESIS_PRIVATE_KEY)
+
+    import_errors = {
+        'valid': None,
+        'invalid': ValidationError("invalid block"),
+        'orphan': ParentNotFound("no parent"),
+        'bug': KeyError("bug"),
+    }
+    imported = []
+
+    def import_chain(block_list, **kwargs):
+        imported.append(block_list[0])
+        if import_errors[block_list[0]] is not None:
+            raise import_errors[block_list[0]]
+
+    monkeypatch.setattr('hvm.chains.base.recover_block_senders', lambda blocks: None)
+    monkeypatch.setattr(chain, 'import_chain', import_chain)
+
+    errors = chain.import_chains([['valid'], ['invalid'], ['orphan']])
+    assert errors == [None, import_errors['invalid'], import_errors['orphan']]
+
+    with pytest.raises(KeyError):
+        chain.import_chains([['valid'], ['bug'], ['valid']])
+    assert imported[3:] == ['valid', 'bug']
+
+
+def test_get_vm_is_not_cached_across_a_purge():
+    testdb = MemoryDB()
+
+    chain = TestnetChain.from_genesis(testdb, TESTNET_GENESIS_PRIVATE_KEY.public_key.to_canonical_address(), TESTNET_GENESIS_PARAMS, TESTNET_GENESIS_STATE, private_key = TESTNET_GENESIS_PRIVATE_KEY)
+    genesis_balance = chain.get_vm().state.account_db.get_balance(chain.wallet_address)
+
+    chain.create_and_sign_transaction_for_queue_block(
+        gas_price=1,
+        gas=21000,
+        to=RECEIVER.public_key.to_canonical_address(),
+        value=1,
+        data=b"",
+        v=0,
+        r=0,
+        s=0
+    )
+    block = chain.import_current_queue_block()
+
+    with chain.cache_vms():
+        assert chain.get_vm().state.account_db.get_balance(chain.wallet_address) < genesis_balance
+        chain.purge_block_and_all_children_and_set_parent_as_chain_head(block.header)
+        assert chain.get_vm().state.account_db.get_balance(chain.wallet_address) == genesis_balance
+
+
 # test_import_invalid_block_repeat_transaction()
 # exit()
 
@@ -6,13 +6,15 @@ from hvm.exceptions import (
 
 from hvm.vm import opcode_values
 from hvm.vm.code_stream import (
+    CodeAnalysis,
+    CodeAnalysisCache,
     CodeStream,
 )
 
 
 def test_code_stream_accepts_bytes():
     code_stream = CodeStream(b'\x01')
-    assert len(code_stream.stream.getvalue()) == 1
+    assert len(code_stream) == 1
 
 
 @pytest.mark.parametrize("code_bytes", (1010, '1010', True, bytearray(32)))
@@ -118,3 +120,47 @@ def test_right_number_of_bytes_invalidated_after_pushxx():
     assert code_stream.is_valid_opcode(3) is False
     assert code_stream.is_valid_opcode(4) is True
     assert code_stream.is_valid_opcode(5) is False
+
+
+def test_read_push_value_returns_pushed_data_as_int():
+    code_stream = CodeStream(b'\x61\x01\x02\x60\x00\x01')
+    assert code_stream.next() == opcode_values.PUSH2
+    assert code_stream.read_push_value(2) == 0x0102
+    assert code_stream.pc == 3
+    assert code_stream.next() == opcode_values.PUSH1
+    assert code_stream.read_push_value(1) == 0
+    assert code_stream.next() == opcode_values.ADD
+
+
+def test_read_push_value_pads_truncated_data_with_zeros():
+    code_stream = CodeStream(b'\x62\x01')
+    assert code_stream.next() == opcode_values.PUSH3
+    assert code_stream.read_push_value(3) == 0x010000
+    assert code_stream.pc == 2
+    assert code_stream.next() == opcode_values.STOP
+
+
+def test_push_values_are_only_kept_for_push_data():
+    analysis = CodeAnalysis(b'\x61\x01\x02\x01\x60\xff')
+    assert analysis.push_values == {1: 0x0102, 5: 0xff}
+
+
+def test_code_analysis_cache_is_bounded_by_code_length():
+    cache = CodeAnalysisCache(max_code_bytes=10)
+    first_code = b'\x01' * 4
+    second_code = b'\x02' * 4
+    third_code = b'\x03' * 4
+
+    cache.get(first_code)
+    cache.get(second_code)
+    # Using the first one again makes the second one the least recently used
+    assert cache.get(first_code) is cache.get(first_code)
+    cache.get(third_code)
+
+    assert len(cache) == 2
+    assert cache.code_bytes == 8
+    assert cache.get(first_code) is cache.get(first_code)
+
+    # Code longer than the whole cache is analysed but not kept
+    cache.get(b'\x04' * 11)
+    assert cache.code_bytes == 8
@@ -0,0 +1,67 @@
+import pytest
+
+from hvm.exceptions import (
+    ValidationError,
+)
+from hvm.vm.memory import (
+    Memory,
+)
+
+
+@pytest.fixture
+def memory():
+    return Memory()
+
+
+def test_extend_rounds_up_to_words(memory):
+    memory.extend(0, 1)
+    assert len(memory) == 32
+
+    memory.extend(40, 1)
+    assert len(memory) == 64
+
+
+def test_extend_never_shrinks(memory):
+    memory.extend(0, 64)
+    memory.extend(0, 32)
+    memory.extend(100, 0)
+    assert len(memory) == 64
+
+
+def test_extended_memory_is_zero_filled(memory):
+    memory.extend(0, 32)
+    memory.write(0, 32, b'\xff' * 32)
+    memory.extend(0, 100)
+    assert memory.read(0, 128) == b'\xff' * 32 + b'\x00' * 96
+
+
+def test_write_and_read(memory):
+    memory.extend(0, 64)
+    memory.write(30, 4, b'\x01\x02\x03\x04')
+    assert memory.read(30, 4) == b'\x01\x02\x03\x04'
+    assert memory.read(28, 8) == b'\x00\x00\x01\x02\x03\x04\x00\x00'
+
+
+def test_write_past_end_of_memory(memory):
+    memory.extend(0, 32)
+    with pytest.raises(ValidationError):
+        memory.write(31, 2, b'\x01\x02')
+
+
+def test_read_does_not_see_spare_capacity(memory):
+    memory.extend(0, 32)
+    memory.extend(0, 64)
+    assert len(memory.read(0, 1000)) == 64
+
+
+def test_read_view(memory):
+    memory.extend(0, 32)
+    memory.write(0, 2, b'\x01\x02')
+
+    with memory.read_view(0, 4) as view:
+        assert isinstance(view, memoryview)
+        assert view.tobytes() == b'\x01\x02\x00\x00'
+
+    # the view has been released, so memory can grow again
+    memory.extend(0, 4096)
+    assert len(memory) == 4096
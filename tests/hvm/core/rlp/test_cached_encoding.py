@@ -0,0 +1,57 @@
+import rlp_cython as rlp
+
+from eth_hash.auto import keccak
+
+from hvm.rlp.receipts import Receipt
+from hvm.vm.forks.helios_testnet.transactions import (
+    HeliosTestnetReceiveTransaction,
+    HeliosTestnetTransaction,
+)
+
+
+def make_transaction(nonce=0):
+    return HeliosTestnetTransaction(
+        nonce=nonce,
+        gas_price=1,
+        gas=21000,
+        to=b'\x02' * 20,
+        value=1,
+        data=b'',
+        v=37,
+        r=1,
+        s=1,
+    )
+
+
+def test_transaction_encoding_and_hash_are_cached():
+    transaction = make_transaction()
+
+    assert transaction.encoded == rlp.encode(transaction)
+    assert transaction.hash == keccak(rlp.encode(transaction))
+    assert transaction.encoded is transaction.encoded
+    assert rlp.decode(transaction.encoded, sedes=HeliosTestnetTransaction) == transaction
+
+
+def test_copy_does_not_share_cached_encoding():
+    transaction = make_transaction()
+    original_hash = transaction.hash
+
+    changed_transaction = transaction.copy(nonce=1)
+
+    assert changed_transaction.hash != original_hash
+    assert changed_transaction.hash == keccak(rlp.encode(changed_transaction))
+    assert changed_transaction.hash == make_transaction(nonce=1).hash
+
+
+def test_receive_transaction_and_receipt_encoding():
+    receive_transaction = HeliosTestnetReceiveTransaction(
+        sender_block_hash=b'\x01' * 32,
+        send_transaction_hash=b'\x02' * 32,
+        is_refund=False,
+        remaining_refund=0,
+    )
+    assert receive_transaction.hash == keccak(rlp.encode(receive_transaction))
+
+    receipt = Receipt(status_code=b'\x01', gas_used=21000, logs=[])
+    assert receipt.encoded == rlp.encode(receipt)
+    assert receipt.hash == keccak(rlp.encode(receipt))
@@ -0,0 +1,112 @@
+import pytest
+
+from eth_keys import keys
+
+from hvm.exceptions import ValidationError
+from hvm.rlp.headers import BlockHeader
+from hvm.utils import signatures
+from hvm.utils.signatures import (
+    recover_block_senders,
+    recover_signature_sender,
+    shutdown_recovery_executor,
+    start_recovery_executor,
+)
+from hvm.utils.transactions import validate_transaction_signature
+from hvm.vm.forks.helios_testnet.blocks import HeliosTestnetBlock
+from hvm.vm.forks.helios_testnet.transactions import HeliosTestnetTransaction
+
+CHAIN_ID = 1
+PRIVATE_KEY = keys.PrivateKey(b'\x01' * 32)
+SENDER = PRIVATE_KEY.public_key.to_canonical_address()
+
+
+def make_block(block_number):
+    transaction = HeliosTestnetTransaction(
+        nonce=block_number,
+        gas_price=1,
+        gas=21000,
+        to=b'\x02' * 20,
+        value=1,
+        data=b'',
+        v=0,
+        r=0,
+        s=0,
+    ).get_signed(PRIVATE_KEY, CHAIN_ID)
+    header = BlockHeader(
+        block_number=block_number,
+        timestamp=1500000000 + block_number,
+        chain_address=SENDER,
+    ).get_signed(PRIVATE_KEY, CHAIN_ID)
+    return HeliosTestnetBlock(header, [transaction])
+
+
+@pytest.fixture
+def recovery_executor():
+    executor = start_recovery_executor(max_workers=2)
+    yield executor
+    shutdown_recovery_executor()
+
+
+def test_recover_signature_sender():
+    header = make_block(0).header
+    message = header.get_message_for_signing()
+
+    assert recover_signature_sender(message, header.v, header.r, header.s) == SENDER
+    assert recover_signature_sender(message, header.v, 0, header.s) is None
+
+
+@pytest.mark.parametrize('min_signatures', (1, 1000))
+def test_recover_block_senders(monkeypatch, recovery_executor, min_signatures):
+    # a minimum of 1 makes the process pool run even for these few blocks
+    monkeypatch.setattr(signatures, 'MIN_SIGNATURES_FOR_PROCESS_POOL', min_signatures)
+    blocks = [make_block(block_number) for block_number in range(3)]
+
+    recover_block_senders(blocks)
+
+    for block in blocks:
+        assert block.header._sender == SENDER
+        assert block.header.sender == SENDER
+        assert block.transactions[0].sender == SENDER
+
+
+def test_invalid_signature_is_left_unchecked():
+    block = make_block(0)
+    bad_header = block.header.copy(r=0)
+    block = block.copy(header=bad_header)
+
+    recover_block_senders([block])
+
+    assert block.header._sender is None
+    with pytest.raises(ValidationError):
+        block.header.check_signature_validity()
+
+
+def test_invalid_signature_in_pool_raises_the_serial_error(monkeypatch, recovery_executor):
+    monkeypatch.setattr(signatures, 'MIN_SIGNATURES_FOR_PROCESS_POOL', 1)
+    blocks = [make_block(block_number) for block_number in range(4)]
+    bad_transaction = blocks[2].transactions[0].copy(r=0)
+    blocks[2] = blocks[2].copy(transactions=[bad_transaction])
+
+    with pytest.raises(ValidationError) as serial_error:
+        validate_transaction_signature(bad_transaction.copy())
+
+    recover_block_senders(blocks)
+
+    assert all(block.header._sender == SENDER for block in blocks)
+    assert blocks[2].transactions[0]._sender is None
+    with pytest.raises(ValidationError) as pool_error:
+        blocks[2].transactions[0].check_signature_validity()
+    assert str(pool_error.value) == str(serial_error.value)
+
+
+def test_copy_checked_sender_from():
+    header = make_block(0).header
+    header.set_checked_sender(SENDER)
+
+    rebuilt_header = header.copy()
+    rebuilt_header.copy_checked_sender_from(header)
+    assert rebuilt_header._sender == SENDER
+
+    changed_header = header.copy(gas_used=1)
+    changed_header.copy_checked_sender_from(header)
+    assert changed_header._sender is None
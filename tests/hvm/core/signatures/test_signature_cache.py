@@ -0,0 +1,67 @@
+import pytest
+
+from eth_keys import keys
+
+from hvm.exceptions import ValidationError
+from hvm.utils.signatures import (
+    SignatureCache,
+    signature_cache,
+)
+from hvm.vm.forks.helios_testnet.transactions import HeliosTestnetTransaction
+
+CHAIN_ID = 1
+PRIVATE_KEY = keys.PrivateKey(b'\x01' * 32)
+SENDER = PRIVATE_KEY.public_key.to_canonical_address()
+
+
+@pytest.fixture(autouse=True)
+def clear_signature_cache():
+    signature_cache.clear()
+    yield
+    signature_cache.clear()
+
+
+def make_transaction(nonce=0):
+    return HeliosTestnetTransaction(
+        nonce=nonce,
+        gas_price=1,
+        gas=21000,
+        to=b'\x02' * 20,
+        value=1,
+        data=b'',
+        v=0,
+        r=0,
+        s=0,
+    ).get_signed(PRIVATE_KEY, CHAIN_ID)
+
+
+def test_signature_cache_is_bounded():
+    cache = SignatureCache(2)
+    for i in range(3):
+        cache.set_sender(bytes([i]), 27, 1, 1, SENDER)
+
+    assert cache.get_sender(b'\x00', 27, 1, 1) is None
+    assert cache.get_sender(b'\x02', 27, 1, 1) == SENDER
+    assert cache.get_sender(b'\x02', 28, 1, 1) is None
+    assert cache.get_stats() == {'hits': 1, 'misses': 2, 'size': 2, 'max_size': 2}
+
+
+def test_signature_is_checked_once_per_process():
+    transaction = make_transaction()
+    assert transaction.sender == SENDER
+    assert signature_cache.get_stats()['misses'] == 1
+
+    # a copy decoded from the network doesn't have the sender saved on it, but shares the cache
+    transaction_copy = transaction.copy()
+    assert transaction_copy.sender == SENDER
+    assert signature_cache.get_stats()['hits'] == 1
+
+
+def test_invalid_signatures_are_not_cached():
+    transaction = make_transaction().copy(r=0)
+
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            transaction.copy().check_signature_validity()
+
+    assert signature_cache.get_stats()['size'] == 0
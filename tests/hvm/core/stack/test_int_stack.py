@@ -0,0 +1,61 @@
+import pytest
+
+from hvm import constants
+from hvm.exceptions import (
+    FullStack,
+    InsufficientStack,
+    ValidationError,
+)
+from hvm.vm.stack import (
+    IntStack,
+)
+
+
+@pytest.fixture
+def stack():
+    return IntStack()
+
+
+def test_push_converts_bytes_to_int(stack):
+    stack.push(b'\x00\x01')
+    assert stack.values == [1]
+
+
+@pytest.mark.parametrize("value", (-1, 2**256, b'\x01' * 33, '1'))
+def test_push_rejects_invalid_values(stack, value):
+    with pytest.raises(ValidationError):
+        stack.push(value)
+
+
+def test_push_does_not_allow_more_than_1024_items(stack):
+    for num in range(1024):
+        stack.push(num)
+    with pytest.raises(FullStack):
+        stack.push(1)
+    with pytest.raises(FullStack):
+        stack.dup(1)
+
+
+def test_pop_returns_top_item_first(stack):
+    for num in range(3):
+        stack.push(num)
+
+    assert stack.pop(2, constants.UINT256) == (2, 1)
+    assert stack.pop(1, constants.BYTES) == b''
+    assert len(stack) == 0
+
+
+def test_pop_raises_on_insufficient_stack(stack):
+    stack.push(1)
+    with pytest.raises(InsufficientStack):
+        stack.pop(2, constants.UINT256)
+    assert stack.values == [1]
+
+
+def test_swap_and_dup(stack):
+    stack.push(1)
+    stack.push(2)
+    stack.swap(1)
+    assert stack.values == [2, 1]
+    stack.dup(2)
+    assert stack.values == [2, 1, 2]